@@ -1,12 +1,38 @@
 """ScratchpadManager: Single source of truth for collected booking data."""
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Sequence, Set, Tuple
 from pydantic import BaseModel, Field, ConfigDict
 import json
 from uuid import uuid4
 
 
+# Extracted/stored field name -> (scratchpad section, scratchpad field name)
+FIELD_SECTION_MAP: Dict[str, Tuple[str, str]] = {
+    "first_name": ("customer", "first_name"),
+    "last_name": ("customer", "last_name"),
+    "full_name": ("customer", "full_name"),
+    "phone": ("customer", "phone"),
+    "address": ("customer", "address"),
+    "vehicle_brand": ("vehicle", "brand"),
+    "vehicle_model": ("vehicle", "model"),
+    "vehicle_plate": ("vehicle", "plate"),
+    "vehicle_type": ("vehicle", "vehicle_type"),
+    "appointment_date": ("appointment", "date"),
+    "service_type": ("appointment", "service_type"),
+    "service_tier": ("appointment", "service_tier"),
+    "time_slot": ("appointment", "time_slot"),
+    "notes": ("appointment", "notes"),
+}
+
+
+# Values that never count towards completeness
+_PLACEHOLDER_VALUES = frozenset({"unknown", "none", ""})
+
+# Scratchpad field names required for booking (intent/service_type is captured separately)
+_REQUIRED_FIELD_NAMES = frozenset({"first_name", "last_name", "phone", "brand", "model", "plate", "date"})
+
+
 class FieldEntry(BaseModel):
     """Single scraped field with metadata."""
     value: Optional[Any] = None
@@ -36,6 +62,13 @@ class ScratchpadManager:
 
     def __init__(self, conversation_id: Optional[str] = None):
         self.form = ScratchpadForm()
+        # Non-None values per section, kept in sync by every mutator so the API
+        # view (to_api_dict) needs no filtering pass over FieldEntry objects
+        self._populated: Dict[str, Dict[str, Any]] = {"customer": {}, "vehicle": {}, "appointment": {}}
+        # Filled (non-placeholder) fields and how many of them are required, maintained
+        # incrementally so completeness updates don't rescan every section
+        self._filled: Set[Tuple[str, str]] = set()
+        self._filled_required = 0
         self.conversation_id = conversation_id or str(uuid4())
         self.created_at = datetime.now()
         self.form.metadata = {
@@ -57,17 +90,76 @@ class ScratchpadManager:
         Args:
             edit_source: "user_input" | "user_edit" | "retroactive" | "initial_entry"
         """
-        import logging
-        logger = logging.getLogger(__name__)
-
         if section not in ["customer", "vehicle", "appointment"]:
             return False
 
+        if not self._set_entry(getattr(self.form, section), section, field_name, value, source,
+                               turn, confidence, extraction_method, edit_source, datetime.now()):
+            return False
+        self._update_completeness()
+        return True
+
+    def add_fields_bulk(self, by_section: Dict[str, Dict[str, Any]], source: str,
+                        turn: int = 0, confidence: float = 1.0, extraction_method: str = "user",
+                        edit_source: str = "initial_entry") -> int:
+        """Add many fields in one pass with the same conflict rules as add_field.
+
+        Completeness is recalculated once at the end instead of after every field.
+
+        Args:
+            by_section: {"customer": {field: value}, "vehicle": {...}, "appointment": {...}}
+
+        Returns:
+            Number of fields written
+        """
+        now = datetime.now()
+        written = 0
+        for section, fields in by_section.items():
+            if section not in ["customer", "vehicle", "appointment"] or not fields:
+                continue
+            section_dict = getattr(self.form, section)
+            for field_name, value in fields.items():
+                if self._set_entry(section_dict, section, field_name, value, source,
+                                   turn, confidence, extraction_method, edit_source, now):
+                    written += 1
+        if written:
+            self._update_completeness()
+        return written
+
+    def update_many(self, updates: Sequence[Tuple[str, str, Any, str, int, str]]) -> int:
+        """Add many fields with per-field source/turn/method, using add_field's conflict rules.
+
+        Completeness is recalculated once at the end instead of after every field.
+
+        Args:
+            updates: (section, field_name, value, source, turn, extraction_method) tuples
+
+        Returns:
+            Number of fields written
+        """
+        now = datetime.now()
+        written = 0
+        for section, field_name, value, source, turn, extraction_method in updates:
+            if section not in ["customer", "vehicle", "appointment"]:
+                continue
+            if self._set_entry(getattr(self.form, section), section, field_name, value, source,
+                               turn, 1.0, extraction_method, "initial_entry", now):
+                written += 1
+        if written:
+            self._update_completeness()
+        return written
+
+    def _set_entry(self, section_dict: Dict[str, FieldEntry], section: str, field_name: str,
+                   value: Any, source: str, turn: int, confidence: float,
+                   extraction_method: str, edit_source: str, now: datetime) -> bool:
+        """Write one FieldEntry if it passes the value and turn checks (no completeness update)."""
+        import logging
+        logger = logging.getLogger(__name__)
+
         # Skip invalid values
         if value is None or str(value).lower() in ["unknown", "none", ""]:
             return False
 
-        section_dict = getattr(self.form, section)
         existing_entry = section_dict.get(field_name)
 
         # CRITICAL: Turn-based conflict resolution
@@ -89,13 +181,14 @@ class ScratchpadManager:
             turn=turn,
             confidence=confidence,
             extraction_method=extraction_method,
-            timestamp=datetime.now(),
+            timestamp=now,
             edit_source=edit_source,
             previous_value=previous_value,
-            edited_at=datetime.now()
+            edited_at=now
         )
-        self._update_completeness()
-        logger.debug(f"✅ FIELD SET: {section}.{field_name}={value} (turn={turn}, source={edit_source})")
+        self._set_populated(section, field_name, value)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"✅ FIELD SET: {section}.{field_name}={value} (turn={turn}, source={edit_source})")
         return True
 
     def get_field(self, section: str, field_name: str) -> Optional[FieldEntry]:
@@ -104,6 +197,13 @@ class ScratchpadManager:
             return None
         return getattr(self.form, section).get(field_name)
 
+    def get_fields_bulk(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[FieldEntry]]:
+        """Get many field entries at once, keyed by (section, field_name); None when absent."""
+        sections = {"customer": self.form.customer, "vehicle": self.form.vehicle,
+                    "appointment": self.form.appointment}
+        return {(section, field_name): sections[section].get(field_name) if section in sections else None
+                for section, field_name in pairs}
+
     def get_section(self, section: str) -> Dict[str, FieldEntry]:
         """Get entire section."""
         if section not in ["customer", "vehicle", "appointment"]:
@@ -124,6 +224,7 @@ class ScratchpadManager:
         if not self.get_field(section, field_name):
             return False
         getattr(self.form, section)[field_name].value = new_value
+        self._set_populated(section, field_name, new_value)
         self._update_completeness()
         return True
 
@@ -132,6 +233,7 @@ class ScratchpadManager:
         section_dict = getattr(self.form, section, {})
         if field_name in section_dict:
             del section_dict[field_name]
+            self._set_populated(section, field_name, None)
             self._update_completeness()
             return True
         return False
@@ -141,38 +243,46 @@ class ScratchpadManager:
         self.form.customer.clear()
         self.form.vehicle.clear()
         self.form.appointment.clear()
+        for values in self._populated.values():
+            values.clear()
+        self._filled.clear()
+        self._filled_required = 0
         self.form.metadata["data_completeness"] = 0.0
 
+    def _set_populated(self, section: str, field_name: str, value: Any) -> None:
+        """Sync the value index and filled counters after a field changed (None = removed)."""
+        if value is None:
+            self._populated[section].pop(field_name, None)
+        else:
+            self._populated[section][field_name] = value
+        self._track_filled(section, field_name, value)
+
+    def _track_filled(self, section: str, field_name: str, value: Any) -> None:
+        """Update the filled-field counters after a field changed to value (None = removed)."""
+        key = (section, field_name)
+        # IMPORTANT: Don't count fields with "Unknown" or placeholder values as filled
+        is_filled = bool(value) and str(value).lower() not in _PLACEHOLDER_VALUES
+        was_filled = key in self._filled
+        if is_filled and not was_filled:
+            self._filled.add(key)
+            if field_name in _REQUIRED_FIELD_NAMES:
+                self._filled_required += 1
+        elif was_filled and not is_filled:
+            self._filled.discard(key)
+            if field_name in _REQUIRED_FIELD_NAMES:
+                self._filled_required -= 1
+
     def _update_completeness(self) -> None:
         """Recalculate completeness % with distinction between required and optional fields."""
         from config import config
         import logging
         logger = logging.getLogger(__name__)
 
-        # Count filled fields across all sections
-        # IMPORTANT: Don't count fields with "Unknown" or placeholder values as filled
-        filled = sum(len([v for v in getattr(self.form, s).values()
-                         if v.value and str(v.value).lower() not in ["unknown", "none", ""]])
-                     for s in ["customer", "vehicle", "appointment"])
-
-        # REQUIRED FIELDS (8): Minimum to identify user, car, and requirement
-        # first_name, last_name, phone, vehicle_brand, vehicle_model, vehicle_plate, appointment_date, intent
-        required_fields = ["first_name", "last_name", "phone"]  # customer
-        required_fields += ["brand", "model", "plate"]           # vehicle
-        required_fields += ["date"]                              # appointment
-        # Note: intent/service_type is captured separately
-
-        # Count how many required fields are filled
-        # IMPORTANT: Don't count fields with "Unknown" or placeholder values as filled
-        filled_required = 0
-        for section in ["customer", "vehicle", "appointment"]:
-            section_data = getattr(self.form, section)
-            for field_name in required_fields:
-                if field_name in section_data and section_data[field_name].value:
-                    # Check if value is not a placeholder
-                    value_str = str(section_data[field_name].value).lower()
-                    if value_str not in ["unknown", "none", ""]:
-                        filled_required += 1
+        # Filled fields (all / required) are tracked incrementally by _track_filled
+        # REQUIRED FIELDS (8): first_name, last_name, phone, vehicle_brand, vehicle_model,
+        # vehicle_plate, appointment_date, intent (intent/service_type is captured separately)
+        filled = len(self._filled)
+        filled_required = self._filled_required
 
         # Calculate both metrics
         required_for_booking = config.REQUIRED_FIELDS_FOR_BOOKING
@@ -196,6 +306,19 @@ class ScratchpadManager:
         if is_bookable:
             logger.info(f"✅ BOOKING READY: {filled_required} required fields filled, completeness={completeness_pct}%")
 
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Plain values per section (None values omitted) plus completeness, for API responses."""
+        return {
+            "customer": dict(self._populated["customer"]),
+            "vehicle": dict(self._populated["vehicle"]),
+            "appointment": dict(self._populated["appointment"]),
+            "completeness": self.get_completeness()
+        }
+
+    def get_populated_sections(self) -> Dict[str, Dict[str, Any]]:
+        """Non-None values per section, straight from the maintained index (read-only; don't mutate)."""
+        return self._populated
+
     def get_completeness(self) -> float:
         """Get completeness percentage."""
         return self.form.metadata.get("data_completeness", 0.0)
@@ -326,5 +449,21 @@ class ScratchpadManager:
             "appointment": {k: v.model_dump() for k, v in self.form.appointment.items()}
         }, default=str)
 
+    @classmethod
+    def from_json(cls, payload: str) -> "ScratchpadManager":
+        """Rebuild a scratchpad from export_json() output (indexes and completeness included)."""
+        data = json.loads(payload)
+        manager = cls(data["conversation_id"])
+        manager.created_at = datetime.fromisoformat(data["created_at"])
+        manager.form.metadata = data.get("metadata") or manager.form.metadata
+        for section in ("customer", "vehicle", "appointment"):
+            section_dict = getattr(manager.form, section)
+            for field_name, entry in (data.get(section) or {}).items():
+                section_dict[field_name] = FieldEntry(**entry)
+                if section_dict[field_name].value is not None:
+                    manager._set_populated(section, field_name, section_dict[field_name].value)
+        manager._update_completeness()
+        return manager
+
     def __repr__(self) -> str:
         return f"ScratchpadManager(id={self.conversation_id[:8]}..., {self.get_completeness()}%)"
\ No newline at end of file
@@ -96,11 +96,38 @@ class Config:
     MODEL_NAME = "gemma3:4b"  # Better model for structured outputs (4.3B params)
     MAX_TOKENS = 8000
     TEMPERATURE = 0.3  # Lower for consistency
+    LLM_TIMEOUT_SECONDS = 15.0  # Per-request timeout
+    LLM_MAX_KEEPALIVE_CONNECTIONS = 64  # Pooled connections reused across LLM calls (no handshake per call)
+    LLM_MAX_CONNECTIONS = 128
+    OLLAMA_KEEP_ALIVE = "30m"  # Keep the model (and its cached prompt prefix) loaded between turns
+    # Extra Ollama options passed to every LM call (dspy_config always builds an ollama/ LM),
+    # e.g. {"num_ctx": 4096, "num_thread": 8}; keep_alive is set via OLLAMA_KEEP_ALIVE above
+    LLM_LATENCY_OPTIONS = {}
+    REFINE_HEDGE_DELAY_SECONDS = 4.0  # Start a second response attempt if the first hasn't finished by then
     
     # Conversation Settings
     MAX_CHAT_HISTORY = 25
     SENTIMENT_CHECK_INTERVAL = 2  # Check sentiment every N messages
     RETROACTIVE_SCAN_LIMIT = 4  # Number of recent messages to scan in retroactive validator (prevents timeout)
+    RETROACTIVE_COMBINED_SCAN = True  # One joint name/vehicle/date extraction when 2+ categories are missing (False: per-category scans in parallel)
+    MAX_SCAN_BYTES = 2048  # Byte budget of recent user text sent to a retroactive scan (bounds prompt size)
+    RETROACTIVE_CACHE_DIR = None  # e.g. ".cache/retroactive" to keep scan results on disk across restarts/workers
+    RETROACTIVE_CACHE_TTL_SECONDS = 3600  # Disk-cached scan results older than this are ignored
+
+    # Prediction Cache Settings (memoizes intent/sentiment/typo predictions for repeated replies)
+    PREDICTION_CACHE_SIZE = 4096  # Max in-process entries (LRU eviction)
+    PREDICTION_CACHE_HISTORY_TURNS = 4  # Recent history turns included in the cache key
+    PREDICTION_CACHE_REDIS_URL = None  # e.g. "redis://localhost:6379/0" to share across workers
+    PREDICTION_CACHE_REDIS_TTL_SECONDS = 3600
+    SEMANTIC_CACHE_THRESHOLD = 0.93  # Min similarity to reuse a cached confirmation-intent prediction
+    SEMANTIC_CACHE_SIZE = 1024  # Max cached confirmation phrasings (LRU eviction)
+    SEMANTIC_CACHE_MIN_CONFIDENCE = 0.8  # Only cache confident detector results
+    SEMANTIC_CACHE_MAX_WORDS = 4  # Fuzzy reuse only for replies this short; longer ones need an exact match
+
+    # Scratchpad Retention (in-memory scratchpads per conversation)
+    SCRATCHPAD_MAX_CONVERSATIONS = 10_000  # LRU eviction beyond this
+    SCRATCHPAD_TTL_SECONDS = 3600  # Idle scratchpads are dropped after this
+    SCRATCHPAD_PERSIST_DIR = None  # e.g. "scratchpads" to keep snapshots on disk across evictions/restarts
 
     # Confirmation Flow Settings
     CONFIRMATION_AUTO_CONFIRM_ATTEMPTS = 3  # Auto-confirm booking after N silent confirmation attempts
@@ -113,6 +140,7 @@ class Config:
     #
     # IMPORTANT: In BUTTON mode, /chat endpoint NEVER creates service requests, only /api/confirmation does
     CONFIRMATION_MODE = "CHAT"  # Options: "CHAT" or "BUTTON"
+    SERVICE_REQUEST_DUMP_GZIP = False  # Write datadump/{id}.json.gz (gzip level 1) instead of plain compact JSON
 
     # Field Completeness Configuration
     # MINIMUM REQUIRED: 8 fields needed to identify user, car, and requirement (mandatory for booking)
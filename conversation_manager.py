@@ -79,6 +79,20 @@ class ConversationManager:
             ...     current_message="How can I help?"
             ... )
         """
-        from history_utils import messages_to_dspy_history
+        from history_utils import messages_to_dspy_history, extend_dspy_history
         context = self.get_or_create(conversation_id)
-        return messages_to_dspy_history(context)
\ No newline at end of file
+
+        # Reuse the cached history while no messages were added; otherwise format
+        # only the new messages instead of re-converting the whole log
+        count = len(context.messages)
+        cached = context._dspy_history
+        if cached is not None and context._dspy_history_count == count:
+            return cached
+        if cached is not None and count > context._dspy_history_count:
+            history = extend_dspy_history(cached, context.messages[context._dspy_history_count:])
+        else:
+            history = messages_to_dspy_history(context)
+
+        context._dspy_history = history
+        context._dspy_history_count = count
+        return history
\ No newline at end of file
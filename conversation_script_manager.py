@@ -7,6 +7,7 @@ Reason to change: When chatbot personality, scripts, or state-specific behavior
 import logging
 from typing import Dict, Optional, List
 from dataclasses import dataclass, field
+from functools import cached_property
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,11 @@ class StateScript:
     proactive_message: str  # Suggested opening for this state
     validation_rules: Dict[str, str] = field(default_factory=dict)  # Field-specific guidance
 
+    @cached_property
+    def need_next_str(self) -> str:
+        """need_next formatted for prompts (scripts are never modified, so formatted once)."""
+        return ", ".join(self.need_next) if self.need_next else "None"
+
 
 class ConversationScriptManager:
     """Manages state-specific conversation scripts and personality traits.
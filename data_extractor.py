@@ -21,7 +21,11 @@ logger = logging.getLogger(__name__)
 
 
 class DataExtractionService:
-    """Simple, DSPy-first extraction with lightweight fallbacks."""
+    """Simple, DSPy-first extraction with lightweight fallbacks.
+
+    Every extract_*/parse_* method returns None on failure instead of raising,
+    so callers can branch on the result without wrapping each call in try/except.
+    """
 
     def __init__(self):
         ensure_configured()
@@ -85,16 +89,19 @@ class DataExtractionService:
         if match:
             name = match.group(1) or match.group(3)
             if name:
-                return ValidatedName(
-                    first_name=name.capitalize(),
-                    last_name="",
-                    full_name=name.capitalize(),
-                    metadata=ExtractionMetadata(
-                        confidence=0.7,
-                        extraction_method="rule_based",
-                        extraction_source=user_message
+                try:
+                    return ValidatedName(
+                        first_name=name.capitalize(),
+                        last_name="",
+                        full_name=name.capitalize(),
+                        metadata=ExtractionMetadata(
+                            confidence=0.7,
+                            extraction_method="rule_based",
+                            extraction_source=user_message
+                        )
                     )
-                )
+                except ValueError as e:
+                    logger.debug(f"Regex name fallback failed validation: {e}")
 
         return None
 
@@ -147,16 +154,19 @@ class DataExtractionService:
             # Try to find brand from common list
             brands = ["Honda", "Toyota", "Tata", "Maruti", "Mahindra", "Ford", "Hyundai"]
             brand = next((b for b in brands if b.lower() in user_message.lower()), "Unknown")
-            return ValidatedVehicleDetails(
-                brand=brand,
-                model="Unknown",
-                number_plate=plate,
-                metadata=ExtractionMetadata(
-                    confidence=0.8,
-                    extraction_method="rule_based",
-                    extraction_source=user_message
+            try:
+                return ValidatedVehicleDetails(
+                    brand=brand,
+                    model="Unknown",
+                    number_plate=plate,
+                    metadata=ExtractionMetadata(
+                        confidence=0.8,
+                        extraction_method="rule_based",
+                        extraction_source=user_message
+                    )
                 )
-            )
+            except ValueError as e:
+                logger.debug(f"Regex vehicle fallback failed validation: {e}")
 
         return None
 
@@ -195,15 +205,18 @@ class DataExtractionService:
         phone_match = re.search(r'\b([6-9]\d{9})\b', user_message)
         if phone_match:
             phone_number = phone_match.group(1)
-            return ValidatedPhone(
-                phone_number=phone_number,
-                confidence=0.8,
-                metadata=ExtractionMetadata(
+            try:
+                return ValidatedPhone(
+                    phone_number=phone_number,
                     confidence=0.8,
-                    extraction_method="rule_based",
-                    extraction_source=user_message
+                    metadata=ExtractionMetadata(
+                        confidence=0.8,
+                        extraction_method="rule_based",
+                        extraction_source=user_message
+                    )
                 )
-            )
+            except ValueError as e:
+                logger.debug(f"Regex phone fallback failed validation: {e}")
 
         return None
 
@@ -1,9 +1,39 @@
 """
 DSPy configuration and LLM initialization.
 """
+import logging
+
 import dspy
 from config import config
 
+logger = logging.getLogger(__name__)
+
+
+def _configure_http_pool() -> None:
+    """
+    Give LiteLLM shared keep-alive HTTP clients.
+
+    Without them each predictor call may open a fresh connection; with 5-7
+    predictors per turn (several running concurrently) the handshakes add up.
+    """
+    try:
+        import httpx
+        import litellm
+    except ImportError:
+        return
+
+    limits = httpx.Limits(
+        max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        max_connections=config.LLM_MAX_CONNECTIONS,
+    )
+    timeout = httpx.Timeout(config.LLM_TIMEOUT_SECONDS)
+    try:
+        # Sync client serves predictors run via asyncio.to_thread, async client serves acall()
+        litellm.client_session = httpx.Client(limits=limits, timeout=timeout)
+        litellm.aclient_session = httpx.AsyncClient(limits=limits, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"⚠️  Could not configure pooled LLM HTTP clients: {e}")
+
 
 class DSPyConfigurator:
     """Manages DSPy configuration and initialization."""
@@ -28,8 +58,14 @@ class DSPyConfigurator:
             api_base=base_url,
             max_tokens=config.MAX_TOKENS,
             temperature=config.TEMPERATURE,
-            timeout=15.0  # 15 second timeout for each LLM request
+            timeout=config.LLM_TIMEOUT_SECONDS,
+            # Ollama reuses the KV cache of a matching prompt prefix (signature
+            # instructions + earlier turns) only while the model stays loaded
+            keep_alive=config.OLLAMA_KEEP_ALIVE,
+            # Low-latency provider mode, shared by every signature's calls
+            **config.LLM_LATENCY_OPTIONS
         )
+        _configure_http_pool()
         
         # Set as default LM for DSPy
         dspy.settings.configure(lm=lm)
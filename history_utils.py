@@ -84,6 +84,34 @@ def messages_to_dspy_history(conversation_context: Any, max_messages: Optional[i
     )
 
 
+def extend_dspy_history(
+    history: dspy.History,
+    new_messages: List[Any],
+    max_messages: Optional[int] = None
+) -> dspy.History:
+    """
+    Return a new dspy.History with new_messages appended to history's window.
+
+    Only the new messages are formatted; the existing (already formatted) window
+    is reused. The input history is not mutated, so callers still holding it
+    keep a consistent view.
+
+    Args:
+        history: Previously built dspy.History
+        new_messages: Messages added since (objects with .role/.content or dicts)
+        max_messages: Keep only recent N messages (defaults to config.MAX_CHAT_HISTORY)
+
+    Returns:
+        dspy.History with the combined, windowed messages
+    """
+    if max_messages is None:
+        max_messages = config.MAX_CHAT_HISTORY
+
+    appended = create_dspy_history(new_messages, max_messages=max_messages).messages
+    combined = list(history.messages) + appended
+    return dspy.History(messages=combined[-max_messages:])
+
+
 def filter_dspy_history_to_user_only(history: dspy.History) -> dspy.History:
     """
     Filter conversation history to include ONLY user messages.
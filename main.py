@@ -176,7 +176,7 @@ async def process_chat(request: ChatRequest, req: Request):
 
         # State is now managed internally by orchestrator
         # The current_state parameter is deprecated and ignored
-        result = orchestrator.process_message(
+        result = await orchestrator.aprocess_message(
             conversation_id=request.conversation_id,
             user_message=request.user_message
         )
@@ -348,9 +348,9 @@ async def handle_confirmation(req: Request):
                     logger.warning(f"⏭️  SKIP DUMP: Scratchpad already cleared (booking done in CHAT mode), service_request_id={service_request_id}")
                 else:
                     # Dump service request JSON before clearing scratchpad (BUTTON mode only)
-                    from service_request_dumper import dump_service_request
+                    from service_request_dumper import adump_service_request
                     try:
-                        dump_service_request(
+                        await adump_service_request(
                             service_request_id=service_request_id,
                             conversation_id=conversation_id,
                             scratchpad=scratchpad,
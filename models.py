@@ -12,6 +12,7 @@ from pydantic import (
     model_validator,
     ValidationError,
     ConfigDict,
+    PrivateAttr,
     computed_field
 )
 # New models for comprehensive validation of the chatbot system
@@ -818,6 +819,15 @@ class ValidatedConversationContext(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, max_length=50, description="Additional conversation metadata")
     state_transitions: List[ValidatedStateTransition] = Field(default_factory=list, max_length=50, description="History of state transitions")
 
+    # Cached dspy.History view of messages (rebuilt incrementally by ConversationManager)
+    _dspy_history: Any = PrivateAttr(default=None)
+    _dspy_history_count: int = PrivateAttr(default=0)
+    # Retroactive sweep memo and its lock (created lazily by orchestrator.retroactive_cache)
+    _retroactive_cache: Any = PrivateAttr(default=None)
+    _retroactive_lock: Any = PrivateAttr(default=None)
+    # Last turn's sentiment, reused by the acknowledgement fast path in MessageProcessor
+    _last_sentiment: Any = PrivateAttr(default=None)
+
     @computed_field
     @property
     def total_messages(self) -> int:
@@ -901,6 +911,8 @@ class ValidatedSentimentScores(BaseModel):
     neutral: float = Field(ge=1.0, le=10.0, description="Neutral level from 1-10")
     reasoning: str = Field(..., min_length=10, max_length=500, description="Reasoning for sentiment analysis")
     metadata: ExtractionMetadata = Field(default_factory=ExtractionMetadata, description="Extraction metadata")
+    tone_directive: Optional[str] = Field(default=None, max_length=200, description="Reply tone chosen alongside the scores")
+    max_sentences: Optional[str] = Field(default=None, max_length=20, description="Reply sentence limit chosen alongside the scores")
 
     @model_validator(mode='after')
     def validate_sentiment_ranges(self):
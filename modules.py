@@ -9,7 +9,7 @@ from config import config as _config
 from types import SimpleNamespace
 from typing import Any
 from signatures import (
-    SentimentAnalysisSignature,
+    SentimentWithToneSignature,
     NameExtractionSignature,
     VehicleDetailsExtractionSignature,
     PhoneExtractionSignature,
@@ -21,18 +21,67 @@ from signatures import (
     TypoCorrectionSignature,
     ConfirmationIntentSignature,
     StateAwareResponseSignature,
+    CombinedRetroactiveSignature,
+)
+
+# Few-shot demos: the examples carry the terse output format, so field descs stay short
+_SENTIMENT_DEMOS = (
+    dspy.Example(
+        current_message="This is taking forever, just book it already!",
+        reasoning="Impatient and annoyed, but still wants to book.",
+        interest_score="6", anger_score="6", disgust_score="2", boredom_score="7", neutral_score="2",
+        tone_directive="direct and brief", max_sentences="1"
+    ),
+    dspy.Example(
+        current_message="Hi! What services do you offer for my Honda City?",
+        reasoning="Curious and engaged, asking about services.",
+        interest_score="8", anger_score="1", disgust_score="1", boredom_score="1", neutral_score="4",
+        tone_directive="engaging and conversational", max_sentences="3"
+    ),
+)
+_INTENT_DEMOS = (
+    dspy.Example(
+        current_message="I want to get my car washed tomorrow",
+        reasoning="Asks to schedule a service.",
+        intent_class="book"
+    ),
+    dspy.Example(
+        current_message="How much does a full service cost?",
+        reasoning="Asks about pricing, no booking yet.",
+        intent_class="inquire"
+    ),
+)
+_PHONE_DEMOS = (
+    dspy.Example(
+        user_message="you can reach me on 98765 43210",
+        reasoning="Ten digits starting with 9: a mobile number.",
+        phone_number="9876543210", confidence="0.95"
+    ),
+    dspy.Example(
+        user_message="my car number is MH12AB1234",
+        reasoning="Letters and digits in plate format, not a phone number.",
+        phone_number="Unknown", confidence="0.9"
+    ),
 )
 
 
+def _with_demos(predictor, demos):
+    """Attach few-shot demos to every Predict inside a DSPy predictor (Predict or ChainOfThought)."""
+    for _, predict in predictor.named_predictors():
+        predict.demos = list(demos)
+    return predictor
+
+
 class SentimentAnalyzer(dspy.Module):
-    """Analyze customer sentiment across multiple dimensions."""
+    """Analyze customer sentiment across multiple dimensions, plus reply tone and brevity."""
 
     def __init__(self):
         super().__init__()
-        self.predictor = dspy.ChainOfThought(SentimentAnalysisSignature)
+        # Fused signature: scores and tone directive in one call (no separate SentimentToneAnalyzer round-trip)
+        self.predictor = _with_demos(dspy.ChainOfThought(SentimentWithToneSignature), _SENTIMENT_DEMOS)
 
     def forward(self, conversation_history=None, current_message: str = ""):
-        """Analyze sentiment with proper conversation context."""
+        """Analyze sentiment and tone with proper conversation context."""
         conversation_history = get_default_history(conversation_history)
         return self.predictor(
             conversation_history=conversation_history,
@@ -45,7 +94,7 @@ class IntentClassifier(dspy.Module):
 
     def __init__(self):
         super().__init__()
-        self.predictor = dspy.ChainOfThought(IntentClassificationSignature)
+        self.predictor = _with_demos(dspy.ChainOfThought(IntentClassificationSignature), _INTENT_DEMOS)
 
     def forward(self, conversation_history=None, current_message: str = ""):
         """Classify user intent with conversation context."""
@@ -215,7 +264,7 @@ class PhoneExtractor(dspy.Module):
 
     def __init__(self):
         super().__init__()
-        self.predictor = dspy.ChainOfThought(PhoneExtractionSignature)
+        self.predictor = _with_demos(dspy.ChainOfThought(PhoneExtractionSignature), _PHONE_DEMOS)
 
     def forward(self, conversation_history=None, user_message: str = ""):
         """Extract phone number with conversation context."""
@@ -243,6 +292,23 @@ class DateParser(dspy.Module):
         )
 
 
+class CombinedRetroactiveExtractor(dspy.Module):
+    """Extract name, vehicle details and date in one call (retroactive history scans)."""
+
+    def __init__(self):
+        super().__init__()
+        # Plain Predict: the retroactive sweep only needs the fields, not a rationale
+        self.predictor = dspy.Predict(CombinedRetroactiveSignature)
+
+    def forward(self, conversation_history=None, user_message: str = ""):
+        """Extract all retroactive fields from joined user messages."""
+        conversation_history = get_default_history(conversation_history)
+        return self.predictor(
+            conversation_history=conversation_history,
+            user_message=user_message
+        )
+
+
 class EmpathyResponseGenerator(dspy.Module):
     """Generate empathetic, context-aware responses."""
 
@@ -276,13 +342,13 @@ class SentimentToneAnalyzer(dspy.Module):
         boredom_score: float = 1.0,
         neutral_score: float = 1.0
     ):
-        """Determine tone and brevity based on sentiment scores."""
+        """Determine tone and brevity based on sentiment scores (rounded to integers)."""
         return self.predictor(
-            interest_score=str(interest_score),
-            anger_score=str(anger_score),
-            disgust_score=str(disgust_score),
-            boredom_score=str(boredom_score),
-            neutral_score=str(neutral_score)
+            interest_score=int(round(interest_score)),
+            anger_score=int(round(anger_score)),
+            disgust_score=int(round(disgust_score)),
+            boredom_score=int(round(boredom_score)),
+            neutral_score=int(round(neutral_score))
         )
 
 
@@ -337,14 +403,29 @@ class TypoDetector(dspy.Module):
         last_bot_message: str = "",
         user_response: str = "",
         expected_actions: str = "confirm, edit, cancel"
-    ):
-        """Detect typos and suggest corrections."""
-        return self.predictor(
+    ) -> SimpleNamespace:
+        """Detect typos and suggest corrections.
+
+        Returns a typed result with every output field always present, so callers
+        can read attributes directly instead of probing with hasattr/getattr:
+        is_typo (bool), intended_action, suggestion, confidence.
+        """
+        raw = self.predictor(
             last_bot_message=last_bot_message,
             user_response=user_response,
             expected_actions=expected_actions
         )
 
+        is_typo = str(getattr(raw, "is_typo", "") or "").strip().lower() == "true"
+        intended_action = str(getattr(raw, "intended_action", "") or "").strip()
+
+        return SimpleNamespace(
+            is_typo=is_typo,
+            intended_action=intended_action,
+            suggestion=str(getattr(raw, "suggestion", "") or "").strip(),
+            confidence=str(getattr(raw, "confidence", "") or "").strip(),
+        )
+
 
 class ConfirmationIntentDetector(dspy.Module):
     """Detect if user is confirming their booking using DSPy reasoning."""
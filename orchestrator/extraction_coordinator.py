@@ -4,16 +4,69 @@ Extraction Coordinator - Coordinates data extraction process.
 Single Responsibility: Coordinate extraction of user data (name, phone, vehicle, date, intent, typos).
 Reason to change: Extraction coordination logic changes.
 """
+import asyncio
+import difflib
 import dspy
 import logging
-from typing import Dict, Any, Optional
+import re
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date
+from hashlib import blake2b
+from typing import Dict, Any, Optional, Tuple
 from config import ConversationState, Config
 from data_extractor import DataExtractionService
-from models import ValidatedIntent, ExtractionMetadata
+from models import ValidatedIntent, ExtractionMetadata, VehicleBrandEnum
 from dspy_config import ensure_configured
+from history_utils import filter_dspy_history_to_user_only
+from modules import IntentClassifier, TypoDetector
 
 logger = logging.getLogger(__name__)
 
+# Cheap pre-checks run before each DSPy extractor so obviously-empty turns
+# ("ok", "yes", "👍") don't pay for an LLM call that can't find anything.
+_HAS_DIGITS7 = re.compile(r"(?:\d[\s-]?){7,}")
+_HAS_ALPHA_WORD = re.compile(r"[A-Za-z]{2,}")
+_HAS_PLATE = re.compile(r"[A-Z]{2}[-\s]?\d", re.I)
+
+# Interned intent labels (matches ValidatedIntent.intent_class) so the normalized
+# token from the LLM shares one str object per label across all conversations
+_INTENT_INTERN = {
+    v: sys.intern(v)
+    for v in ("book", "inquire", "complaint", "small_talk", "cancel", "reschedule", "payment")
+}
+
+# Extraction memo: last N user turns (truncated) fingerprint the context an extractor sees
+_HISTORY_KEY_TURNS = 4
+_HISTORY_KEY_CHARS = 64
+_EXTRACTION_CACHE_SIZE = 256
+
+# Local fuzzy match of a card reply against the expected action words: a close
+# match is the typo correction, a distant one is not a typo; only the band in
+# between is ambiguous enough to ask the LLM
+_TYPO_ACCEPT_RATIO = 0.75
+_TYPO_REJECT_RATIO = 0.4
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Casefolded brand names, built once at import instead of per _is_vehicle_brand call:
+# one alternation regex finds any brand inside the text in a single pass, and a
+# NUL-joined haystack answers "is the text part of a brand name" with one `in`
+_BRAND_NAMES_LOWER = tuple(brand.value.casefold() for brand in VehicleBrandEnum)
+_BRAND_NAMES_RE = re.compile("|".join(map(re.escape, sorted(_BRAND_NAMES_LOWER, key=len, reverse=True))))
+_BRAND_NAMES_HAYSTACK = "\x00".join(_BRAND_NAMES_LOWER)
+
+# Placeholder values DSPy emits when a field is absent; one shared O(1) lookup.
+_SENTINEL_NULLS = frozenset({"none", "n/a", "unknown", ""})
+
+# Explicit date indicators - a date is only accepted if the user message mentions one
+_DATE_KEYWORD_RE = re.compile(
+    r"today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"next|this|day|date|time|slot|appointment|when|schedule|book|"
+    r"january|february|march|april|may|june|july|august|september|october|november|december",
+    re.I
+)
+
 
 class ExtractionCoordinator:
     """
@@ -28,6 +81,85 @@ class ExtractionCoordinator:
         """Initialize extraction coordinator with data extractor."""
         self.data_extractor = DataExtractionService()
 
+        # Memoized user-only view of the last history seen (source, length, filtered).
+        # The source is held strongly and compared by identity: an id() could be reused
+        # by a newer history once the old one is freed. Extractors run in parallel
+        # threads, so the slot and the LRU below are guarded by a lock.
+        self._uh_src: Optional[dspy.History] = None
+        self._uh_len: int = -1
+        self._uh_filtered: Optional[dspy.History] = None
+        self._cache_lock = threading.Lock()
+
+        # Bounded LRU of extractor results keyed on (kind, message, history digest)
+        self._extraction_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+
+    @staticmethod
+    def _history_key(user_only_history: dspy.History) -> bytes:
+        """
+        Compact fingerprint of the recent user-only history for cache keys.
+
+        Uses the last few user messages truncated to a fixed width, so keys stay
+        small instead of serializing the whole dspy.History on every lookup.
+        """
+        messages = getattr(user_only_history, 'messages', None) or []
+        window = tuple(
+            str(m.get("content", "") if isinstance(m, dict) else m)[:_HISTORY_KEY_CHARS]
+            for m in messages[-_HISTORY_KEY_TURNS:]
+        )
+        return blake2b(repr(window).encode(), digest_size=8).digest()
+
+    def _cached_extract(self, kind: str, extractor, user_message: str,
+                        user_only_history: dspy.History, hkey: bytes):
+        """
+        Run a DataExtractionService method through the per-coordinator LRU.
+
+        Args:
+            kind: Cache namespace (e.g. "name", "phone")
+            extractor: Bound extract_*/parse_* method to call on a miss
+            user_message: Current user message
+            user_only_history: Filtered history passed to the extractor
+            hkey: Digest from _history_key()
+
+        Returns:
+            The extractor result (None results are cached too)
+        """
+        key = (kind, user_message, hkey)
+        cache = self._extraction_cache
+        with self._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+
+        result = extractor(user_message, user_only_history)
+        with self._cache_lock:
+            cache[key] = result
+            if len(cache) > _EXTRACTION_CACHE_SIZE:
+                cache.popitem(last=False)
+        return result
+
+    def _get_user_only_history(self, history: dspy.History) -> dspy.History:
+        """
+        Return the user-only view of history, reusing the cached copy when possible.
+
+        The filtered history is rebuilt only when a different history object is
+        passed in or new turns were appended since the last call, so retries and
+        repeated extraction calls within a turn don't pay the O(N) filter again.
+        """
+        messages = getattr(history, 'messages', None)
+        if messages is None:
+            return filter_dspy_history_to_user_only(history)
+
+        with self._cache_lock:
+            if history is self._uh_src and len(messages) == self._uh_len and self._uh_filtered is not None:
+                return self._uh_filtered
+
+        filtered = filter_dspy_history_to_user_only(history)
+        with self._cache_lock:
+            self._uh_src = history
+            self._uh_len = len(messages)
+            self._uh_filtered = filtered
+        return filtered
+
     def _is_vehicle_brand(self, text: str) -> bool:
         """
         Check if text matches any known vehicle brand from VehicleBrandEnum.
@@ -43,18 +175,15 @@ class ExtractionCoordinator:
         Returns:
             True if text matches a vehicle brand, False otherwise
         """
-        from models import VehicleBrandEnum
-
-        if not text or not text.strip():
+        if not text:
             return False
 
-        text_lower = text.lower().strip()
+        text_lower = text.casefold().strip()
+        if not text_lower:
+            return False
 
         # Check if text matches any vehicle brand (case-insensitive)
-        return any(
-            brand.value.lower() in text_lower or text_lower in brand.value.lower()
-            for brand in VehicleBrandEnum
-        )
+        return _BRAND_NAMES_RE.search(text_lower) is not None or text_lower in _BRAND_NAMES_HAYSTACK
 
     def extract_for_state(
         self,
@@ -83,19 +212,29 @@ class ExtractionCoordinator:
         # CRITICAL FIX: Filter history to USER-ONLY messages
         # Prevents LLM from reading chatbot's own responses during data extraction
         # Example: If chatbot says "you are finished", LLM won't extract "finished" as user intent
-        from history_utils import filter_dspy_history_to_user_only
-        user_only_history = filter_dspy_history_to_user_only(history)
+        user_only_history = self._get_user_only_history(history)
 
         extracted = {}
+        hkey = self._history_key(user_only_history)
 
-        # Try extracting NAME in any state (Phase 1 behavior)
+        # Guard: pure acknowledgements/greetings can't contain a name or vehicle
+        stripped_message = user_message.strip().strip(" .,!?").lower()
+        is_acknowledgement = stripped_message in Config.GREETING_STOPWORDS
+        has_words = not is_acknowledgement and bool(_HAS_ALPHA_WORD.search(user_message))
+
+        # DataExtractionService returns None on extraction failure, so each block
+        # just branches on the result; the outer try only guards unexpected faults.
         try:
-            name_data = self.data_extractor.extract_name(user_message, user_only_history)
-            if name_data:
+            # Try extracting NAME in any state (Phase 1 behavior)
+            name_data = (
+                self._cached_extract("name", self.data_extractor.extract_name, user_message, user_only_history, hkey)
+                if has_words else None
+            )
+            if name_data is not None:
                 # SANITIZATION: Strip quotes and clean DSPy output
                 # Fixes: DSPy sometimes returns '""' (quoted empty string) which fails Pydantic validation
                 first_name = str(name_data.first_name).strip().strip('"\'')
-                last_name = str(name_data.last_name).strip().strip('"\'') if hasattr(name_data, 'last_name') else ""
+                last_name = str(name_data.last_name).strip().strip('"\'') if name_data.last_name else ""
 
                 # VALIDATION: Reject if extracted name is actually a vehicle brand
                 # Fixes ISSUE_NAME_VEHICLE_CONFUSION (e.g., "Mahindra Scorpio" extracted as name)
@@ -105,67 +244,74 @@ class ExtractionCoordinator:
                 # Fixes: Prevent "Haan" (Hindi yes), "Hello", "Hi" etc. from being extracted as first_name
                 elif first_name and first_name.lower() in Config.GREETING_STOPWORDS:
                     logger.warning(f"❌ Rejected name extraction: '{first_name}' is a greeting stopword")
-                elif first_name and first_name.lower() not in ["none", "n/a", "unknown"]:
+                elif first_name and first_name.lower() not in _SENTINEL_NULLS:
                     extracted["first_name"] = first_name
                     extracted["last_name"] = last_name
                     extracted["full_name"] = f"{first_name} {last_name}".strip()
-                    logger.debug(f"✅ Extracted valid name: {extracted['full_name']}")
-        except Exception as e:
-            logger.debug(f"Name extraction failed: {e}")
-
-        # Try extracting PHONE in any state (Phase 1 behavior)
-        # IMPORTANT: Extract phone BEFORE vehicle to avoid confusion with plate numbers
-        try:
-            phone_data = self.data_extractor.extract_phone(user_message, user_only_history)
-            if phone_data:
+                    logger.debug("✅ Extracted valid name: %s", extracted["full_name"])
+
+            # Try extracting PHONE in any state (Phase 1 behavior)
+            # IMPORTANT: Extract phone BEFORE vehicle to avoid confusion with plate numbers
+            # Guard: a phone number needs at least 7 digits
+            phone_data = (
+                self._cached_extract("phone", self.data_extractor.extract_phone, user_message, user_only_history, hkey)
+                if _HAS_DIGITS7.search(user_message) else None
+            )
+            if phone_data is not None:
                 phone_number = str(phone_data.phone_number).strip() if phone_data.phone_number else None
-                if phone_number and phone_number.lower() not in ["none", "unknown", "n/a"]:
+                if phone_number and phone_number.lower() not in _SENTINEL_NULLS:
                     extracted["phone"] = phone_number
-        except Exception as e:
-            logger.debug(f"Phone extraction failed: {e}")
 
-        # Try extracting VEHICLE in any state (Phase 1 behavior)
-        try:
-            vehicle_data = self.data_extractor.extract_vehicle_details(user_message, user_only_history)
-            if vehicle_data:
+            # Try extracting VEHICLE in any state (Phase 1 behavior)
+            # Guard: needs a plate-like token or at least one real word (brand/model)
+            vehicle_data = (
+                self._cached_extract("vehicle", self.data_extractor.extract_vehicle_details, user_message, user_only_history, hkey)
+                if has_words or _HAS_PLATE.search(user_message) else None
+            )
+            if vehicle_data is not None:
                 brand = str(vehicle_data.brand).strip() if vehicle_data.brand else None
-                if brand and brand.lower() not in ["none", "unknown"]:
+                if brand and brand.lower() not in _SENTINEL_NULLS:
                     extracted["vehicle_brand"] = brand
                     extracted["vehicle_model"] = str(vehicle_data.model).strip() if vehicle_data.model else "Unknown"
                     extracted["vehicle_plate"] = str(vehicle_data.number_plate).strip() if vehicle_data.number_plate else "Unknown"
-        except Exception as e:
-            logger.debug(f"Vehicle extraction failed: {e}")
 
-        # Try extracting DATE in any state (Phase 1 behavior)
-        # CRITICAL FIX: Prevent chatbot from reading its own words
-        # Even with user_only_history filter, DSPy date parser can infer dates from context
-        # Solution: Only accept dates if explicitly mentioned in user message
-        try:
-            date_data = self.data_extractor.parse_date(user_message, user_only_history)
-            if date_data:
-                date_str = str(date_data.date_str).strip() if date_data.date_str else None
-                # VALIDATION: Check if the extracted date keywords are actually in the user message
-                # This prevents inference from implicit context like "checking slots" → "today"
-                if date_str and date_str.lower() not in ["none", "unknown"]:
-                    # Check if user message contains explicit date indicators
-                    date_keywords = ["today", "tomorrow", "monday", "tuesday", "wednesday", "thursday",
-                                   "friday", "saturday", "sunday", "next", "this", "day", "date",
-                                   "time", "slot", "appointment", "when", "schedule", "book",
-                                   "january", "february", "march", "april", "may", "june",
-                                   "july", "august", "september", "october", "november", "december"]
-                    user_msg_lower = user_message.lower()
-                    has_date_intent = any(keyword in user_msg_lower for keyword in date_keywords)
-
-                    if has_date_intent:
+            # Try extracting DATE in any state (Phase 1 behavior)
+            # CRITICAL FIX: Prevent chatbot from reading its own words
+            # Even with user_only_history filter, DSPy date parser can infer dates from context
+            # Solution: Only accept dates if explicitly mentioned in user message.
+            # The keyword check runs BEFORE the parser so we skip the LLM call entirely
+            # when the message has no date indicator (e.g. "checking slots" → "today").
+            if _DATE_KEYWORD_RE.search(user_message):
+                # Relative dates ("tomorrow") depend on today, so the day is part of the key
+                date_data = self._cached_extract(
+                    f"date:{date.today().isoformat()}", self.data_extractor.parse_date,
+                    user_message, user_only_history, hkey
+                )
+                if date_data is not None:
+                    date_str = str(date_data.date_str).strip() if date_data.date_str else None
+                    if date_str and date_str.lower() not in _SENTINEL_NULLS:
                         extracted["appointment_date"] = date_str
-                    else:
-                        logger.debug(f"⏭️  DATE REJECTED: No explicit date keywords in user message: '{user_message}'")
+            else:
+                logger.debug("⏭️  DATE SKIPPED: No explicit date keywords in user message: '%s'", user_message)
         except Exception as e:
-            logger.debug(f"Date extraction failed: {e}")
+            logger.error(f"❌ Extraction failed unexpectedly: {type(e).__name__}: {e}")
 
         # Return extracted data if any, otherwise None
         return extracted if extracted else None
 
+    async def aextract_for_state(
+        self,
+        state: ConversationState,
+        user_message: str,
+        history: dspy.History
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of extract_for_state(); runs the DSPy calls in a worker thread."""
+        return await asyncio.to_thread(self.extract_for_state, state, user_message, history)
+
+    async def aclassify_intent(self, history: dspy.History, user_message: str) -> ValidatedIntent:
+        """Async variant of classify_intent(); runs the DSPy call in a worker thread."""
+        return await asyncio.to_thread(self.classify_intent, history, user_message)
+
     def classify_intent(self, history: dspy.History, user_message: str) -> ValidatedIntent:
         """
         Classify customer intent (pricing, booking, complaint, etc.).
@@ -177,8 +323,6 @@ class ExtractionCoordinator:
         Returns:
             Validated intent with confidence score
         """
-        from modules import IntentClassifier
-
         ensure_configured()
         try:
             classifier = IntentClassifier()
@@ -202,12 +346,15 @@ class ExtractionCoordinator:
             # CRITICAL FIX: Normalize intent - replace hyphens with underscores
             # LLM may return 'small-talk' but validation expects 'small_talk'
             intent_class = intent_class.replace('-', '_')
+            intent_class = _INTENT_INTERN.get(intent_class, intent_class)
 
+            # intent_class/reasoning come from the LLM, so keep full validation here;
+            # metadata is built from trusted constants and skips it via model_construct()
             return ValidatedIntent(
                 intent_class=intent_class,
                 confidence=0.8,
                 reasoning=str(result.reasoning),
-                metadata=ExtractionMetadata(
+                metadata=ExtractionMetadata.model_construct(
                     confidence=0.8,
                     extraction_method="dspy",
                     extraction_source=user_message
@@ -215,57 +362,50 @@ class ExtractionCoordinator:
             )
         except Exception as e:
             logger.warning(f"Intent classification failed: {type(e).__name__}: {e}, defaulting to inquire")
-            return ValidatedIntent(
+            # Fallback is built entirely from known-valid constants: skip validation
+            return ValidatedIntent.model_construct(
                 intent_class="inquire",
                 confidence=0.0,
                 reasoning="Failed to classify intent, using default",
-                metadata=ExtractionMetadata(
+                metadata=ExtractionMetadata.model_construct(
                     confidence=0.0,
                     extraction_method="fallback",
                     extraction_source=user_message
                 )
             )
 
-    def detect_typos_in_confirmation(
-        self,
-        extracted_data: Dict[str, Any],
-        user_message: str,
-        history: dspy.History
-    ) -> Optional[Dict[str, str]]:
+    def acknowledgement_intent(self, user_message: str) -> ValidatedIntent:
         """
-        Detect typos in extracted data using DSPy TypoDetector module.
+        Intent for a pure acknowledgement turn ("ok", "thanks"), built without an LLM call.
 
         Args:
-            extracted_data: Data extracted from user message
             user_message: User's raw message
-            history: Conversation history
 
         Returns:
-            Dictionary of field_name -> correction or None
+            small_talk intent with rule-based metadata
         """
-        from modules import TypoDetector
+        return ValidatedIntent.model_construct(
+            intent_class=_INTENT_INTERN["small_talk"],
+            confidence=0.9,
+            reasoning="Acknowledgement matched by rule, no classification needed",
+            metadata=ExtractionMetadata.model_construct(
+                confidence=0.9,
+                extraction_method="rule_based",
+                extraction_source=user_message
+            )
+        )
 
-        ensure_configured()
-        try:
-            typo_detector = TypoDetector()
-            corrections = {}
-
-            # Check each extracted field for typos
-            for field_name, value in extracted_data.items():
-                if isinstance(value, str) and len(value.strip()) > 0:
-                    result = typo_detector(
-                        input_text=value,
-                        conversation_history=history,
-                        field_name=field_name
-                    )
-                    if result and hasattr(result, 'has_typo') and result.has_typo:
-                        if hasattr(result, 'correction') and result.correction:
-                            corrections[field_name] = result.correction
-
-            return corrections if corrections else None
-        except Exception as e:
-            logger.debug(f"Typo detection failed: {e}")
-            return None
+    async def adetect_typos_in_response(
+        self,
+        user_message: str,
+        history: dspy.History,
+        last_bot_message: str = "",
+        expected_actions: str = "confirm, edit, cancel"
+    ) -> Optional[str]:
+        """Async variant of detect_typos_in_response(); runs in a worker thread."""
+        return await asyncio.to_thread(
+            self.detect_typos_in_response, user_message, history, last_bot_message, expected_actions
+        )
 
     def detect_typos_in_response(
         self,
@@ -292,12 +432,19 @@ class ExtractionCoordinator:
         Returns:
             Friendly "Did you mean...?" message if typos detected, None otherwise
         """
-        from modules import TypoDetector
-
         # Guard: Only run if we have a template context
         if not last_bot_message or last_bot_message.strip() == "":
             return None
 
+        # FAST PATH: exact/near action words are settled locally; the LLM only sees ambiguous replies
+        action, ratio = self._match_action(user_message, expected_actions)
+        if ratio == 1.0 or ratio < _TYPO_REJECT_RATIO:
+            return None
+        # Only a one-word reply is corrected locally; longer ones may be well-formed sentences
+        if ratio >= _TYPO_ACCEPT_RATIO and len(user_message.split()) == 1:
+            logger.info(f"🔤 TYPO DETECTED (local): '{user_message}' → '{action}'")
+            return f"Did you mean '{action}'?"
+
         ensure_configured()
         try:
             typo_detector = TypoDetector()
@@ -309,26 +456,57 @@ class ExtractionCoordinator:
                 expected_actions=expected_actions
             )
 
-            if result:
-                # Check if typo was detected
-                is_typo = getattr(result, 'is_typo', False)
-                if is_typo:
-                    intended_action = getattr(result, 'intended_action', '')
-                    suggestion = getattr(result, 'suggestion', '')
-
-                    if intended_action and intended_action.lower() not in ["none", "unknown", ""]:
-                        # Create friendly "did you mean" message
-                        msg = f"Did you mean '{intended_action}'?"
-                        if suggestion and suggestion.strip():
-                            msg = suggestion  # Use LLM's friendly suggestion if available
-                        logger.info(f"🔤 TYPO DETECTED: '{user_message}' → '{intended_action}'")
-                        return msg
+            if result is None:
+                return None
+
+            # Check if typo was detected (TypoDetector always returns typed fields)
+            if result.is_typo:
+                intended_action = result.intended_action
+                suggestion = result.suggestion
+
+                if intended_action and intended_action.lower() not in _SENTINEL_NULLS:
+                    # Create friendly "did you mean" message
+                    msg = f"Did you mean '{intended_action}'?"
+                    if suggestion:
+                        msg = suggestion  # Use LLM's friendly suggestion if available
+                    logger.info(f"🔤 TYPO DETECTED: '{user_message}' → '{intended_action}'")
+                    return msg
 
             return None
         except Exception as e:
-            logger.debug(f"Typo detection in response failed: {e}")
+            logger.debug("Typo detection in response failed: %s", e)
             return None
 
+    @staticmethod
+    def _match_action(user_message: str, expected_actions: str) -> Tuple[Optional[str], float]:
+        """
+        Closest expected action to any word of the user's reply (difflib similarity).
+
+        Returns:
+            (action, ratio); ratio is 1.0 when a word already is an action, and
+            (None, 0.0) when the reply has no word to compare
+        """
+        actions = [a.strip().lower() for a in expected_actions.split(",") if a.strip()]
+        words = _WORD_RE.findall(user_message.lower())
+        if not actions or not words:
+            return None, 0.0
+        action_set = set(actions)
+        best_action, best_ratio = None, 0.0
+        for word in words:
+            if word in action_set:
+                return word, 1.0
+            if len(word) < 3:
+                continue
+            matcher = difflib.SequenceMatcher(None, b=word)
+            for action in actions:
+                matcher.set_seq1(action)
+                # quick_ratio() is an upper bound: skip the full ratio when it can't win
+                if matcher.quick_ratio() > best_ratio:
+                    ratio = matcher.ratio()
+                    if ratio > best_ratio:
+                        best_action, best_ratio = action, ratio
+        return best_action, best_ratio
+
     def validate_time_slot(self, time_slot_name: str) -> bool:
         """
         Validate that a time slot name is valid and configured.
@@ -372,12 +550,14 @@ class ExtractionCoordinator:
         try:
             slot_config = config.TIME_SLOTS[slot_name]
 
-            validated_slot = ValidatedTimeSlot(
+            # Slot name was checked by validate_time_slot() and times come straight
+            # from config.TIME_SLOTS, so skip re-running the boundary validators
+            validated_slot = ValidatedTimeSlot.model_construct(
                 slot_name=TimeSlotEnum(slot_name),
                 start_time=slot_config["start"],
                 end_time=slot_config["end"],
                 label=slot_config["label"],
-                metadata=ExtractionMetadata(
+                metadata=ExtractionMetadata.model_construct(
                     confidence=1.0,
                     extraction_method="rule_based",
                     extraction_source=f"config.TIME_SLOTS['{slot_name}']",
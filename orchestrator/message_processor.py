@@ -7,33 +7,280 @@ Reason to change: Overall message processing flow changes.
 This is the ONLY class that should coordinate between components.
 All other logic is delegated to specialized coordinators.
 """
+import asyncio
 import dspy
+import functools
 import logging
+import re
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Tuple
 from config import ConversationState, config
 from conversation_manager import ConversationManager
-from sentiment_analyzer import SentimentAnalysisService
+from sentiment_analyzer import get_sentiment_service
 from response_composer import ResponseComposer
 from template_manager import TemplateManager
 from models import ValidatedChatbotResponse
-from retroactive_validator import final_validation_sweep
+from retroactive_validator import REQUIREMENTS_FROZEN
+from booking.scratchpad import FIELD_SECTION_MAP
 
 # Import coordinators (SRP-compliant modules)
 from .state_coordinator import StateCoordinator
 from .extraction_coordinator import ExtractionCoordinator
 from .scratchpad_coordinator import ScratchpadCoordinator
+from .prediction_cache import PredictionCache, SemanticCache, is_llm_result
+from . import retroactive_cache
 
 # Import optional fields extractor (from parent directory)
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from optional_fields_extractor import OptionalFieldsExtractor
-from modules import ConfirmationIntentDetector
+from modules import (
+    ConfirmationIntentDetector,
+    SentimentToneAnalyzer,
+    ToneAwareResponseGenerator,
+    StateAwareResponseGenerator,
+)
+from conversation_script_manager import conversation_script_manager
 
 logger = logging.getLogger(__name__)
 
 
+# Booking-only dependencies: loaded on first booking instead of every turn or at import
+@functools.cache
+def _service_request_builder():
+    from booking.service_request import ServiceRequestBuilder
+    return ServiceRequestBuilder
+
+
+@functools.cache
+def _dump_service_request():
+    from service_request_dumper import adump_service_request
+    return adump_service_request
+
+def _safe_float(value: Any, default: float) -> float:
+    """Coerce value to float, falling back to default if it can't be parsed."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+@functools.lru_cache(maxsize=128)
+def _keyword_pattern(keywords: tuple) -> Optional["re.Pattern"]:
+    """One compiled alternation per keyword group (None for an empty group), cached per state script."""
+    if not keywords:
+        return None
+    # Longest first so the alternation can't stop early on a shorter prefix of another keyword;
+    # case-insensitive so callers can search the raw text without a lower() copy
+    return re.compile("|".join(map(re.escape, sorted(keywords, key=len, reverse=True))), re.I)
+
+
+def _mentions_any(pattern: Optional["re.Pattern"], text: str) -> bool:
+    """Substring semantics of any(kw in text for kw in keywords) in a single scan."""
+    return pattern is not None and pattern.search(text) is not None
+
+
+def _refine_parallel(
+    module_cls: Callable[[], dspy.Module],
+    attempts: int,
+    threshold: float,
+    reward_fn: Callable[[Dict[str, Any], Any], float],
+    hedge_delay: float = config.REFINE_HEDGE_DELAY_SECONDS,
+    **inputs: Any
+) -> Any:
+    """
+    Early-exit, hedged variant of dspy.Refine.
+
+    The first attempt runs alone. If it clears the threshold no further attempt is
+    made; if it scores below the threshold, the next attempt starts immediately; if
+    it is still running after hedge_delay seconds, the next attempt starts alongside
+    it and whichever clears the threshold first wins.
+
+    Attempts after the first use a distinct rollout_id at temperature 1.0 (as Refine does)
+    so they are real alternatives rather than repeats. If none clears the threshold the
+    best-scoring prediction is returned.
+
+    Args:
+        module_cls: Factory for the module to sample (one instance per attempt)
+        attempts: Max number of attempts
+        threshold: Reward at which an attempt is accepted immediately
+        reward_fn: reward_fn(inputs, prediction) -> float
+        hedge_delay: Seconds to wait on a running attempt before starting the next one
+        **inputs: Module inputs
+
+    Returns:
+        Best prediction, or None if every attempt failed
+    """
+    base_lm = dspy.settings.lm
+
+    def sample(attempt: int) -> Any:
+        module = module_cls()
+        if attempt == 0 or base_lm is None or not hasattr(base_lm, "copy"):
+            return module(**inputs)
+        with dspy.context(lm=base_lm.copy(rollout_id=attempt, temperature=1.0)):
+            return module(**inputs)
+
+    best, best_score = None, float("-inf")
+    executor = ThreadPoolExecutor(max_workers=attempts)
+    pending = set()
+    launched = 0
+    try:
+        pending.add(executor.submit(sample, launched))
+        launched += 1
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=hedge_delay if launched < attempts else None,
+                return_when=FIRST_COMPLETED
+            )
+            if not done:
+                # Current attempt is slow: hedge with the next one
+                pending.add(executor.submit(sample, launched))
+                launched += 1
+                continue
+            for future in done:
+                try:
+                    prediction = future.result()
+                    score = reward_fn(inputs, prediction)
+                except Exception as e:
+                    logger.debug("Refine attempt failed: %s", e)
+                    continue
+                if score >= threshold:
+                    return prediction
+                if score > best_score:
+                    best, best_score = prediction, score
+            if not pending and launched < attempts:
+                # Below threshold (or failed): try the next attempt right away
+                pending.add(executor.submit(sample, launched))
+                launched += 1
+    finally:
+        # Don't wait for slower attempts once one has been accepted
+        executor.shutdown(wait=False, cancel_futures=True)
+    return best
+
+
+@functools.cache
+def _tone_analyzer() -> SentimentToneAnalyzer:
+    return SentimentToneAnalyzer()
+
+
+def _quantize_score(score: float) -> int:
+    """Round a 1-10 sentiment score to an integer: a stable cache key and byte-stable prompt text."""
+    return int(round(score))
+
+
+@functools.lru_cache(maxsize=4096)
+def _tone_for(interest: int, anger: int, disgust: int, boredom: int, neutral: int) -> Tuple[str, str]:
+    """
+    Tone directive and max sentences for integer-quantized sentiment scores.
+
+    Memoized: the directive is coarse ("be empathetic", "be brief"), so turns whose
+    scores round to the same integers reuse the decision instead of another LLM call.
+
+    Returns:
+        (tone_directive, max_sentences)
+    """
+    tone_result = _tone_analyzer()(
+        interest_score=interest,
+        anger_score=anger,
+        disgust_score=disgust,
+        boredom_score=boredom,
+        neutral_score=neutral
+    )
+    if not tone_result:
+        return "be helpful", "3"
+    return tone_result.tone_directive, tone_result.max_sentences
+
+
+def _score_kernel(
+    sentence_count: int,
+    words_count: int,
+    response_length: int,
+    goal_hit: bool,
+    field_hit: bool,
+    angry: bool,
+    empathy_hit: bool
+) -> float:
+    """
+    Response quality score (0.0 to 1.0) from pre-extracted response features.
+
+    Pure arithmetic, kept separate from text scanning so the scorer closure only
+    extracts features. See response_quality_score for the criteria.
+    """
+    score = 0.0
+
+    # PRIORITY 1: Conciseness - prefer 1-2 sentences, penalize verbose
+    # Ideal: 1-2 sentences, max ~40 words
+    if sentence_count <= 2 and words_count <= 40:
+        score += 0.30  # Perfect conciseness
+    elif sentence_count <= 2 and words_count <= 60:
+        score += 0.25  # Good conciseness
+    elif sentence_count <= 3 and words_count <= 80:
+        score += 0.15  # Acceptable but verbose
+    else:
+        score += 0.05  # Too verbose, penalize heavily
+
+    # Check if response acknowledges/addresses state goal
+    if goal_hit:
+        score += 0.30
+
+    # Check if response naturally asks for next fields
+    if field_hit:
+        score += 0.25
+    elif response_length > 20:  # At least asking something
+        score += 0.15
+
+    # Check sentiment respect (avoid sounding dismissive if angry)
+    if angry:
+        if empathy_hit:
+            score += 0.15
+    else:
+        score += 0.10
+
+    return min(1.0, score)
+
+
+class _StrView(Mapping):
+    """Read-only view of a dict whose values are str()-converted on access.
+
+    Template variables are only rendered on template turns; most turns never read them.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getitem__(self, key: str) -> str:
+        return str(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Empathy vocabulary expected in replies to angry customers (substring match, like the goal/field checks)
+_SENTIMENT_RE = _keyword_pattern(("understand", "sorry", "help", "appreciate"))
+
+# Confirmation-step keyword categories (substring match, like the original any(kw in ...) checks)
+CONFIRM_RE = _keyword_pattern(("yes", "confirm", "ok", "okay", "book", "proceed", "finalize", "haan", "haa"))
+EDIT_RE = _keyword_pattern(("edit", "change", "update", "correct", "modify"))
+CANCEL_RE = _keyword_pattern(("cancel", "no", "abort"))
+
+# Placeholder values that never overwrite collected data
+_INVALID_VALUES = frozenset({"unknown", "none", ""})
+
+# Pure acknowledgement turns ("ok", "thanks", "👍") that can't carry new data or a new intent.
+# "yes"/"no" are answers (e.g. to "shall I book?"), so they always take the full path
+ACK_RE = re.compile(r"^(?:ok|okay|thanks|thank you|sure|fine|👍)[.!\s]*$", re.I)
+ACK_MAX_LENGTH = 15
+
+
 class MessageProcessor:
     """
     Main orchestrator coordinating message processing flow.
@@ -48,7 +295,7 @@ class MessageProcessor:
         """Initialize message processor with all required services and coordinators."""
         # Core services
         self.conversation_manager = ConversationManager()
-        self.sentiment_service = SentimentAnalysisService()
+        self.sentiment_service = get_sentiment_service()
         self.response_composer = ResponseComposer()
         self.template_manager = TemplateManager()
 
@@ -63,10 +310,31 @@ class MessageProcessor:
         # DSPy-based confirmation intent detector
         self.confirmation_intent_detector = ConfirmationIntentDetector()
 
+        # Memoized intent/sentiment/typo predictions (repeated "ok"/"yes"/"haan" replies)
+        self.prediction_cache = PredictionCache()
+        # Paraphrase-tolerant cache for confirmation intent ("yes please" ~ "yes, please!")
+        self.confirmation_cache = SemanticCache()
+
+        # Strong references to fire-and-forget retroactive sweeps (asyncio keeps only weak ones)
+        self._background_tasks: set = set()
+
     def process_message(
         self,
         conversation_id: str,
         user_message: str
+    ) -> ValidatedChatbotResponse:
+        """
+        Synchronous entry point for callers without an event loop.
+
+        Runs aprocess_message() to completion. Async callers (FastAPI handlers)
+        should await aprocess_message() directly instead.
+        """
+        return asyncio.run(self.aprocess_message(conversation_id, user_message))
+
+    async def aprocess_message(
+        self,
+        conversation_id: str,
+        user_message: str
     ) -> ValidatedChatbotResponse:
         """
         Process incoming user message with intelligent sentiment + template-aware decisions.
@@ -98,25 +366,59 @@ class MessageProcessor:
         # 2. Get current state from stored conversation context
         current_state = context.state
 
-        # 2a. Classify user intent (delegated to ExtractionCoordinator)
-        intent = self.extraction_coordinator.classify_intent(history, user_message)
+        # 2a-2b + 4. Intent, sentiment and data extraction only depend on history,
+        # message and state, so the three LLM round-trips run concurrently
+        # Intent and sentiment go through the prediction cache; fallback results are not cached
+        cache = self.prediction_cache
+
+        # In CONFIRMATION state the DSPy confirmation intent check (8.5) only needs
+        # history and the message: start it now so it overlaps intent/sentiment/extraction
+        confirmation_task = None
+        if current_state == ConversationState.CONFIRMATION:
+            confirmation_task = asyncio.create_task(
+                self._adetect_confirmation_intent(history, current_state, user_message)
+            )
 
-        # 2b. Analyze sentiment (interest, anger, disgust, boredom, neutral)
-        sentiment = self.sentiment_service.analyze(history, user_message)
+        # FAST PATH: pure acknowledgements outside CONFIRMATION (which needs the DSPy
+        # confirmation check) skip intent, sentiment, extraction and the retroactive
+        # sweep. The last turn's sentiment is reused; response generation still runs.
+        stripped_message = user_message.strip()
+        is_acknowledgement = (
+            current_state != ConversationState.CONFIRMATION
+            and len(stripped_message) <= ACK_MAX_LENGTH
+            and ACK_RE.match(stripped_message) is not None
+        )
+        if is_acknowledgement:
+            logger.info("⚡ FAST PATH: Acknowledgement '%s' in state %s", stripped_message, current_state.value)
+            intent = self.extraction_coordinator.acknowledgement_intent(user_message)
+            sentiment = context._last_sentiment
+            extracted_data = None
+        else:
+            intent, sentiment, extracted_data = await asyncio.gather(
+                # Classify user intent (delegated to ExtractionCoordinator)
+                cache.aget_or_compute(
+                    cache.make_key("intent", user_message, history),
+                    lambda: self.extraction_coordinator.aclassify_intent(history, user_message),
+                    should_cache=is_llm_result
+                ),
+                # Analyze sentiment (interest, anger, disgust, boredom, neutral)
+                cache.aget_or_compute(
+                    cache.make_key("sentiment", user_message, history),
+                    lambda: self.sentiment_service.aanalyze(history, user_message),
+                    should_cache=is_llm_result
+                ),
+                # Extract structured data (delegated to ExtractionCoordinator)
+                self.extraction_coordinator.aextract_for_state(current_state, user_message, history),
+            )
+            context._last_sentiment = sentiment
 
         # 2c. Convert sentiment values to float (handle JSON string deserialization)
-        if sentiment:
-            try:
-                sentiment.interest = float(sentiment.interest)
-                sentiment.anger = float(sentiment.anger)
-                sentiment.disgust = float(sentiment.disgust)
-                sentiment.boredom = float(sentiment.boredom)
-            except (ValueError, TypeError):
-                # Fallback to defaults if conversion fails
-                sentiment.interest = 5.0
-                sentiment.anger = 1.0
-                sentiment.disgust = 1.0
-                sentiment.boredom = 1.0
+        # ValidatedSentimentScores already yields floats, so the steady state is one isinstance check
+        if sentiment and not isinstance(sentiment.interest, float):
+            sentiment.interest = _safe_float(sentiment.interest, 5.0)
+            sentiment.anger = _safe_float(sentiment.anger, 1.0)
+            sentiment.disgust = _safe_float(sentiment.disgust, 1.0)
+            sentiment.boredom = _safe_float(sentiment.boredom, 1.0)
 
         # 3. Decide response mode based on INTENT + SENTIMENT
         # Intent OVERRIDES sentiment (e.g., pricing inquiry always shows pricing template)
@@ -130,16 +432,13 @@ class MessageProcessor:
             current_state=current_state.value
         )
 
-        # 4. Extract structured data (delegated to ExtractionCoordinator)
-        extracted_data = self.extraction_coordinator.extract_for_state(
-            current_state, user_message, history
-        )
-
         # 5. Generate LLM response if needed (empathetic conversation)
         llm_response = ""
         if self.template_manager.should_send_llm_response(response_mode):
-            llm_response = self._generate_empathetic_response(
-                history, user_message, current_state, sentiment, extracted_data
+            llm_response = await asyncio.to_thread(
+                self._generate_empathetic_response,
+                history, user_message, current_state, sentiment, extracted_data,
+                conversation_id, dict(context.user_data)
             )
 
         # 6. Compose final response (combines LLM + template intelligently)
@@ -170,23 +469,18 @@ class MessageProcessor:
                 # In other states, expect data field corrections
                 expected_actions = "correct, change, edit, update, modify, wrong, typo, misspelled"
 
-            typo_correction_message = self.extraction_coordinator.detect_typos_in_response(
-                user_message, history, response["response"],
-                expected_actions=expected_actions
+            typo_correction_message = await cache.aget_or_compute(
+                cache.make_key("typo_response", user_message, history, response["response"], expected_actions),
+                lambda: self.extraction_coordinator.adetect_typos_in_response(
+                    user_message, history, response["response"],
+                    expected_actions=expected_actions
+                ),
+                should_cache=lambda r: r is not None
             )
             # If typo detected, prepend correction message to response
             if typo_correction_message:
                 response["response"] = typo_correction_message + "\n\n" + response["response"]
-                logger.info(f"✅ TYPO CORRECTION OFFERED: {typo_correction_message}")
-
-        # 6.6. Run detailed typo detection with extracted data
-        # (delegated to ExtractionCoordinator)
-        typo_corrections = None
-        if extracted_data:
-            # Run in all states, not just CONFIRMATION
-            typo_corrections = self.extraction_coordinator.detect_typos_in_confirmation(
-                extracted_data, user_message, history
-            )
+                logger.info("✅ TYPO CORRECTION OFFERED: %s", typo_correction_message)
 
         # 7. Store extracted data in conversation context
         if extracted_data:
@@ -196,13 +490,19 @@ class MessageProcessor:
         # 7.5. Retroactively validate and complete missing prerequisite data
         # OPTIMIZATION: Pass merged data (stored + extracted) to avoid redundant scans
         # CRITICAL: Only run retroactive validator if enabled (disabled after booking)
+        # Required fields behind the state transition flags (also used in step 8)
+        required_fields_confirmation = REQUIREMENTS_FROZEN.get(ConversationState.CONFIRMATION.value, frozenset())
+        required_fields_current_state = REQUIREMENTS_FROZEN.get(current_state.value, frozenset())
         try:
             # Merge stored data with current extraction to get complete picture
-            context = self.conversation_manager.get_or_create(conversation_id)
+            # (context from step 1 is the live object, no need to look it up again)
             merged_for_retroactive = {**context.user_data, **(extracted_data or {})}
 
             # Re-enable retroactive validator if returning to GREETING state
             if current_state == ConversationState.GREETING:
+                if context.metadata.get('retroactive_enabled') is False:
+                    # Fresh booking cycle: don't reuse sweeps from the previous one
+                    retroactive_cache.invalidate(context)
                 context.metadata['retroactive_enabled'] = True
                 logger.info("✅ RETROACTIVE: Re-enabled (state returned to GREETING)")
 
@@ -211,118 +511,88 @@ class MessageProcessor:
 
             if not retroactive_enabled:
                 logger.info("⏭️  RETROACTIVE: Skipped (disabled after booking creation)")
-                retroactive_data = {}
+            elif is_acknowledgement:
+                # Nothing new to recover from an acknowledgement turn
+                pass
+            elif (required_fields_current_state | required_fields_confirmation) <= merged_for_retroactive.keys():
+                # Sweep can't change this turn's state transition: run it off the critical
+                # path and let its results land in context.user_data for the next turn
+                task = asyncio.create_task(self._background_retroactive(
+                    conversation_id, context, current_state.value, merged_for_retroactive, history
+                ))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+                logger.info("🔄 RETROACTIVE: Sweep moved to background (requirements already met)")
             else:
-                logger.warning(f"🔄 RETROACTIVE: Starting sweep. State={current_state.value}, Extracted={extracted_data}")
-                retroactive_data = final_validation_sweep(
-                    current_state=current_state.value,
-                    extracted_data=merged_for_retroactive,  # Pass merged data instead of just extracted_data
-                    history=history
+                logger.warning("🔄 RETROACTIVE: Starting sweep. State=%s, Extracted=%s", current_state.value, extracted_data)
+                # Pass merged data instead of just extracted_data; identical
+                # (state, data, recent history) reuses the previous sweep result
+                retroactive_data = await asyncio.to_thread(
+                    retroactive_cache.cached_validation_sweep,
+                    context, current_state.value, merged_for_retroactive, history
                 )
-                logger.warning(f"🔄 RETROACTIVE: Result={retroactive_data}")
-
-            # Merge retroactively filled data with existing extracted data
-            # CRITICAL FIX: Only merge if new value is not None/Unknown
-            if retroactive_data:
-                if not extracted_data:
-                    extracted_data = {}
-                # Track what changed (including improvements to "Unknown" values)
-                improved_fields = []
-                for key, value in retroactive_data.items():
-                    # CRITICAL FIX: Skip if retroactive value is None or "Unknown"
-                    # This prevents overwriting existing valid data with None/Unknown
-                    if value is None or str(value).lower() in ["unknown", "none", ""]:
-                        logger.debug(f"⏭️  RETROACTIVE: Skipping {key}={value} (invalid value)")
-                        continue
-
-                    old_value = merged_for_retroactive.get(key)  # Check against merged data, not just extracted_data
-                    if old_value != value:
-                        if str(old_value).lower() == "unknown" and str(value).lower() != "unknown":
-                            improved_fields.append(f"{key}: {old_value}→{value}")
-                        elif key not in merged_for_retroactive or old_value is None:
-                            improved_fields.append(key)
-                    extracted_data[key] = value
-                if improved_fields:
-                    logger.warning(f"⚡ RETROACTIVE IMPROVEMENTS: {improved_fields}")
-                # Store retroactively filled data (only valid values)
-                for key, value in retroactive_data.items():
-                    if value is not None and str(value).lower() not in ["unknown", "none", ""]:
-                        self.conversation_manager.store_user_data(conversation_id, key, value)
+                logger.warning("🔄 RETROACTIVE: Result=%s", retroactive_data)
+
+                # Merge retroactively filled data with existing extracted data
+                if retroactive_data:
+                    if not extracted_data:
+                        extracted_data = {}
+                    self._apply_retroactive_data(
+                        conversation_id, retroactive_data, merged_for_retroactive, extracted_data
+                    )
         except Exception as e:
-            logger.error(f"❌ Retroactive validation ERROR: {type(e).__name__}: {e}", exc_info=True)
+            logger.error("❌ Retroactive validation ERROR: %s: %s", type(e).__name__, e, exc_info=True)
 
         # 8. Check if ALL required fields are present (needed for state transition decision)
-        from retroactive_validator import DataRequirements
-        required_fields_confirmation = set(DataRequirements.REQUIREMENTS.get(ConversationState.CONFIRMATION.value, []))
-        required_fields_current_state = set(DataRequirements.REQUIREMENTS.get(current_state.value, []))
-
         # CRITICAL FIX: Merge ConversationManager's stored data with current turn's extracted_data
-        # This ensures retroactively-filled fields are included in the field-presence check
-        context = self.conversation_manager.get_or_create(conversation_id)
+        # This ensures retroactively-filled fields are included in the field-presence check.
+        # Computed once here and reused for scratchpad population in 8.4.
         merged_data = {**context.user_data, **(extracted_data or {})}
-        extracted_fields = set(merged_data.keys())
+        # dict keys are a set-like view, so the subset checks need no set copy
+        extracted_fields = merged_data.keys()
 
         # Check if ALL required fields are present
-        has_all_required = required_fields_confirmation.issubset(extracted_fields)
-        can_advance_from_current_state = required_fields_current_state.issubset(extracted_fields)
+        has_all_required = required_fields_confirmation <= extracted_fields
+        can_advance_from_current_state = required_fields_current_state <= extracted_fields
 
         # Debug logging to track field completion
-        print(f"🔍 flags: has_all_required={has_all_required}, can_advance={can_advance_from_current_state}, merged_keys={list(merged_data.keys())}")
+        logger.debug(
+            "🔍 flags: has_all_required=%s, can_advance=%s, merged_keys=%s",
+            has_all_required, can_advance_from_current_state, list(merged_data)
+        )
 
         # Initialize scratchpad early (needed for confirmation flow)
         scratchpad = self.scratchpad_coordinator.get_or_create(conversation_id)
 
         # 8.4. CRITICAL FIX: Populate scratchpad with ALL collected data BEFORE booking
         # This ensures ServiceRequestBuilder has complete data when creating booking
-        # Merge all data sources: conversation_manager stored data + current extraction
-        all_collected_data = {**context.user_data, **(extracted_data or {})}
+        # All data sources (stored data + current extraction) are already merged in merged_data
 
-        # Map field names from extracted/stored data to scratchpad sections
-        for field_name, value in all_collected_data.items():
+        # Map field names from extracted/stored data to scratchpad sections, then write
+        # them in one bulk upsert (one completeness recalculation instead of one per field)
+        by_section: Dict[str, Dict[str, Any]] = {"customer": {}, "vehicle": {}, "appointment": {}}
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for field_name, value in merged_data.items():
             if value is None:
                 continue
-
-            # Determine section based on field name
-            if field_name in ["first_name", "last_name", "full_name", "phone", "address"]:
-                section = "customer"
-                scratchpad_field = field_name
-            elif field_name in ["vehicle_brand", "vehicle_model", "vehicle_plate", "vehicle_type"]:
-                section = "vehicle"
-                # Map extracted field names to scratchpad field names
-                field_mapping = {
-                    "vehicle_brand": "brand",
-                    "vehicle_model": "model",
-                    "vehicle_plate": "plate",
-                    "vehicle_type": "vehicle_type"
-                }
-                scratchpad_field = field_mapping.get(field_name, field_name)
-            elif field_name in ["appointment_date", "service_type", "service_tier", "time_slot", "notes"]:
-                section = "appointment"
-                # Map extracted field names to scratchpad field names
-                field_mapping = {
-                    "appointment_date": "date",
-                    "service_type": "service_type",
-                    "service_tier": "service_tier",
-                    "time_slot": "time_slot",
-                    "notes": "notes"
-                }
-                scratchpad_field = field_mapping.get(field_name, field_name)
-            else:
+            mapping = FIELD_SECTION_MAP.get(field_name)
+            if mapping is None:
                 # Unknown field, skip
-                logger.debug(f"⏭️  SCRATCHPAD: Skipping unknown field {field_name}")
+                if debug_enabled:
+                    logger.debug("⏭️  SCRATCHPAD: Skipping unknown field %s", field_name)
                 continue
-
-            # Add to scratchpad with metadata
-            scratchpad.add_field(
-                section=section,
-                field_name=scratchpad_field,
-                value=value,
-                source="collection",
-                turn=0,
-                confidence=1.0,
-                extraction_method="collected"
-            )
-            logger.debug(f"✅ SCRATCHPAD: Added {section}.{scratchpad_field}={value}")
+            section, scratchpad_field = mapping
+            by_section[section][scratchpad_field] = value
+
+        added = scratchpad.add_fields_bulk(
+            by_section,
+            source="collection",
+            turn=0,
+            confidence=1.0,
+            extraction_method="collected"
+        )
+        if debug_enabled:
+            logger.debug("✅ SCRATCHPAD: Bulk-added %s collected fields", added)
 
         # 8.5. CONFIRMATION FLOW: Handle 3-attempt confirmation with auto-booking
         service_request_id = None
@@ -331,21 +601,22 @@ class MessageProcessor:
             confirmation_attempts = context.metadata.get('confirmation_attempts', 0)
 
             # Check if user confirmed explicitly (keyword-based)
-            confirm_keywords = ["yes", "confirm", "ok", "okay", "book", "proceed", "finalize", "haan", "haa"]
-            user_confirmed_keywords = any(kw in user_message.lower() for kw in confirm_keywords)
+            user_confirmed_keywords = bool(CONFIRM_RE.search(user_message))
 
             # Use DSPy-based confirmation intent detector for more intelligent detection
+            # (started concurrently with intent/sentiment/extraction above)
             try:
-                confirmation_result = self.confirmation_intent_detector(
-                    conversation_history=history,
-                    current_state=current_state.value,
-                    user_message=user_message
-                )
+                confirmation_result = await confirmation_task
+                if confirmation_result is None:
+                    raise ValueError("no detector result")
                 user_confirmed_dspy = confirmation_result.is_confirming.lower() == "true"
                 dspy_confidence = float(confirmation_result.confidence) if hasattr(confirmation_result, 'confidence') else 0.0
-                logger.info(f"🤖 CONFIRMATION (DSPy): is_confirming={user_confirmed_dspy}, confidence={dspy_confidence}, reasoning={confirmation_result.reasoning if hasattr(confirmation_result, 'reasoning') else 'N/A'}")
+                logger.info(
+                    "🤖 CONFIRMATION (DSPy): is_confirming=%s, confidence=%s, reasoning=%s",
+                    user_confirmed_dspy, dspy_confidence, getattr(confirmation_result, 'reasoning', 'N/A')
+                )
             except Exception as e:
-                logger.warning(f"⚠️  CONFIRMATION (DSPy): Failed to use DSPy detector: {e}, falling back to keywords")
+                logger.warning("⚠️  CONFIRMATION (DSPy): Failed to use DSPy detector: %s, falling back to keywords", e)
                 user_confirmed_dspy = user_confirmed_keywords
                 dspy_confidence = 1.0 if user_confirmed_keywords else 0.0
 
@@ -353,10 +624,8 @@ class MessageProcessor:
             user_confirmed = user_confirmed_keywords or user_confirmed_dspy
 
             # Check if user wants to edit/cancel
-            edit_keywords = ["edit", "change", "update", "correct", "modify"]
-            cancel_keywords = ["cancel", "no", "abort"]
-            user_wants_edit = any(kw in user_message.lower() for kw in edit_keywords)
-            user_wants_cancel = any(kw in user_message.lower() for kw in cancel_keywords)
+            user_wants_edit = bool(EDIT_RE.search(user_message))
+            user_wants_cancel = bool(CANCEL_RE.search(user_message))
 
             # Increment confirmation attempts
             confirmation_attempts += 1
@@ -376,11 +645,10 @@ class MessageProcessor:
                     if existing_service_request_id and scratchpad_completeness == 0.0:
                         # Booking already created by BUTTON mode, scratchpad already cleared
                         service_request_id = existing_service_request_id
-                        logger.warning(f"⏭️  REUSE EXISTING: Booking already done (likely BUTTON mode), service_request_id={service_request_id}")
+                        logger.warning("⏭️  REUSE EXISTING: Booking already done (likely BUTTON mode), service_request_id=%s", service_request_id)
                     else:
                         # Create booking using ServiceRequestBuilder (scratchpad is now populated)
-                        from booking.service_request import ServiceRequestBuilder
-                        service_request = ServiceRequestBuilder.build(scratchpad, conversation_id)
+                        service_request = _service_request_builder().build(scratchpad, conversation_id)
                         service_request_id = service_request.service_request_id
 
                         # Store service_request_id (DO NOT disable retroactive validator yet)
@@ -395,15 +663,15 @@ class MessageProcessor:
                         # CRITICAL: Mark that booking is complete (will disable retroactive after state transition to COMPLETED)
                         context.metadata['booking_completed'] = True
 
-                        logger.warning(f"✅ BOOKING CREATED (CHAT MODE): service_request_id={service_request_id}, attempts={confirmation_attempts}, auto_confirmed={auto_confirmed}")
+                        logger.warning("✅ BOOKING CREATED (CHAT MODE): service_request_id=%s, attempts=%s, auto_confirmed=%s", service_request_id, confirmation_attempts, auto_confirmed)
                 else:  # BUTTON mode
                     # Stay in CONFIRMATION state, do NOT create service request here
                     # The /api/confirmation endpoint will handle service request creation
-                    logger.info(f"🔘 BUTTON MODE: User confirmed (attempts={confirmation_attempts}, auto={auto_confirmed}), waiting for button click to create service request")
+                    logger.info("🔘 BUTTON MODE: User confirmed (attempts=%s, auto=%s), waiting for button click to create service request", confirmation_attempts, auto_confirmed)
             elif user_wants_edit or user_wants_cancel:
                 # Reset confirmation attempts if user wants to edit or cancel
                 context.metadata['confirmation_attempts'] = 0
-                logger.info(f"🔄 CONFIRMATION: User requested {'cancel' if user_wants_cancel else 'edit'}, resetting attempts")
+                logger.info("🔄 CONFIRMATION: User requested %s, resetting attempts", 'cancel' if user_wants_cancel else 'edit')
 
         # 9. Determine next state (delegated to StateCoordinator)
         # CRITICAL FIX: Pass both flags to prevent premature state jumps
@@ -416,7 +684,10 @@ class MessageProcessor:
             reason = self.state_coordinator.determine_state_change_reason(
                 user_message, sentiment, extracted_data
             )
-            print(f"📊 decision.complete_check: has_all_required={has_all_required}, current_state={current_state.value}, next_state={next_state.value}")
+            logger.debug(
+                "📊 decision.complete_check: has_all_required=%s, current_state=%s, next_state=%s",
+                has_all_required, current_state.value, next_state.value
+            )
             self.conversation_manager.update_state(conversation_id, next_state, reason)
 
         # CRITICAL: Disable retroactive validator ONLY when state transitions to COMPLETED after booking
@@ -444,14 +715,7 @@ class MessageProcessor:
 
         # CRITICAL FIX: Build scratchpad dict BEFORE any clearing happens
         # This captures the actual scratchpad state to return in API response
-        scratchpad_dict = None
-        if scratchpad:
-            scratchpad_dict = {
-                "customer": {k: v.value for k, v in scratchpad.form.customer.items() if v.value is not None},
-                "vehicle": {k: v.value for k, v in scratchpad.form.vehicle.items() if v.value is not None},
-                "appointment": {k: v.value for k, v in scratchpad.form.appointment.items() if v.value is not None},
-                "completeness": scratchpad_completeness
-            }
+        scratchpad_dict = scratchpad.to_api_dict() if scratchpad else None
 
         # Build service request dict for API response (NEW: for v3 visualization)
         service_request_dict = None
@@ -466,17 +730,15 @@ class MessageProcessor:
         # Previously was done at line 345 before scratchpad_dict was created
         # ONLY clear in CHAT mode - in BUTTON mode, /api/confirmation endpoint handles clearing
         if service_request_id and config.CONFIRMATION_MODE == "CHAT":
-            scratchpad_completeness = scratchpad.get_completeness()
-
+            # scratchpad_completeness from above is still current (nothing mutated since)
             # PROTECTION: Check if scratchpad is empty (already cleared by BUTTON mode)
             # If service_request_id exists but scratchpad is empty, skip dump (already done)
             if scratchpad_completeness == 0.0:
-                logger.warning(f"⏭️  SKIP DUMP: Scratchpad already cleared (booking done in BUTTON mode), service_request_id={service_request_id}")
+                logger.warning("⏭️  SKIP DUMP: Scratchpad already cleared (booking done in BUTTON mode), service_request_id=%s", service_request_id)
             else:
                 # Dump service request JSON before clearing scratchpad (CHAT mode only)
-                from service_request_dumper import dump_service_request
                 try:
-                    dump_service_request(
+                    await _dump_service_request()(
                         service_request_id=service_request_id,
                         conversation_id=conversation_id,
                         scratchpad=scratchpad,
@@ -484,11 +746,16 @@ class MessageProcessor:
                         additional_metadata={"confirmation_mode": "CHAT"}
                     )
                 except Exception as e:
-                    logger.error(f"❌ Failed to dump service request: {e}")
+                    logger.error("❌ Failed to dump service request: %s", e)
 
                 # Now clear scratchpad after successful dump
                 scratchpad.clear_all()
-                logger.info(f"🧹 SCRATCHPAD CLEARED (CHAT MODE): service_request_id={service_request_id}")
+                logger.info("🧹 SCRATCHPAD CLEARED (CHAT MODE): service_request_id=%s", service_request_id)
+
+        # Snapshot to disk (when persistence is configured, after any clearing) so a
+        # restart resumes this conversation
+        if self.scratchpad_coordinator.disk_store is not None:
+            await asyncio.to_thread(self.scratchpad_coordinator.flush, conversation_id)
 
         return ValidatedChatbotResponse(
             message=response["response"],
@@ -505,48 +772,183 @@ class MessageProcessor:
             scratchpad=scratchpad_dict,  # NEW: Include scratchpad contents
             state=next_state.value,
             data_extracted=data_extracted_this_turn,
-            typo_corrections=typo_corrections,
             service_request_id=service_request_id,  # Include booking ID if created
             service_request=service_request_dict  # NEW: Include full service request
         )
 
+    def _apply_retroactive_data(
+        self,
+        conversation_id: str,
+        retroactive_data: Dict[str, Any],
+        merged_for_retroactive: Dict[str, Any],
+        extracted_data: Dict[str, Any],
+        only_missing: bool = False
+    ) -> None:
+        """
+        Merge a retroactive sweep result into extracted_data and store it.
+
+        Args:
+            conversation_id: Conversation identifier
+            retroactive_data: Fields returned by the sweep
+            merged_for_retroactive: Stored + extracted data the sweep ran against
+            extracted_data: This turn's extracted data (updated in place)
+            only_missing: Re-read the stored user data and only fill keys that are
+                still missing or placeholders (background sweeps: the user may have
+                set or corrected a field since the snapshot was taken)
+        """
+        # Track what changed (including improvements to "Unknown" values) and
+        # store valid values in the same pass
+        improved_fields = []
+        for key, value in retroactive_data.items():
+            # CRITICAL FIX: Skip if retroactive value is None or "Unknown"
+            # This prevents overwriting existing valid data with None/Unknown
+            if value is None or str(value).lower() in _INVALID_VALUES:
+                logger.debug("⏭️  RETROACTIVE: Skipping %s=%s (invalid value)", key, value)
+                continue
+            if only_missing:
+                current = self.conversation_manager.get_user_data(conversation_id, key)
+                if current is not None and str(current).lower() not in _INVALID_VALUES:
+                    logger.debug("⏭️  RETROACTIVE: Skipping %s (set since the sweep started)", key)
+                    continue
+
+            old_value = merged_for_retroactive.get(key)  # Check against merged data, not just extracted_data
+            if old_value != value:
+                if old_value is not None and str(old_value).lower() == "unknown":
+                    improved_fields.append(f"{key}: {old_value}→{value}")
+                elif key not in merged_for_retroactive or old_value is None:
+                    improved_fields.append(key)
+            extracted_data[key] = value
+            self.conversation_manager.store_user_data(conversation_id, key, value)
+        if improved_fields:
+            logger.warning("⚡ RETROACTIVE IMPROVEMENTS: %s", improved_fields)
+
+    async def _background_retroactive(
+        self,
+        conversation_id: str,
+        context: Any,
+        current_state: str,
+        merged_for_retroactive: Dict[str, Any],
+        history: dspy.History
+    ) -> None:
+        """
+        Run a retroactive sweep after the response and store its improvements for the next turn.
+
+        Only scheduled when the sweep can't affect the current turn's state transition.
+        Note: the synchronous process_message() shim closes its event loop on return,
+        which cancels a still-running sweep; async callers keep it running.
+        """
+        try:
+            retroactive_data = await asyncio.to_thread(
+                retroactive_cache.cached_validation_sweep,
+                context, current_state, merged_for_retroactive, history
+            )
+            logger.info("🔄 RETROACTIVE (background): Result=%s", retroactive_data)
+            if retroactive_data:
+                self._apply_retroactive_data(
+                    conversation_id, retroactive_data, merged_for_retroactive, {},
+                    only_missing=True
+                )
+        except Exception as e:
+            logger.error("❌ Background retroactive validation ERROR: %s: %s", type(e).__name__, e, exc_info=True)
+
+    async def _adetect_confirmation_intent(
+        self,
+        history: dspy.History,
+        current_state: ConversationState,
+        user_message: str
+    ):
+        """
+        Run the DSPy confirmation intent detector in a worker thread.
+
+        Started speculatively as soon as the turn is in CONFIRMATION state, so
+        failures are logged and returned as None instead of raised; the result
+        may go unused if required fields turn out to be missing.
+        """
+        # What "yes" confirms depends on the conversation: scope reuse to state + history tail
+        context_key = self.prediction_cache.make_key("confirmation_context", "", history, current_state.value)
+        cached = self.confirmation_cache.lookup(user_message, context_key)
+        if cached is not None:
+            logger.info("⚡ CONFIRMATION (DSPy): Reusing cached intent for similar phrasing")
+            return cached
+
+        try:
+            result = await asyncio.to_thread(
+                self.confirmation_intent_detector,
+                conversation_history=history,
+                current_state=current_state.value,
+                user_message=user_message
+            )
+        except Exception as e:
+            logger.warning("⚠️  CONFIRMATION (DSPy): Detector call failed: %s", e)
+            return None
+
+        # Only cache confident results so one shaky prediction can't poison paraphrases
+        try:
+            confidence = float(getattr(result, 'confidence', 0.0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        if result is not None and confidence > config.SEMANTIC_CACHE_MIN_CONFIDENCE:
+            self.confirmation_cache.add(user_message, result, context_key)
+        return result
+
     def _generate_empathetic_response(
         self,
         history: dspy.History,
         user_message: str,
         current_state: ConversationState,
         sentiment,
-        extracted_data: Optional[Dict[str, Any]]
+        extracted_data: Optional[Dict[str, Any]],
+        conversation_id: str = "",
+        user_data: Optional[Dict[str, Any]] = None
     ) -> str:
         """Generate empathetic LLM response based on context, sentiment, and state goals using DSPy Refine.
 
         NEW: Integrates StateAwareResponseGenerator with DSPy Refine for quality improvement.
         Falls back to ToneAwareResponseGenerator if state scripts unavailable.
         """
-        from modules import SentimentToneAnalyzer, ToneAwareResponseGenerator, StateAwareResponseGenerator
-        from conversation_script_manager import conversation_script_manager
-
         try:
+            # Collected data formatted once per turn, shared by the state-aware and tone-aware paths
+            collected_fields_str = ""
+            if extracted_data:
+                collected_fields_str = "; ".join([f"{k}: {v}" for k, v in extracted_data.items()])
+
             # Step 1: Try to get state script for proactive personality
             state_script = conversation_script_manager.get_script(current_state.value)
 
             if state_script:
                 # NEW: Use StateAwareResponseGenerator with DSPy Refine for quality improvement
                 try:
-                    logger.info(f"🎯 STATE-AWARE GENERATION: Using script for state '{current_state.value}'")
+                    logger.info("🎯 STATE-AWARE GENERATION: Using script for state '%s'", current_state.value)
 
-                    # Format collected fields and needed fields
-                    collected_fields_str = ""
-                    if extracted_data:
-                        collected_fields_str = "; ".join([f"{k}: {v}" for k, v in extracted_data.items()])
+                    # Needed fields are fixed per state script (formatted once, cached on the script)
+                    needed_fields_str = state_script.need_next_str
 
-                    needed_fields_str = ", ".join(state_script.need_next) if state_script.need_next else "None"
+                    # Scorer keywords are invariant across Refine attempts: build them once
+                    # (one compiled pattern per keyword group, so each check is a single scan)
+                    goal_pattern = _keyword_pattern(
+                        tuple(kw for kw in state_script.goal.lower().split()[:5] if len(kw) > 3)  # First 5 words of goal
+                    )
+                    field_pattern = _keyword_pattern(tuple(f.lower() for f in state_script.need_next))
+                    angry = bool(sentiment and sentiment.anger > 6.0)
+
+                    # Responses are personalized, so reuse is scoped to this conversation and
+                    # everything collected so far (e.g. a retried turn), never across customers
+                    response_key = self.prediction_cache.make_key(
+                        "state_response", user_message, history,
+                        conversation_id, sorted((user_data or {}).items()),
+                        current_state.value, state_script.goal, state_script.personality,
+                        collected_fields_str, needed_fields_str, angry
+                    )
+                    cached_response = self.prediction_cache.get(response_key)
+                    if cached_response:
+                        logger.info("⚡ STATE-AWARE RESPONSE: Reusing cached response")
+                        return cached_response
 
                     # Define response quality scorer
                     def response_quality_score(attempted_output, predicted_output) -> float:
                         """Score response on multiple quality criteria (0.0 to 1.0).
 
-                        DSPy Refine passes both attempted and predicted outputs.
+                        _refine_parallel (like DSPy Refine) passes the inputs and predicted output.
                         We use the predicted output (the LLM's generation).
 
                         Criteria:
@@ -558,52 +960,22 @@ class MessageProcessor:
                         # Extract response text from predicted output
                         response = str(predicted_output.response if hasattr(predicted_output, 'response') else predicted_output)
 
-                        score = 0.0
-
-                        # PRIORITY 1: Conciseness - prefer 1-2 sentences, penalize verbose
-                        sentence_count = response.count('.') + response.count('?') + response.count('!')
-                        words_count = len(response.split())
-
-                        # Ideal: 1-2 sentences, max ~40 words
-                        if sentence_count <= 2 and words_count <= 40:
-                            score += 0.30  # Perfect conciseness
-                        elif sentence_count <= 2 and words_count <= 60:
-                            score += 0.25  # Good conciseness
-                        elif sentence_count <= 3 and words_count <= 80:
-                            score += 0.15  # Acceptable but verbose
-                        else:
-                            score += 0.05  # Too verbose, penalize heavily
-
-                        # Check if response acknowledges/addresses state goal
-                        goal_keywords = state_script.goal.lower().split()[:5]  # First 5 words of goal
-                        if any(kw in response.lower() for kw in goal_keywords if len(kw) > 3):
-                            score += 0.30
-
-                        # Check if response naturally asks for next fields
-                        field_keywords = [f.lower() for f in state_script.need_next]
-                        if any(fk in response.lower() for fk in field_keywords):
-                            score += 0.25
-                        elif len(response) > 20:  # At least asking something
-                            score += 0.15
-
-                        # Check sentiment respect (avoid sounding dismissive if angry)
-                        if sentiment and sentiment.anger > 6.0:
-                            if any(word in response.lower() for word in ["understand", "sorry", "help", "appreciate"]):
-                                score += 0.15
-                        else:
-                            score += 0.10
-
-                        return min(1.0, score)
-
-                    # Try up to 2 attempts with Refine
-                    refined_generator = dspy.Refine(
-                        StateAwareResponseGenerator(),
-                        N=2,  # Max 2 attempts
+                        return _score_kernel(
+                            sentence_count=response.count('.') + response.count('?') + response.count('!'),
+                            words_count=len(response.split()),
+                            response_length=len(response),
+                            goal_hit=_mentions_any(goal_pattern, response),
+                            field_hit=_mentions_any(field_pattern, response),
+                            angry=angry,
+                            empathy_hit=angry and _SENTIMENT_RE.search(response) is not None
+                        )
+
+                    # Up to 2 attempts; the second only runs if the first is slow or scores low
+                    result = _refine_parallel(
+                        StateAwareResponseGenerator,
+                        attempts=2,  # Max 2 attempts
                         threshold=0.75,  # Accept if quality >= 75%
-                        reward_fn=response_quality_score
-                    )
-
-                    result = refined_generator(
+                        reward_fn=response_quality_score,
                         conversation_history=history,
                         current_state=current_state.value,
                         state_goal=state_script.goal,
@@ -616,33 +988,32 @@ class MessageProcessor:
                     response = result.response if result and hasattr(result, 'response') else ""
 
                     if response and response.strip():
-                        logger.info(f"✅ STATE-AWARE RESPONSE: Generated with goal-awareness and Refine")
+                        logger.info("✅ STATE-AWARE RESPONSE: Generated with goal-awareness and Refine")
+                        self.prediction_cache.set(response_key, response)
                         return response
 
-                    logger.warning(f"⚠️  STATE-AWARE RESPONSE: Generated empty, falling back to tone-aware")
+                    logger.warning("⚠️  STATE-AWARE RESPONSE: Generated empty, falling back to tone-aware")
 
                 except Exception as e:
-                    logger.warning(f"⚠️  STATE-AWARE GENERATION FAILED: {e}, falling back to tone-aware approach")
+                    logger.warning("⚠️  STATE-AWARE GENERATION FAILED: %s, falling back to tone-aware approach", e)
 
             # Fallback: Original tone-aware generation
-            # Step 2: Analyze sentiment and determine appropriate tone + brevity
-            tone_analyzer = SentimentToneAnalyzer()
-            tone_result = tone_analyzer(
-                interest_score=sentiment.interest if sentiment else 5.0,
-                anger_score=sentiment.anger if sentiment else 1.0,
-                disgust_score=sentiment.disgust if sentiment else 1.0,
-                boredom_score=sentiment.boredom if sentiment else 1.0,
-                neutral_score=sentiment.neutral if sentiment else 1.0
-            )
-
-            tone_directive = tone_result.tone_directive if tone_result else "be helpful"
-            max_sentences = tone_result.max_sentences if tone_result else "3"
+            # Step 2: Tone + brevity normally arrive with the sentiment call (fused signature);
+            # only fallback/legacy sentiment without them needs the separate tone analyzer
+            if sentiment and getattr(sentiment, 'tone_directive', None) and getattr(sentiment, 'max_sentences', None):
+                tone_directive, max_sentences = sentiment.tone_directive, sentiment.max_sentences
+            else:
+                # Scores are rounded to integers so near-identical sentiment reuses the decision
+                tone_directive, max_sentences = _tone_for(
+                    _quantize_score(sentiment.interest if sentiment else 5.0),
+                    _quantize_score(sentiment.anger if sentiment else 1.0),
+                    _quantize_score(sentiment.disgust if sentiment else 1.0),
+                    _quantize_score(sentiment.boredom if sentiment else 1.0),
+                    _quantize_score(sentiment.neutral if sentiment else 1.0)
+                )
 
             # Step 3: Generate response with tone and brevity constraints
             # Pass collected data so LLM doesn't ask for data user already provided
-            collected_data_str = ""
-            if extracted_data:
-                collected_data_str = "; ".join([f"{k}: {v}" for k, v in extracted_data.items()])
 
             response_generator = ToneAwareResponseGenerator()
             result = response_generator(
@@ -651,13 +1022,13 @@ class MessageProcessor:
                 tone_directive=tone_directive,
                 max_sentences=max_sentences,
                 current_state=current_state.value,
-                collected_data=collected_data_str
+                collected_data=collected_fields_str
             )
 
             response = result.response if result else ""
 
             # Log the tone decision for debugging
-            logger.debug(f"🎯 TONE ANALYSIS: tone='{tone_directive}' max_sentences={max_sentences}")
+            logger.debug("🎯 TONE ANALYSIS: tone='%s' max_sentences=%s", tone_directive, max_sentences)
 
             # Ensure we never return empty string
             if not response or not response.strip():
@@ -665,11 +1036,11 @@ class MessageProcessor:
             return response
 
         except Exception as e:
-            logger.warning(f"⚠️  Response generation failed: {e}, using fallback")
+            logger.warning("⚠️  Response generation failed: %s, using fallback", e)
             return "I understand. How can I help?"
 
-    def _get_template_variables(self, extracted_data: Optional[Dict[str, Any]]) -> Dict[str, str]:
-        """Extract variables needed for template rendering."""
+    def _get_template_variables(self, extracted_data: Optional[Dict[str, Any]]) -> Mapping[str, str]:
+        """Extract variables needed for template rendering (stringified lazily, on access)."""
         if not extracted_data:
             return {}
-        return {k: str(v) for k, v in extracted_data.items()}
\ No newline at end of file
+        return _StrView(extracted_data)
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+Prediction Cache - Memoizes per-turn DSPy predictions.
+
+Single Responsibility: Cache LLM predictions keyed by module, model, message and recent history.
+Reason to change: Prediction caching policy changes.
+
+Users often repeat short replies ("ok", "yes", "haan", "confirm"), and each one
+otherwise pays a full LLM round-trip for intent, sentiment and typo checks.
+"""
+import hashlib
+import logging
+import math
+import pickle
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+import dspy
+from config import config
+
+# Optional: Redis lets several API workers share cached predictions
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Punctuation/whitespace collapsed before fingerprinting text for the semantic cache
+_NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+
+# Tokens (after normalization, so "don't" -> "don", "t") that flip a reply's meaning
+# while barely changing its trigrams: such replies are never matched fuzzily
+_NEGATION_TOKENS = frozenset({
+    "no", "not", "nope", "nah", "never", "dont", "don", "cant", "can", "wont", "won", "t",
+    "nahi", "nai", "na", "mat", "cancel", "stop",
+})
+
+# Sentinel distinguishing "not cached" from a cached None (e.g. "no typo found")
+_MISSING = object()
+
+
+def is_llm_result(result: Any) -> bool:
+    """Return False for fallback results (LLM failure) so they are not cached."""
+    metadata = getattr(result, "metadata", None)
+    return getattr(metadata, "extraction_method", None) != "fallback"
+
+
+class PredictionCache:
+    """
+    Thread-safe in-process LRU of DSPy predictions with optional Redis backing.
+
+    Keys are truncated SHA-256 digests of (module, model, message, history tail),
+    so they stay small regardless of conversation length.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = config.PREDICTION_CACHE_SIZE,
+        history_turns: int = config.PREDICTION_CACHE_HISTORY_TURNS,
+        redis_url: Optional[str] = config.PREDICTION_CACHE_REDIS_URL
+    ):
+        self.maxsize = maxsize
+        self.history_turns = history_turns
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._redis = None
+        if redis_url and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning("⚠️  PREDICTION CACHE: Redis unavailable (%s), using in-process cache only", e)
+
+    def make_key(self, module: str, user_message: str, history: Optional[dspy.History] = None, *extra: Any) -> str:
+        """
+        Build a compact cache key.
+
+        Args:
+            module: Logical module name (e.g. "intent", "sentiment")
+            user_message: Current user message
+            history: Conversation history; only the last few turns are used
+            *extra: Additional inputs that affect the prediction
+
+        Returns:
+            32-char hex digest
+        """
+        messages = getattr(history, "messages", None) or []
+        tail = "\x1e".join(
+            f"{m.get('role', '')}:{m.get('content', '')}" if isinstance(m, dict) else str(m)
+            for m in messages[-self.history_turns:]
+        )
+        raw = "|".join([module, config.MODEL_NAME, user_message, tail, *map(repr, extra)])
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def _lookup(self, key: str) -> Any:
+        """Return the cached value (which may be None) or _MISSING."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        if self._redis is not None:
+            try:
+                payload = self._redis.get(f"prediction:{key}")
+                if payload is not None:
+                    value = pickle.loads(payload)
+                    self._store_local(key, value)
+                    self.hits += 1
+                    return value
+            except Exception as e:
+                logger.debug("Prediction cache Redis get failed: %s", e)
+
+        self.misses += 1
+        return _MISSING
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached prediction or None."""
+        value = self._lookup(key)
+        return None if value is _MISSING else value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a prediction locally (and in Redis when configured)."""
+        self._store_local(key, value)
+        if self._redis is not None:
+            try:
+                self._redis.set(
+                    f"prediction:{key}", pickle.dumps(value),
+                    ex=config.PREDICTION_CACHE_REDIS_TTL_SECONDS
+                )
+            except Exception as e:
+                logger.debug("Prediction cache Redis set failed: %s", e)
+
+    def _store_local(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool] = lambda result: True
+    ) -> Any:
+        """
+        Return the cached prediction, computing and storing it on a miss.
+
+        Args:
+            key: Key from make_key()
+            compute: Zero-arg callable producing the prediction
+            should_cache: Predicate deciding whether a computed result is stored
+
+        Returns:
+            Cached or freshly computed prediction
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        result = compute()
+        if should_cache(result):
+            self.set(key, result)
+        return result
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda result: True
+    ) -> Any:
+        """Async variant of get_or_compute() for awaitable producers."""
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        result = await compute()
+        if should_cache(result):
+            self.set(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Drop all in-process entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _trigram_vector(text: str) -> Counter:
+    """Character-trigram counts of normalized text (cheap paraphrase fingerprint)."""
+    padded = f" {_NORMALIZE_RE.sub(' ', text.lower()).strip()} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class SemanticCache:
+    """
+    Near-duplicate cache for short replies ("yes please" / "yes, please!").
+
+    Entries are scoped by a caller-supplied context (e.g. a PredictionCache key of
+    the history tail and state), since what "yes" means depends on the conversation.
+    Within a context, a short reply without negation tokens reuses the prediction of
+    the most similar cached reply when the character-trigram cosine similarity meets
+    the threshold; anything longer or negated ("dont confirm ...") needs an exact
+    (normalized) match. Intended for small, high-confidence result sets such as
+    confirmation intent, where a linear scan over a bounded LRU is cheap.
+    """
+
+    def __init__(
+        self,
+        threshold: float = config.SEMANTIC_CACHE_THRESHOLD,
+        maxsize: int = config.SEMANTIC_CACHE_SIZE,
+        max_fuzzy_words: int = config.SEMANTIC_CACHE_MAX_WORDS
+    ):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.max_fuzzy_words = max_fuzzy_words
+        # (context, normalized text) -> (trigram vector or None if exact-only, vector norm, cached value)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return _NORMALIZE_RE.sub(" ", text.lower()).strip()
+
+    def _fuzzy_eligible(self, normalized: str) -> bool:
+        """Short replies without negation tokens may be matched by similarity."""
+        words = normalized.split()
+        return 0 < len(words) <= self.max_fuzzy_words and _NEGATION_TOKENS.isdisjoint(words)
+
+    def lookup(self, text: str, context: str = "") -> Optional[Any]:
+        """Return the value cached for this (or, if short and un-negated, the most similar) message, or None."""
+        normalized = self._normalize(text)
+        key = (context, normalized)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[2]
+
+            if not self._fuzzy_eligible(normalized):
+                return None
+            vector = _trigram_vector(text)
+            norm = math.sqrt(sum(c * c for c in vector.values()))
+            if not norm:
+                return None
+
+            best_key, best_sim = None, 0.0
+            for other_key, (other, other_norm, _) in self._entries.items():
+                if other is None or other_key[0] != context:
+                    continue
+                dot = sum(c * other.get(gram, 0) for gram, c in vector.items())
+                sim = dot / (norm * other_norm)
+                if sim > best_sim:
+                    best_key, best_sim = other_key, sim
+
+            if best_key is not None and best_sim >= self.threshold:
+                self._entries.move_to_end(best_key)
+                logger.debug("Semantic cache hit: '%s' ~ '%s' (%.2f)", normalized, best_key[1], best_sim)
+                return self._entries[best_key][2]
+        return None
+
+    def add(self, text: str, value: Any, context: str = "") -> None:
+        """Cache a prediction for text in context, evicting the least recently used entry."""
+        normalized = self._normalize(text)
+        if not normalized:
+            return
+        vector, norm = None, 0.0
+        if self._fuzzy_eligible(normalized):
+            vector = _trigram_vector(text)
+            norm = math.sqrt(sum(c * c for c in vector.values()))
+        key = (context, normalized)
+        with self._lock:
+            self._entries[key] = (vector, norm, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
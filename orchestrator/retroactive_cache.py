@@ -0,0 +1,117 @@
+"""
+Retroactive Cache - Memoizes final_validation_sweep per conversation.
+
+Single Responsibility: Skip repeated retroactive sweeps when nothing they depend on changed.
+Reason to change: Retroactive caching policy changes.
+
+The sweep runs LLM extractors over recent history. In confirmation loops the
+state, collected data and recent turns are often identical to a previous turn,
+so the result can be reused. The cache lives in a private attribute of the
+conversation context (not the user-facing metadata dict), so it is discarded
+together with the conversation. Background and foreground sweeps of the same
+conversation run in different worker threads, so access goes through a
+per-conversation lock.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import dspy
+from retroactive_validator import final_validation_sweep
+
+logger = logging.getLogger(__name__)
+
+# Guards lazy creation of a context's cache + lock
+_INIT_LOCK = threading.Lock()
+# Per-conversation bound (LRU eviction)
+_MAX_ENTRIES = 32
+# Recent history turns that feed the key
+_HISTORY_TAIL = 2
+
+
+def _hashable(value: Any) -> Any:
+    """Return value if hashable, else its repr (for dict/list values)."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def make_key(current_state: str, merged_data: Dict[str, Any], history: dspy.History) -> tuple:
+    """
+    Build the sweep cache key.
+
+    Args:
+        current_state: Current conversation state value
+        merged_data: Stored + extracted data passed to the sweep
+        history: Conversation history; only the last few turns are hashed
+
+    Returns:
+        (state, frozenset of data items, history tail digest)
+    """
+    messages = getattr(history, "messages", None) or []
+    tail = "|".join(str(m) for m in messages[-_HISTORY_TAIL:])
+    return (
+        current_state,
+        frozenset((k, _hashable(v)) for k, v in merged_data.items()),
+        hashlib.sha1(tail.encode()).digest(),
+    )
+
+
+def _cache_for(context: Any) -> Tuple["OrderedDict[tuple, Dict[str, Any]]", threading.Lock]:
+    """Return the conversation's sweep cache and lock, creating them on first use."""
+    with _INIT_LOCK:
+        if context._retroactive_cache is None:
+            context._retroactive_cache = OrderedDict()
+            context._retroactive_lock = threading.Lock()
+        return context._retroactive_cache, context._retroactive_lock
+
+
+def invalidate(context: Any) -> None:
+    """Drop the conversation's cached sweeps (e.g. when the validator is re-enabled)."""
+    cache, lock = _cache_for(context)
+    with lock:
+        cache.clear()
+
+
+def cached_validation_sweep(
+    context: Any,
+    current_state: str,
+    merged_data: Dict[str, Any],
+    history: dspy.History
+) -> Dict[str, Any]:
+    """
+    Run final_validation_sweep, reusing the result for an identical (state, data, history tail).
+
+    Args:
+        context: Conversation context (cache is stored in a private attribute)
+        current_state: Current conversation state value
+        merged_data: Stored + extracted data
+        history: Conversation history
+
+    Returns:
+        Dict of retroactively filled fields (a copy, safe to mutate)
+    """
+    cache, lock = _cache_for(context)
+
+    key = make_key(current_state, merged_data, history)
+    with lock:
+        if key in cache:
+            cache.move_to_end(key)
+            logger.info("⚡ RETROACTIVE: Reusing cached sweep for state=%s", current_state)
+            return dict(cache[key])
+
+    # The sweep itself (LLM calls) runs outside the lock
+    result = final_validation_sweep(
+        current_state=current_state,
+        extracted_data=merged_data,
+        history=history
+    ) or {}
+    with lock:
+        cache[key] = dict(result)
+        if len(cache) > _MAX_ENTRIES:
+            cache.popitem(last=False)
+    return result
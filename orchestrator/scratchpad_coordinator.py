@@ -14,12 +14,60 @@ Protection logic:
 3. Log all field updates for audit trail
 """
 import logging
-from typing import Dict, Any
-from config import ConversationState
-from booking.scratchpad import ScratchpadManager
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Mapping, Optional, Tuple
+from config import ConversationState, config
+from booking.scratchpad import ScratchpadManager, FIELD_SECTION_MAP
+from .scratchpad_store import ScratchpadDiskStore
 
 logger = logging.getLogger(__name__)
 
+# Optional/enhanced field name -> (scratchpad section, scratchpad field name), read-only
+_OPTIONAL_FIELD_MAPPING: Mapping[str, Tuple[str, str]] = MappingProxyType({
+    # Appointment section fields
+    "service_type": ("appointment", "service_type"),
+    "service_tier": ("appointment", "service_tier"),
+    "time_slot": ("appointment", "time_slot"),
+    "notes": ("appointment", "notes"),
+    # Vehicle section fields
+    "vehicle_type": ("vehicle", "vehicle_type"),
+    # Customer section fields (for address if needed)
+    "address": ("customer", "address"),
+})
+_OPTIONAL_FIELDS = frozenset(_OPTIONAL_FIELD_MAPPING)
+
+# Scratchpad section filled by update_from_extraction in each collection state
+_STATE_SECTION = {
+    ConversationState.NAME_COLLECTION: "customer",
+    ConversationState.VEHICLE_DETAILS: "vehicle",
+    ConversationState.DATE_SELECTION: "appointment",
+}
+
+
+def _section_handler(section: str) -> Callable[[ScratchpadManager, str, Any], None]:
+    """Build an update_from_extraction handler writing only the given section's fields."""
+    # extracted field name -> scratchpad field name, restricted to this section
+    field_map = MappingProxyType({
+        field: scratchpad_field
+        for field, (field_section, scratchpad_field) in FIELD_SECTION_MAP.items()
+        if field_section == section
+    })
+
+    def handle(scratchpad: ScratchpadManager, field_name: str, value: Any) -> None:
+        scratchpad_field = field_map.get(field_name)
+        if scratchpad_field is not None:
+            scratchpad.add_field(section, scratchpad_field, value, "extraction", turn=0)
+
+    return handle
+
+
+# State -> handler; states without one (e.g. GREETING, CONFIRMATION) don't write here
+_STATE_HANDLERS: Mapping[ConversationState, Callable[[ScratchpadManager, str, Any], None]] = MappingProxyType({
+    state: _section_handler(section) for state, section in _STATE_SECTION.items()
+})
+
 
 class ScratchpadCoordinator:
     """
@@ -30,9 +78,30 @@ class ScratchpadCoordinator:
     - Does NOT handle data extraction or state transitions
     """
 
-    def __init__(self):
-        """Initialize scratchpad coordinator with manager storage."""
-        self.scratchpad_managers: Dict[str, ScratchpadManager] = {}
+    def __init__(
+        self,
+        max_conversations: int = config.SCRATCHPAD_MAX_CONVERSATIONS,
+        ttl_seconds: float = config.SCRATCHPAD_TTL_SECONDS,
+        on_evict: Optional[Callable[[str, ScratchpadManager], None]] = None,
+        persist_dir: Optional[str] = config.SCRATCHPAD_PERSIST_DIR
+    ):
+        """
+        Initialize scratchpad coordinator with bounded manager storage.
+
+        Args:
+            max_conversations: Max scratchpads kept in memory (least recently used evicted first)
+            ttl_seconds: Idle time after which a scratchpad is evicted
+            on_evict: Optional hook called with (conversation_id, manager) before eviction,
+                e.g. to persist the scratchpad so the conversation can be rehydrated
+            persist_dir: Directory for on-disk scratchpad snapshots; None keeps them in memory only
+        """
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        # conversation_id -> (manager, last access time), least recently used first
+        self.scratchpad_managers: "OrderedDict[str, Tuple[ScratchpadManager, float]]" = OrderedDict()
+        # Second tier behind the in-memory LRU: evicted/restarted conversations reload from disk
+        self.disk_store = ScratchpadDiskStore(persist_dir) if persist_dir else None
 
     def get_or_create(self, conversation_id: str) -> ScratchpadManager:
         """
@@ -44,9 +113,47 @@ class ScratchpadCoordinator:
         Returns:
             ScratchpadManager instance
         """
-        if conversation_id not in self.scratchpad_managers:
-            self.scratchpad_managers[conversation_id] = ScratchpadManager(conversation_id)
-        return self.scratchpad_managers[conversation_id]
+        now = time.monotonic()
+        entry = self.scratchpad_managers.get(conversation_id)
+        if entry is not None and now - entry[1] <= self.ttl_seconds:
+            manager = entry[0]
+        else:
+            if entry is not None:
+                self._evict(conversation_id)
+            manager = self.disk_store.load(conversation_id) if self.disk_store else None
+            if manager is None:
+                manager = ScratchpadManager(conversation_id)
+            else:
+                logger.info("♻️  Restored scratchpad for conversation %s from disk", conversation_id)
+        self.scratchpad_managers[conversation_id] = (manager, now)
+        self.scratchpad_managers.move_to_end(conversation_id)
+        self._evict_stale(now)
+        return manager
+
+    def _evict_stale(self, now: float) -> None:
+        """Drop expired scratchpads and enforce max_conversations (oldest first)."""
+        while self.scratchpad_managers:
+            conversation_id, (_, last_access) = next(iter(self.scratchpad_managers.items()))
+            if len(self.scratchpad_managers) <= self.max_conversations and now - last_access <= self.ttl_seconds:
+                break
+            self._evict(conversation_id)
+
+    def flush(self, conversation_id: str) -> None:
+        """Write the conversation's scratchpad to disk (no-op without a persist_dir)."""
+        entry = self.scratchpad_managers.get(conversation_id)
+        if self.disk_store is not None and entry is not None:
+            self.disk_store.save(entry[0])
+
+    def _evict(self, conversation_id: str) -> None:
+        manager, _ = self.scratchpad_managers.pop(conversation_id)
+        if self.disk_store is not None:
+            self.disk_store.save(manager)
+        if self.on_evict is not None:
+            try:
+                self.on_evict(conversation_id, manager)
+            except Exception as e:
+                logger.warning("⚠️  Scratchpad eviction hook failed for %s: %s", conversation_id, e)
+        logger.debug("🧹 Evicted scratchpad for conversation %s", conversation_id)
 
     def update_from_extraction(
         self,
@@ -70,31 +177,10 @@ class ScratchpadCoordinator:
             - VEHICLE_DETAILS → vehicle section
             - DATE_SELECTION → appointment section
         """
-        # Map extracted fields to scratchpad sections
-        if state == ConversationState.NAME_COLLECTION:
-            section = "customer"
-            # Map field names
-            if field_name in ["first_name", "last_name", "full_name"]:
-                scratchpad.add_field(section, field_name, value, "extraction", turn=0)
-
-        elif state == ConversationState.VEHICLE_DETAILS:
-            section = "vehicle"
-            # Map vehicle fields
-            field_mapping = {
-                "vehicle_brand": "brand",
-                "vehicle_model": "model",
-                "vehicle_plate": "plate"
-            }
-            scratchpad_field = field_mapping.get(field_name, field_name)
-            scratchpad.add_field(section, scratchpad_field, value, "extraction", turn=0)
-
-        elif state == ConversationState.DATE_SELECTION:
-            section = "appointment"
-            field_mapping = {
-                "appointment_date": "date"
-            }
-            scratchpad_field = field_mapping.get(field_name, field_name)
-            scratchpad.add_field(section, scratchpad_field, value, "extraction", turn=0)
+        # Dispatch on state: one lookup, then one per-section field lookup
+        handler = _STATE_HANDLERS.get(state)
+        if handler is not None:
+            handler(scratchpad, field_name, value)
 
     def add_optional_fields(
         self,
@@ -115,55 +201,50 @@ class ScratchpadCoordinator:
             scratchpad: Scratchpad manager instance
             optional_data: Dict of optional fields extracted
         """
-        # Map optional fields to appropriate scratchpad sections
-        optional_field_mapping = {
-            # Appointment section fields
-            "service_type": ("appointment", "service_type"),
-            "service_tier": ("appointment", "service_tier"),
-            "time_slot": ("appointment", "time_slot"),
-            "notes": ("appointment", "notes"),
-            # Vehicle section fields
-            "vehicle_type": ("vehicle", "vehicle_type"),
-            # Customer section fields (for address if needed)
-            "address": ("customer", "address"),
-        }
-
+        # Split metadata fields (e.g., service_type_method) from values up front
+        methods = {}
+        fields = {}
         for field_name, value in optional_data.items():
-            # Skip metadata fields (e.g., service_type_method)
             if field_name.endswith("_method"):
-                continue
-
-            if field_name not in optional_field_mapping:
-                logger.debug(f"⚠️  Unknown optional field: {field_name}, skipping")
-                continue
-
-            section, scratchpad_field = optional_field_mapping[field_name]
-            extraction_method = optional_data.get(f"{field_name}_method", "explicit")
+                methods[field_name[:-len("_method")]] = value
+            elif field_name in _OPTIONAL_FIELDS:
+                fields[field_name] = value
+            else:
+                logger.debug("⚠️  Unknown optional field: %s, skipping", field_name)
+
+        # Existing entries for overwrite protection, fetched in one lookup
+        existing_fields = scratchpad.get_fields_bulk(_OPTIONAL_FIELD_MAPPING[f] for f in fields)
+
+        updates = []
+        added_names = []
+        info_enabled = logger.isEnabledFor(logging.INFO)
+        for field_name, value in fields.items():
+            section, scratchpad_field = _OPTIONAL_FIELD_MAPPING[field_name]
+            extraction_method = methods.get(field_name, "explicit")
 
             # Get existing field to check for overwrite protection
-            existing_field = scratchpad.get_field(section, scratchpad_field)
+            existing_field = existing_fields[(section, scratchpad_field)]
 
             if existing_field and existing_field.value:
                 # Check if we're trying to overwrite an explicit value with inferred
                 existing_method = existing_field.extraction_method or "explicit"
 
                 if existing_method == "explicit" and extraction_method == "inferred":
-                    logger.info(f"⏭️  PROTECTION: Not overwriting explicit '{field_name}' with inferred value")
+                    logger.info("⏭️  PROTECTION: Not overwriting explicit '%s' with inferred value", field_name)
                     continue
 
                 # Overwriting with same or better confidence
-                logger.info(f"♻️  UPDATING: '{field_name}' ({extraction_method}) overwriting previous value")
-
-            # Add the field with extraction method
-            scratchpad.add_field(
-                section,
-                scratchpad_field,
-                value,
-                source="extraction",
-                turn=0,
-                extraction_method=extraction_method
-            )
-            logger.info(f"✅ Added optional field: {field_name}={value} ({extraction_method})")
+                logger.info("♻️  UPDATING: '%s' (%s) overwriting previous value", field_name, extraction_method)
+
+            # Queue the field with its extraction method
+            updates.append((section, scratchpad_field, value, "extraction", 0, extraction_method))
+            if info_enabled:
+                added_names.append(f"{field_name}={value} ({extraction_method})")
+
+        # One bulk write (single completeness recalculation) and one log line
+        if updates:
+            scratchpad.update_many(updates)
+            logger.info("✅ Added %d optional fields: %s", len(updates), added_names)
 
     def update_optional_field(
         self,
@@ -184,29 +265,20 @@ class ScratchpadCoordinator:
         Returns:
             True if update succeeded, False if blocked by protection
         """
-        optional_field_mapping = {
-            "service_type": ("appointment", "service_type"),
-            "service_tier": ("appointment", "service_tier"),
-            "time_slot": ("appointment", "time_slot"),
-            "notes": ("appointment", "notes"),
-            "vehicle_type": ("vehicle", "vehicle_type"),
-            "address": ("customer", "address"),
-        }
-
-        if field_name not in optional_field_mapping:
-            logger.warning(f"❌ Unknown optional field: {field_name}")
+        if field_name not in _OPTIONAL_FIELDS:
+            logger.warning("❌ Unknown optional field: %s", field_name)
             return False
 
-        section, scratchpad_field = optional_field_mapping[field_name]
+        section, scratchpad_field = _OPTIONAL_FIELD_MAPPING[field_name]
         existing_field = scratchpad.get_field(section, scratchpad_field)
 
         # Apply protection unless explicitly allowed
         if existing_field and existing_field.value and not allow_overwrite:
-            logger.info(f"⏭️  UPDATE BLOCKED: '{field_name}' already has value, use allow_overwrite=True to force")
+            logger.info("⏭️  UPDATE BLOCKED: '%s' already has value, use allow_overwrite=True to force", field_name)
             return False
 
         scratchpad.update_field(section, scratchpad_field, new_value)
-        logger.info(f"✅ Updated optional field: {field_name}={new_value}")
+        logger.info("✅ Updated optional field: %s=%s", field_name, new_value)
         return True
 
     def delete_optional_field(
@@ -224,25 +296,16 @@ class ScratchpadCoordinator:
         Returns:
             True if deletion succeeded
         """
-        optional_field_mapping = {
-            "service_type": ("appointment", "service_type"),
-            "service_tier": ("appointment", "service_tier"),
-            "time_slot": ("appointment", "time_slot"),
-            "notes": ("appointment", "notes"),
-            "vehicle_type": ("vehicle", "vehicle_type"),
-            "address": ("customer", "address"),
-        }
-
-        if field_name not in optional_field_mapping:
-            logger.warning(f"❌ Unknown optional field: {field_name}")
+        if field_name not in _OPTIONAL_FIELDS:
+            logger.warning("❌ Unknown optional field: %s", field_name)
             return False
 
-        section, scratchpad_field = optional_field_mapping[field_name]
+        section, scratchpad_field = _OPTIONAL_FIELD_MAPPING[field_name]
         deleted = scratchpad.delete_field(section, scratchpad_field)
 
         if deleted:
-            logger.info(f"✅ Deleted optional field: {field_name}")
+            logger.info("✅ Deleted optional field: %s", field_name)
         else:
-            logger.debug(f"ℹ️  Optional field not found or already deleted: {field_name}")
+            logger.debug("ℹ️  Optional field not found or already deleted: %s", field_name)
 
         return deleted
\ No newline at end of file
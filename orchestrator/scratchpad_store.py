@@ -0,0 +1,64 @@
+"""
+Scratchpad Store - On-disk copies of scratchpads that outlive the in-memory LRU.
+
+Single Responsibility: Persist and reload ScratchpadManager instances.
+Reason to change: Scratchpad persistence format or location changes.
+
+One JSON file per conversation (ScratchpadManager.export_json), so a restarted
+process or an evicted conversation resumes with its collected data.
+"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from booking.scratchpad import ScratchpadManager
+
+logger = logging.getLogger(__name__)
+
+# Conversation ids come from clients: file names are a digest of the id, so they are
+# always filesystem-safe and distinct ids never share a snapshot
+_FILENAME_DIGEST_CHARS = 32
+
+
+class ScratchpadDiskStore:
+    """Directory of <sha256(conversation_id)>.json scratchpad snapshots."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, conversation_id: str) -> Path:
+        digest = hashlib.sha256(conversation_id.encode("utf-8")).hexdigest()[:_FILENAME_DIGEST_CHARS]
+        return self.directory / f"{digest}.json"
+
+    def load(self, conversation_id: str) -> Optional[ScratchpadManager]:
+        """Return the persisted scratchpad, or None if there is none (or it is unreadable)."""
+        path = self._path(conversation_id)
+        try:
+            payload = path.read_text()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("⚠️  SCRATCHPAD STORE: Could not read %s: %s", path, e)
+            return None
+        try:
+            manager = ScratchpadManager.from_json(payload)
+        except Exception as e:
+            logger.warning("⚠️  SCRATCHPAD STORE: Discarding corrupt snapshot %s: %s", path, e)
+            return None
+        if manager.conversation_id != conversation_id:
+            logger.warning("⚠️  SCRATCHPAD STORE: Snapshot %s belongs to another conversation", path)
+            return None
+        return manager
+
+    def save(self, manager: ScratchpadManager) -> None:
+        """Write the scratchpad snapshot atomically (temp file + rename)."""
+        path = self._path(manager.conversation_id)
+        tmp_path = path.with_suffix(".json.tmp")
+        try:
+            tmp_path.write_text(manager.export_json())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("⚠️  SCRATCHPAD STORE: Could not write %s: %s", path, e)
@@ -8,16 +8,314 @@ Not limited to vehicle details - works for ANY missing required data.
 """
 
 import dspy
+import functools
+import hashlib
+import json
 import logging
-from typing import Dict, Any, Optional, List
-from config import Config
-from models import ValidatedName, ValidatedVehicleDetails, ValidatedDate, ExtractionMetadata
-from modules import NameExtractor, VehicleDetailsExtractor, DateParser
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Tuple
+from config import Config, config
+from models import ValidatedName, ValidatedVehicleDetails, ValidatedDate, ExtractionMetadata, VehicleBrandEnum
+from modules import NameExtractor, VehicleDetailsExtractor, DateParser, CombinedRetroactiveExtractor
 from dspy_config import ensure_configured
 from history_utils import filter_dspy_history_to_user_only
 
 logger = logging.getLogger(__name__)
 
+ScanInput = Tuple[dspy.History, List[str]]
+
+# Placeholder values that count as "not collected"
+_INVALID_VALUES = frozenset(("unknown", "none", ""))
+
+# Field groups handled by one scan category
+_NAME_FIELDS = frozenset({"first_name", "last_name", "full_name"})
+_VEHICLE_FIELDS = frozenset({"vehicle_brand", "vehicle_model", "vehicle_plate"})
+
+# Optional fields OptionalFieldsExtractor can fill (it never extracts address)
+_OPTIONAL_FIELDS = ("service_type", "service_tier", "vehicle_type", "time_slot", "notes")
+
+# Surrounding whitespace and quotes in DSPy output fields (e.g. '""', "'John'")
+_SANITIZE_RE = re.compile(r"^[\s'\"]+|[\s'\"]+$")
+
+
+def _clean(value: Any) -> str:
+    """Return a DSPy output field as a string without surrounding whitespace/quotes ("" for None)."""
+    return _SANITIZE_RE.sub("", str(value)) if value else ""
+
+
+# Input gates: a name needs at least one 2+ letter word; a date needs a digit or a
+# day/month/relative-day word (English and common Hinglish)
+_HAS_WORD_RE = re.compile(r"[A-Za-z]{2,}")
+_DATE_HINT_RE = re.compile(
+    r"\d|today|tomorrow|tonight|week|next|mon|tue|wed|thu|fri|sat|sun"
+    r"|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|aaj|kal|parso",
+    re.IGNORECASE
+)
+
+# Acknowledgements that carry no extractable data ("yes", "haan", "thanks", ...);
+# dropped from the scan window so they don't spend prompt tokens
+_SCAN_NOISE = frozenset(Config.GREETING_STOPWORDS | {"", "no", "nope", "nahi", "na"})
+
+
+def _tail_bytes(text: str, budget: int) -> str:
+    """Return the last `budget` UTF-8 bytes of text (never splits a character)."""
+    encoded = text.encode('utf-8')
+    if len(encoded) <= budget:
+        return text
+    return encoded[-budget:].decode('utf-8', errors='ignore')
+
+
+def _stable_history_window(history: dspy.History) -> dspy.History:
+    """
+    User-only history cut to the last RETROACTIVE_SCAN_LIMIT messages.
+
+    Every scanner and the optional-fields pass get this same window, so repeated
+    scans render a byte-identical history block and can reuse the backend's
+    prompt cache.
+
+    Args:
+        history: Full conversation history
+
+    Returns:
+        dspy.History of the recent user messages
+    """
+    # CRITICAL FIX: Filter to user-only history
+    # Prevents LLM from being confused by chatbot's own responses
+    user_only_history = filter_dspy_history_to_user_only(history)
+    return dspy.History(messages=user_only_history.messages[-config.RETROACTIVE_SCAN_LIMIT:])
+
+
+def prepare_scan_input(history: dspy.History) -> Optional[ScanInput]:
+    """
+    Filter history to user-only messages and pick the recent scan window.
+
+    Computed once per validation sweep and shared by every scanner.
+
+    Args:
+        history: Full conversation history
+
+    Returns:
+        (stable user-only history window, recent user message texts), or None without history
+    """
+    if not history or not hasattr(history, 'messages'):
+        return None
+
+    user_only_history = _stable_history_window(history)
+
+    # PERFORMANCE FIX: Only scan recent messages to prevent timeout.
+    # Bounded by count AND bytes: cost scales with tokens, so one long message
+    # must not blow up the prompt. The newest message is always kept (truncated).
+    # Acknowledgements and repeats of a newer message are skipped.
+    user_messages: List[str] = []
+    seen = set()
+    remaining = config.MAX_SCAN_BYTES
+    for msg in reversed(user_only_history.messages):
+        if msg.get('role') != 'user':
+            continue
+        content = msg.get('content', '')
+        normalized = content.strip().lower().rstrip('.!?')
+        if normalized in _SCAN_NOISE or normalized in seen:
+            continue
+        seen.add(normalized)
+        size = len(content.encode('utf-8'))
+        if size > remaining:
+            if not user_messages:
+                user_messages.append(_tail_bytes(content, remaining))
+            break
+        user_messages.append(content)
+        remaining -= size
+    user_messages.reverse()
+    return user_only_history, user_messages
+
+
+# Lowercased brand names, built once: exact-match set, a single-pass regex for
+# "brand contained in text", and a joined haystack for "text contained in brand"
+_BRAND_VALUES_LOWER = frozenset(brand.value.lower() for brand in VehicleBrandEnum)
+_BRAND_RE = re.compile("|".join(map(re.escape, sorted(_BRAND_VALUES_LOWER, key=len, reverse=True))))
+_BRAND_HAYSTACK = "\x00".join(sorted(_BRAND_VALUES_LOWER))
+
+# Indian number plate (state code, RTO number, series, number), e.g. MH12AB1234 or
+# "mh-12-ab-1234". The state-code alternation keeps ordinary words like
+# "at 10 am 5" from matching.
+_PLATE_RE = re.compile(
+    r"\b((?:AN|AP|AR|AS|BR|CH|CG|DD|DL|DN|GA|GJ|HR|HP|JK|JH|KA|KL|LA|LD|MP|MH|MN|ML|MZ"
+    r"|NL|OD|OR|PY|PB|RJ|SK|TN|TS|TR|UP|UK|UA|WB)[- ]?\d{1,2}[- ]?[A-Z]{1,3}[- ]?\d{1,4})\b",
+    re.IGNORECASE
+)
+
+# Cheap gate for the optional-fields pass: OptionalFieldsExtractor only extracts
+# when one of these appears (service/tier/vehicle-type/time keywords, note phrases).
+# Plain substrings, matching the extractor's own `in` checks.
+_OPTIONAL_HINTS = re.compile(
+    r"wash|clean|polish|wax|detail|coating|basic|standard|regular|premium|luxury|deluxe"
+    r"|hatchback|sedan|suv|ev|morning|afternoon|lunch|evening|night"
+    r"|need extra|please make sure|special request|allergy to|prefer|avoid|sensitive",
+    re.IGNORECASE
+)
+
+# Scan results keyed by (scan method, user message window): repeat sweeps over
+# an unchanged window skip the extractor round trip. Results may be None.
+_SCAN_CACHE: "OrderedDict[str, Any]" = OrderedDict()
+_SCAN_CACHE_MAX = 512
+_SCAN_CACHE_LOCK = threading.Lock()
+# Distinguishes "not cached" from a cached None ("nothing found")
+_SCAN_MISSING = object()
+# Per-thread flag set by a scan_* method when its extractor call failed (timeout,
+# parse error): the None/{} it returns then means "unknown", not "nothing found",
+# and must not be cached. Scans run in parallel threads, hence thread-local.
+_scan_state = threading.local()
+
+
+def _scan_failed() -> None:
+    """Mark the running scan's result as a failure (not cacheable)."""
+    _scan_state.failed = True
+
+
+# Bumped when persisted scan results stop being trustworthy or change format:
+# version 1 files could hold extractor failures saved as "not found", version 2
+# were pickles. Files of other versions are ignored and pruned.
+_DISK_CACHE_VERSION = 3
+_DISK_CACHE_FILE_RE = re.compile(r"^v\d+-[0-9a-f]{64}\.(?:pkl|json)$")
+# Scan result types that can be persisted, by name (JSON never builds arbitrary objects)
+_DISK_CACHE_MODELS = {
+    model.__name__: model for model in (ValidatedName, ValidatedVehicleDetails, ValidatedDate)
+}
+# Minimum seconds between directory sweeps for expired/old-version files
+_DISK_CACHE_PRUNE_INTERVAL = 600
+_disk_cache_pruned_at = 0.0
+
+
+def _disk_cache_path(directory: Path, key: str) -> Path:
+    return directory / f"v{_DISK_CACHE_VERSION}-{key}.json"
+
+
+def _disk_cache_encode(value: Any) -> str:
+    """Serialize a scan result (None, a str dict or a validated model) to JSON."""
+    if value is None or isinstance(value, dict):
+        return json.dumps({"type": None if value is None else "dict", "data": value})
+    return json.dumps({"type": type(value).__name__, "data": value.model_dump(mode="json")})
+
+
+def _disk_cache_decode(payload: str) -> Any:
+    """Inverse of _disk_cache_encode; raises on unknown types or invalid data."""
+    entry = json.loads(payload)
+    kind, data = entry["type"], entry["data"]
+    if kind is None:
+        return None
+    if kind == "dict":
+        return dict(data)
+    return _DISK_CACHE_MODELS[kind].model_validate(data)
+
+
+def _disk_cache_prune(directory: Path) -> None:
+    """Delete expired and old-version cache files (at most once per prune interval)."""
+    global _disk_cache_pruned_at
+    now = time.time()
+    if now - _disk_cache_pruned_at < _DISK_CACHE_PRUNE_INTERVAL:
+        return
+    _disk_cache_pruned_at = now
+    current_prefix = f"v{_DISK_CACHE_VERSION}-"
+    try:
+        for path in directory.iterdir():
+            name = path.name
+            try:
+                if _DISK_CACHE_FILE_RE.match(name):
+                    expired = now - path.stat().st_mtime > config.RETROACTIVE_CACHE_TTL_SECONDS
+                    if expired or not name.startswith(current_prefix):
+                        path.unlink()
+                elif name.endswith(".tmp") and now - path.stat().st_mtime > config.RETROACTIVE_CACHE_TTL_SECONDS:
+                    # Left behind by a writer that died between mkstemp and rename
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+    except OSError as e:
+        logger.debug("Retroactive disk cache prune failed in %s: %s", directory, e)
+
+
+def _disk_cache_get(key: str) -> Any:
+    """Return a scan result persisted under config.RETROACTIVE_CACHE_DIR, or _SCAN_MISSING."""
+    if not config.RETROACTIVE_CACHE_DIR:
+        return _SCAN_MISSING
+    path = _disk_cache_path(Path(config.RETROACTIVE_CACHE_DIR), key)
+    try:
+        if time.time() - path.stat().st_mtime > config.RETROACTIVE_CACHE_TTL_SECONDS:
+            path.unlink()
+            return _SCAN_MISSING
+        return _disk_cache_decode(path.read_text())
+    except FileNotFoundError:
+        return _SCAN_MISSING
+    except Exception as e:
+        logger.debug("Retroactive disk cache read failed for %s: %s", path, e)
+        return _SCAN_MISSING
+
+
+def _disk_cache_set(key: str, value: Any) -> None:
+    """
+    Persist a scan result atomically (temp file + rename) when a cache dir is configured.
+
+    Only called for scans whose extractor succeeded (see _cached_scan): a persisted
+    failure would be served to every worker for the whole TTL.
+    """
+    if not config.RETROACTIVE_CACHE_DIR:
+        return
+    directory = Path(config.RETROACTIVE_CACHE_DIR)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        payload = _disk_cache_encode(value)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, _disk_cache_path(directory, key))
+    except Exception as e:
+        logger.debug("Retroactive disk cache write failed in %s: %s", directory, e)
+    _disk_cache_prune(directory)
+
+
+def _cached_scan(method):
+    """Memoize a RetroactiveScanner.scan_* method on its user message window."""
+    @functools.wraps(method)
+    def wrapper(self, history: dspy.History, prepared: Optional[ScanInput] = None):
+        if prepared is None:
+            prepared = prepare_scan_input(history)
+        if prepared is None:
+            return method(self, history, prepared)
+
+        # Key on the window the extractors actually see, not the whole history
+        user_text = "\x1e".join(str(msg.get('content', '')) for msg in prepared[0].messages)
+        key = hashlib.sha256(f"{method.__name__}\x1f{config.MODEL_NAME}\x1f{user_text}".encode()).hexdigest()
+        with _SCAN_CACHE_LOCK:
+            if key in _SCAN_CACHE:
+                _SCAN_CACHE.move_to_end(key)
+                logger.debug("⚡ %s: Reusing cached scan result", method.__name__)
+                return _SCAN_CACHE[key]
+
+        # Another worker (or this process before a restart) may have scanned the same window
+        result = _disk_cache_get(key)
+        if result is _SCAN_MISSING:
+            _scan_state.failed = False
+            result = method(self, history, prepared)
+            if _scan_state.failed:
+                # Transient extractor failure: let the next sweep retry instead of caching "not found"
+                logger.debug("%s: Extractor failed, result not cached", method.__name__)
+                return result
+            _disk_cache_set(key, result)
+        else:
+            logger.debug("⚡ %s: Reusing disk-cached scan result", method.__name__)
+
+        with _SCAN_CACHE_LOCK:
+            _SCAN_CACHE[key] = result
+            if len(_SCAN_CACHE) > _SCAN_CACHE_MAX:
+                _SCAN_CACHE.popitem(last=False)
+        return result
+    return wrapper
+
 
 class DataRequirements:
     """Define what data is required at each conversation state.
@@ -33,45 +331,49 @@ class DataRequirements:
 
     # MINIMUM REQUIRED for booking: first_name, last_name, phone, vehicle_brand,
     #                                vehicle_model, vehicle_plate, appointment_date
-    REQUIREMENTS = {
-        "greeting": [],
+    # Frozensets: O(1) "is field X required here" checks and direct subset tests
+    REQUIREMENTS: Dict[str, frozenset] = {
+        "greeting": frozenset(),
         # Collect name as prerequisite
-        "name_collection": ["first_name", "last_name"],
+        "name_collection": frozenset({"first_name", "last_name"}),
         # Need name + service intent
-        "service_selection": ["first_name"],
+        "service_selection": frozenset({"first_name"}),
         # Need name + vehicle details
-        "vehicle_details": ["first_name", "vehicle_brand", "vehicle_model", "vehicle_plate"],
+        "vehicle_details": frozenset({"first_name", "vehicle_brand", "vehicle_model", "vehicle_plate"}),
         # Need all core data before confirmation
-        "date_selection": ["first_name", "vehicle_brand", "vehicle_model", "vehicle_plate", "appointment_date"],
+        "date_selection": frozenset({"first_name", "vehicle_brand", "vehicle_model", "vehicle_plate", "appointment_date"}),
         # MINIMUM REQUIRED for booking confirmation (7 fields)
         # NOTE: phone field is also required but tracked separately in conversation_manager
-        "confirmation": ["first_name", "vehicle_brand", "vehicle_model", "vehicle_plate", "appointment_date"],
+        "confirmation": frozenset({"first_name", "vehicle_brand", "vehicle_model", "vehicle_plate", "appointment_date"}),
         # After booking
-        "completed": ["first_name", "vehicle_brand", "vehicle_model", "vehicle_plate", "appointment_date"]
+        "completed": frozenset({"first_name", "vehicle_brand", "vehicle_model", "vehicle_plate", "appointment_date"})
     }
 
     @classmethod
-    def get_missing_fields(cls, current_state: str, extracted_data: Dict[str, Any]) -> List[str]:
+    def get_missing_fields(cls, current_state: str, extracted_data: Dict[str, Any]) -> Set[str]:
         """
-        Get list of missing required fields for current state.
+        Get the missing required fields for current state.
 
         Args:
             current_state: Current conversation state (e.g., "vehicle_details")
             extracted_data: Dict of already extracted data
 
         Returns:
-            List of field names that are missing but required
+            Set of field names that are missing but required
         """
-        required = cls.REQUIREMENTS.get(current_state, [])
-        missing = [
-            field for field in required
-            if field not in extracted_data
-            or extracted_data[field] is None
-            or str(extracted_data[field]).lower() in ["unknown", "none", ""]
-        ]
+        required = cls.REQUIREMENTS.get(current_state, frozenset())
+        missing = set()
+        for field in required:
+            value = extracted_data.get(field)
+            if value is None or (isinstance(value, str) and value.strip().lower() in _INVALID_VALUES):
+                missing.add(field)
         return missing
 
 
+# Per-state requirement sets for O(1) subset checks (REQUIREMENTS already holds frozensets)
+REQUIREMENTS_FROZEN: Dict[str, frozenset] = DataRequirements.REQUIREMENTS
+
+
 class RetroactiveScanner:
     """
     Scans conversation history to find and extract missing prerequisite data.
@@ -89,6 +391,7 @@ class RetroactiveScanner:
         self.name_extractor = NameExtractor()
         self.vehicle_extractor = VehicleDetailsExtractor()
         self.date_parser = DateParser()
+        self.combined_extractor = CombinedRetroactiveExtractor()
 
     def _is_vehicle_brand(self, text: str) -> bool:
         """
@@ -102,58 +405,56 @@ class RetroactiveScanner:
         Returns:
             True if text matches a vehicle brand, False otherwise
         """
-        from models import VehicleBrandEnum
-
         if not text or not text.strip():
             return False
 
         text_lower = text.lower().strip()
 
-        return any(
-            brand.value.lower() in text_lower or text_lower in brand.value.lower()
-            for brand in VehicleBrandEnum
+        return (
+            text_lower in _BRAND_VALUES_LOWER
+            or _BRAND_RE.search(text_lower) is not None
+            or text_lower in _BRAND_HAYSTACK
         )
 
-    def scan_for_name(self, history: dspy.History) -> Optional[ValidatedName]:
+    @_cached_scan
+    def scan_for_name(self, history: dspy.History, prepared: Optional[ScanInput] = None) -> Optional[ValidatedName]:
         """
         Retroactively scan history for name mentions.
 
-        Returns the most recent name mentioned in conversation.
+        Extracts from the joined recent user messages in one call (like
+        scan_for_vehicle_details) instead of one call per message.
 
         CRITICAL FIX: Uses user-only history to prevent LLM from reading chatbot's own responses.
         """
-        if not history or not hasattr(history, 'messages'):
+        if prepared is None:
+            prepared = prepare_scan_input(history)
+        if prepared is None:
             logger.debug("🔍 scan_for_name: No history or no messages attribute")
             return None
 
         try:
-            from config import config
-
-            # CRITICAL FIX: Filter to user-only history
-            # Prevents LLM from being confused by chatbot's own responses
-            user_only_history = filter_dspy_history_to_user_only(history)
-
-            # PERFORMANCE FIX: Only scan recent messages to prevent timeout
-            # Use centralized config to control scan limit
-            scan_limit = config.RETROACTIVE_SCAN_LIMIT
-            recent_messages = user_only_history.messages[-scan_limit:] if len(user_only_history.messages) > scan_limit else user_only_history.messages
-
-            # Get user messages from recent history only
-            user_messages = [
-                msg.get('content', '')
-                for msg in recent_messages
-                if msg.get('role') == 'user'
-            ]
+            user_only_history, user_messages = prepared
 
-            logger.debug(f"🔍 scan_for_name: Scanning {len(user_messages)} recent user messages (limited to last {scan_limit})")
+            logger.debug(f"🔍 scan_for_name: Scanning {len(user_messages)} recent user messages (limited to last {config.RETROACTIVE_SCAN_LIMIT})")
             if not user_messages:
                 logger.debug("🔍 scan_for_name: No user messages found in recent history")
                 return None
 
-            # Try to extract name from most recent user message first
-            for idx, message in enumerate(reversed(user_messages)):
+            # One extraction over the joined window. EDGE CASE: joined text that mixes the
+            # name with a vehicle brand or greeting can yield a rejected result; only then
+            # is the newest message retried on its own.
+            candidates = [_tail_bytes(" ".join(user_messages), config.MAX_SCAN_BYTES)]
+            if len(user_messages) > 1:
+                candidates.append(user_messages[-1])
+
+            for idx, message in enumerate(candidates):
+                # INPUT GATE: greetings/acknowledgements or no real word -> no name to extract
+                stripped = message.strip().lower()
+                if stripped in Config.GREETING_STOPWORDS or not _HAS_WORD_RE.search(message):
+                    logger.debug(f"🔍 scan_for_name: Skipping non-name input '{message[:30]}'")
+                    continue
                 try:
-                    logger.debug(f"🔍 scan_for_name: Attempting extraction from message: {message[:50]}...")
+                    logger.debug(f"🔍 scan_for_name: Attempting extraction from: {message[:50]}...")
                     result = self.name_extractor(
                         conversation_history=user_only_history,
                         user_message=message
@@ -163,20 +464,20 @@ class RetroactiveScanner:
 
                     # SANITIZATION: Strip quotes and clean DSPy output
                     # Fixes: DSPy sometimes returns '""' (quoted empty string) which fails Pydantic validation
-                    first_name = str(result.first_name).strip().strip('"\'')
-                    last_name = str(result.last_name).strip().strip('"\'') if hasattr(result, 'last_name') else ""
+                    first_name = _clean(result.first_name)
+                    last_name = _clean(getattr(result, 'last_name', None))
 
                     # VALIDATION: Reject if extracted name is actually a vehicle brand
                     # Fixes ISSUE_NAME_VEHICLE_CONFUSION
                     if self._is_vehicle_brand(first_name) or self._is_vehicle_brand(last_name):
                         logger.warning(f"❌ Retroactive scan rejected: '{first_name} {last_name}' matches vehicle brand")
-                        continue  # Skip to next message
+                        continue  # Retry on the newest message alone
 
                     # VALIDATION: Reject if extracted name is a greeting stopword
                     # Fixes: Prevent "Haan" (Hindi yes), "Hello", "Hi" etc. from being extracted as first_name
                     if first_name and first_name.lower() in Config.GREETING_STOPWORDS:
                         logger.warning(f"❌ Retroactive scan rejected: '{first_name}' is a greeting stopword")
-                        continue  # Skip to next message
+                        continue  # Retry on the newest message alone
 
                     if first_name and first_name.lower() not in ["none", "n/a", "unknown"]:
                         logger.info(f"✅ scan_for_name: Successfully extracted '{first_name}'")
@@ -191,19 +492,24 @@ class RetroactiveScanner:
                             )
                         )
                     else:
+                        # No name in the whole window - the newest message alone won't have one either
                         logger.debug(f"🔍 scan_for_name: Extracted name '{first_name}' is invalid (None/Unknown)")
+                        break
                 except Exception as e:
-                    logger.debug(f"🔍 scan_for_name: Exception on message {idx}: {type(e).__name__}: {e}")
+                    logger.debug(f"🔍 scan_for_name: Exception on attempt {idx}: {type(e).__name__}: {e}")
+                    _scan_failed()
                     continue
 
-            logger.debug("🔍 scan_for_name: No valid name found in any message")
+            logger.debug("🔍 scan_for_name: No valid name found in recent messages")
             return None
 
         except Exception as e:
             logger.error(f"❌ Retroactive name scan failed: {type(e).__name__}: {e}")
+            _scan_failed()
             return None
 
-    def scan_for_vehicle_details(self, history: dspy.History) -> Optional[ValidatedVehicleDetails]:
+    @_cached_scan
+    def scan_for_vehicle_details(self, history: dspy.History, prepared: Optional[ScanInput] = None) -> Optional[ValidatedVehicleDetails]:
         """
         Retroactively scan history for vehicle mentions.
 
@@ -211,35 +517,22 @@ class RetroactiveScanner:
 
         CRITICAL FIX: Uses user-only history to prevent LLM from reading chatbot's own responses.
         """
-        if not history or not hasattr(history, 'messages'):
+        if prepared is None:
+            prepared = prepare_scan_input(history)
+        if prepared is None:
             logger.debug("🔍 scan_for_vehicle: No history or no messages attribute")
             return None
 
         try:
-            from config import config
-
-            # CRITICAL FIX: Filter to user-only history
-            # Prevents LLM from being confused by chatbot's own responses
-            user_only_history = filter_dspy_history_to_user_only(history)
-
-            # PERFORMANCE FIX: Only scan recent messages to prevent timeout
-            scan_limit = config.RETROACTIVE_SCAN_LIMIT
-            recent_messages = user_only_history.messages[-scan_limit:] if len(user_only_history.messages) > scan_limit else user_only_history.messages
-
-            # Get user messages from recent history only
-            user_messages = [
-                msg.get('content', '')
-                for msg in recent_messages
-                if msg.get('role') == 'user'
-            ]
+            user_only_history, user_messages = prepared
 
             if not user_messages:
                 logger.debug("🔍 scan_for_vehicle: No user messages found in recent history")
                 return None
 
-            logger.debug(f"🔍 scan_for_vehicle: Scanning {len(user_messages)} recent user messages (limited to last {scan_limit})")
+            logger.debug(f"🔍 scan_for_vehicle: Scanning {len(user_messages)} recent user messages (limited to last {config.RETROACTIVE_SCAN_LIMIT})")
             # Combine recent messages to create context (e.g., "I have Honda City with plate MH12AB1234")
-            combined_context = " ".join(user_messages)
+            combined_context = _tail_bytes(" ".join(user_messages), config.MAX_SCAN_BYTES)
             logger.debug(f"🔍 scan_for_vehicle: Combined context: '{combined_context[:100]}...'")
 
             # Try extraction on combined context
@@ -252,9 +545,9 @@ class RetroactiveScanner:
 
                 logger.debug(f"🔍 scan_for_vehicle: Raw extraction result - brand={result.brand}, model={result.model}, plate={result.number_plate}")
 
-                brand = str(result.brand).strip() if result.brand else None
-                model = str(result.model).strip() if result.model else None
-                plate = str(result.number_plate).strip() if result.number_plate else None
+                brand = _clean(result.brand) or None
+                model = _clean(result.model) or None
+                plate = _clean(result.number_plate) or None
 
                 logger.debug(f"🔍 scan_for_vehicle: After processing - brand='{brand}', model='{model}', plate='{plate}'")
 
@@ -289,86 +582,176 @@ class RetroactiveScanner:
 
             except Exception as e:
                 logger.debug(f"🔍 scan_for_vehicle: Exception during extraction: {type(e).__name__}: {e}")
-                pass
+                _scan_failed()
 
             logger.debug("🔍 scan_for_vehicle: No valid vehicle data found")
             return None
 
         except Exception as e:
             logger.error(f"❌ Retroactive vehicle scan failed: {type(e).__name__}: {e}")
+            _scan_failed()
             return None
 
-    def scan_for_date(self, history: dspy.History) -> Optional[ValidatedDate]:
+    @_cached_scan
+    def scan_for_date(self, history: dspy.History, prepared: Optional[ScanInput] = None) -> Optional[ValidatedDate]:
         """
         Retroactively scan history for date mentions.
 
-        Searches all user messages for date references.
+        Extracts from the joined recent user messages in one call instead of one call per message.
 
         CRITICAL FIX: Uses user-only history to prevent LLM from reading chatbot's own responses.
         """
-        if not history or not hasattr(history, 'messages'):
+        if prepared is None:
+            prepared = prepare_scan_input(history)
+        if prepared is None:
             logger.debug("🔍 scan_for_date: No history or no messages attribute")
             return None
 
         try:
-            from config import config
-
-            # CRITICAL FIX: Filter to user-only history
-            # Prevents LLM from being confused by chatbot's own responses
-            user_only_history = filter_dspy_history_to_user_only(history)
-
-            # PERFORMANCE FIX: Only scan recent messages to prevent timeout
-            scan_limit = config.RETROACTIVE_SCAN_LIMIT
-            recent_messages = user_only_history.messages[-scan_limit:] if len(user_only_history.messages) > scan_limit else user_only_history.messages
+            user_only_history, user_messages = prepared
 
-            # Get user messages from recent history only
-            user_messages = [
-                msg.get('content', '')
-                for msg in recent_messages
-                if msg.get('role') == 'user'
-            ]
-
-            logger.debug(f"🔍 scan_for_date: Scanning {len(user_messages)} recent user messages (limited to last {scan_limit})")
+            logger.debug(f"🔍 scan_for_date: Scanning {len(user_messages)} recent user messages (limited to last {config.RETROACTIVE_SCAN_LIMIT})")
             if not user_messages:
                 logger.debug("🔍 scan_for_date: No user messages found in recent history")
                 return None
 
-            # Try most recent date-like message first
-            for idx, message in enumerate(reversed(user_messages)):
-                try:
-                    logger.debug(f"🔍 scan_for_date: Attempting extraction from message {idx}: {message[:50]}...")
-                    result = self.date_parser(
-                        user_message=message,
-                        conversation_history=user_only_history
-                    )
+            # One extraction over the joined window (newest message last, so the
+            # history ordering already favours the most recent date mention)
+            combined_context = _tail_bytes(" ".join(user_messages), config.MAX_SCAN_BYTES)
 
-                    logger.debug(f"🔍 scan_for_date: Extraction result - date_str={result.date_str}")
+            # INPUT GATE: nothing date-like in the window -> skip the LLM call
+            if not _DATE_HINT_RE.search(combined_context):
+                logger.debug("🔍 scan_for_date: No date-like text in recent messages")
+                return None
+
+            try:
+                logger.debug(f"🔍 scan_for_date: Attempting extraction from: {combined_context[:50]}...")
+                result = self.date_parser(
+                    user_message=combined_context,
+                    conversation_history=user_only_history
+                )
 
-                    date_str = str(result.date_str).strip() if result.date_str else None
-                    if date_str and date_str.lower() not in ["none", "unknown"]:
-                        logger.info(f"✅ scan_for_date: Successfully extracted '{date_str}'")
-                        return ValidatedDate(
-                            date_str=date_str,
+                # DateParser's signature outputs parsed_date (there is no date_str field)
+                raw_date = getattr(result, 'parsed_date', None)
+                logger.debug(f"🔍 scan_for_date: Extraction result - parsed_date={raw_date}")
+
+                date_str = _clean(raw_date) or None
+                if date_str and date_str.lower() not in ["none", "unknown"]:
+                    logger.info(f"✅ scan_for_date: Successfully extracted '{date_str}'")
+                    return ValidatedDate(
+                        date_str=date_str,
+                        confidence=0.8,
+                        metadata=ExtractionMetadata(
                             confidence=0.8,
-                            metadata=ExtractionMetadata(
-                                confidence=0.8,
-                                extraction_method="dspy",
-                                extraction_source=message
-                            )
+                            extraction_method="dspy",
+                            extraction_source=combined_context
                         )
-                    else:
-                        logger.debug(f"🔍 scan_for_date: Extracted date '{date_str}' is invalid (None/Unknown)")
-                except Exception as e:
-                    logger.debug(f"🔍 scan_for_date: Exception on message {idx}: {type(e).__name__}: {e}")
-                    continue
+                    )
+                else:
+                    logger.debug(f"🔍 scan_for_date: Extracted date '{date_str}' is invalid (None/Unknown)")
+            except Exception as e:
+                logger.debug(f"🔍 scan_for_date: Exception during extraction: {type(e).__name__}: {e}")
+                _scan_failed()
 
-            logger.debug("🔍 scan_for_date: No valid date found in any message")
+            logger.debug("🔍 scan_for_date: No valid date found in recent messages")
             return None
 
         except Exception as e:
             logger.error(f"❌ Retroactive date scan failed: {type(e).__name__}: {e}")
+            _scan_failed()
+            return None
+
+
+    @_cached_scan
+    def scan_combined(self, history: dspy.History, prepared: Optional[ScanInput] = None) -> Dict[str, str]:
+        """
+        Retroactively scan history for name, vehicle and date in a single LLM call.
+
+        Used when more than one scan category is missing, replacing up to three
+        separate extractor calls over the same user-only history.
+
+        Args:
+            history: Conversation history
+
+        Returns:
+            Dict of valid fields found (first_name, last_name, full_name,
+            vehicle_brand, vehicle_model, vehicle_plate, appointment_date)
+        """
+        if prepared is None:
+            prepared = prepare_scan_input(history)
+        if prepared is None:
+            logger.debug("🔍 scan_combined: No history or no messages attribute")
+            return {}
+
+        try:
+            user_only_history, user_messages = prepared
+            if not user_messages:
+                logger.debug("🔍 scan_combined: No user messages found in recent history")
+                return {}
+
+            combined_context = _tail_bytes(" ".join(user_messages), config.MAX_SCAN_BYTES)
+            logger.debug(f"🔍 scan_combined: Scanning {len(user_messages)} recent user messages in one call")
+            result = self.combined_extractor(
+                conversation_history=user_only_history,
+                user_message=combined_context
+            )
+        except Exception as e:
+            logger.error(f"❌ Retroactive combined scan failed: {type(e).__name__}: {e}")
+            _scan_failed()
+            return {}
+
+        def clean(value: Any) -> str:
+            text = _clean(value)
+            return "" if text.lower() in ["unknown", "none", "n/a"] else text
+
+        found: Dict[str, str] = {}
+
+        first_name = clean(getattr(result, 'first_name', None))
+        last_name = clean(getattr(result, 'last_name', None))
+        # Same rejections as scan_for_name: vehicle brands and greetings are not names
+        if first_name and not (self._is_vehicle_brand(first_name) or self._is_vehicle_brand(last_name)) \
+                and first_name.lower() not in Config.GREETING_STOPWORDS:
+            found["first_name"] = first_name
+            found["last_name"] = last_name
+            found["full_name"] = f"{first_name} {last_name}".strip()
+
+        for field, attr in (("vehicle_brand", "brand"), ("vehicle_model", "model"), ("vehicle_plate", "number_plate")):
+            value = clean(getattr(result, attr, None))
+            if value:
+                found[field] = value
+
+        date_str = clean(getattr(result, 'date_str', None))
+        if date_str:
+            found["appointment_date"] = date_str
+
+        logger.info(f"✅ scan_combined: Found {sorted(found)}")
+        return found
+
+
+    def scan_for_plate(self, history: dspy.History, prepared: Optional[ScanInput] = None) -> Optional[str]:
+        """
+        Find a number plate in recent user messages with a regex (no LLM call).
+
+        Args:
+            history: Conversation history
+            prepared: Shared scan input from prepare_scan_input()
+
+        Returns:
+            Normalized plate (e.g. "MH12AB1234") from the newest message that has one, or None
+        """
+        if prepared is None:
+            prepared = prepare_scan_input(history)
+        if prepared is None:
             return None
 
+        for message in reversed(prepared[1]):
+            match = _PLATE_RE.search(message)
+            if match:
+                plate = re.sub(r"[- ]", "", match.group(1)).upper()
+                logger.info(f"✅ scan_for_plate: Found plate '{plate}' (regex)")
+                return plate
+        return None
+
 
 class ConversationValidator:
     """
@@ -402,83 +785,119 @@ class ConversationValidator:
         if not missing_fields:
             return extracted_data  # All required data present
 
-        logger.info(f"Missing fields in {current_state}: {missing_fields}")
+        logger.info(f"Missing fields in {current_state}: {sorted(missing_fields)}")
 
         # Retroactively scan for missing data
         updated_data = extracted_data.copy()
 
-        # OPTIMIZATION: Skip retroactive scan if data already extracted in current turn
-        # Only scan history if it's truly missing (prevents redundant DSPy calls)
-        if "first_name" in missing_fields or "last_name" in missing_fields or "full_name" in missing_fields:
-            # Skip scan if we already have name data in current extraction
-            if not any(k in extracted_data for k in ["first_name", "last_name", "full_name"]):
-                name_data = self.scanner.scan_for_name(history)
-                if name_data:
-                    updated_data.update({
-                        "first_name": name_data.first_name,
-                        "last_name": name_data.last_name,
-                        "full_name": name_data.full_name
-                    })
-                    logger.info(f"Retroactively filled name: {name_data.full_name}")
-            else:
-                logger.debug("🔄 validate_and_complete: Name already in extracted_data, skipping retroactive scan")
+        # Filter history once; every scanner below shares the same user-only window
+        prepared = prepare_scan_input(history)
+        if prepared is None or not prepared[1]:
+            logger.debug("🔄 validate_and_complete: No user messages to scan")
+            return updated_data
+
+        # Work out which scan categories are actually needed before calling any extractor
+        needs_name = (
+            bool(missing_fields & _NAME_FIELDS)
+            and _NAME_FIELDS.isdisjoint(extracted_data)
+        )
+        needs_vehicle = bool(missing_fields & _VEHICLE_FIELDS)
+        needs_date = "appointment_date" in missing_fields and "appointment_date" not in extracted_data
+
+        def vehicle_missing(field: str) -> bool:
+            return field in missing_fields and updated_data.get(field) in [None, "Unknown", "unknown", "none"]
+
+        # PERFORMANCE: Two or more categories missing -> one combined extraction call
+        # instead of up to three LLM round trips over the same history
+        combined_scan = config.RETROACTIVE_COMBINED_SCAN and needs_name + needs_vehicle + needs_date >= 2
+        if combined_scan:
+            combined = self.scanner.scan_combined(history, prepared)
+            if needs_name and combined.get("first_name"):
+                updated_data.update({
+                    "first_name": combined["first_name"],
+                    "last_name": combined["last_name"],
+                    "full_name": combined["full_name"]
+                })
+                logger.info(f"Retroactively filled name: {combined['full_name']}")
+            for field in missing_fields & _VEHICLE_FIELDS:
+                if combined.get(field):
+                    updated_data[field] = combined[field]
+                    logger.info(f"✅ Retroactively filled {field}: {combined[field]}")
+            if needs_date and combined.get("appointment_date"):
+                updated_data["appointment_date"] = combined["appointment_date"]
+                logger.info(f"Retroactively filled date: {combined['appointment_date']}")
+
+        if missing_fields & _NAME_FIELDS and not _NAME_FIELDS.isdisjoint(extracted_data):
+            logger.debug("🔄 validate_and_complete: Name already in extracted_data, skipping retroactive scan")
+        if "appointment_date" in missing_fields and "appointment_date" in extracted_data:
+            logger.debug("🔄 validate_and_complete: appointment_date already in extracted_data, skipping retroactive scan")
 
         # CRITICAL FIX: Handle vehicle fields extraction for BOTH common patterns:
         # 1. COMMON: User mentions brand/model together, then plate separately later
         # 2. RARE: User mentions all three together in one message
-        if any(field in missing_fields for field in ["vehicle_brand", "vehicle_model", "vehicle_plate"]):
-            logger.debug(f"🔄 validate_and_complete: Missing vehicle fields: {[f for f in missing_fields if 'vehicle' in f]}")
-
-            # CASE 1: Brand/model missing - scan for both together (they're usually mentioned together)
-            if any(field in missing_fields for field in ["vehicle_brand", "vehicle_model"]):
-                vehicle_data = self.scanner.scan_for_vehicle_details(history)
-                logger.debug(f"🔄 validate_and_complete: Scanning for brand/model - vehicle_data result = {vehicle_data}")
-                if vehicle_data:
-                    if "vehicle_brand" in missing_fields and vehicle_data.brand and vehicle_data.brand.lower() not in ["unknown", "none"]:
-                        updated_data["vehicle_brand"] = vehicle_data.brand
-                        logger.info(f"✅ Retroactively filled vehicle_brand: {vehicle_data.brand}")
-
-                    if "vehicle_model" in missing_fields and vehicle_data.model and vehicle_data.model.lower() not in ["unknown", "none"]:
-                        updated_data["vehicle_model"] = vehicle_data.model
-                        logger.info(f"✅ Retroactively filled vehicle_model: {vehicle_data.model}")
-
-                    # Also capture plate if found during brand/model scan
-                    if "vehicle_plate" in missing_fields and vehicle_data.number_plate and vehicle_data.number_plate.lower() not in ["unknown", "none"]:
-                        updated_data["vehicle_plate"] = vehicle_data.number_plate
-                        logger.info(f"✅ Retroactively filled vehicle_plate (from brand/model scan): {vehicle_data.number_plate}")
-
-            # CASE 2: Plate still missing after brand/model scan - scan specifically for plate alone
-            # This handles the common case where plate is mentioned separately/later
-            if "vehicle_plate" in missing_fields and ("vehicle_plate" not in updated_data or
-                                                       updated_data.get("vehicle_plate") in ["Unknown", "unknown", "none", None]):
-                logger.debug("🔄 validate_and_complete: Plate still missing, scanning for it separately")
-                vehicle_data_plate_only = self.scanner.scan_for_vehicle_details(history)
-                logger.debug(f"🔄 validate_and_complete: Plate-only scan result = {vehicle_data_plate_only}")
-                if vehicle_data_plate_only and vehicle_data_plate_only.number_plate and vehicle_data_plate_only.number_plate.lower() not in ["unknown", "none"]:
-                    updated_data["vehicle_plate"] = vehicle_data_plate_only.number_plate
-                    logger.info(f"✅ Retroactively filled vehicle_plate (independent scan): {vehicle_data_plate_only.number_plate}")
-                else:
-                    logger.debug("🔄 validate_and_complete: No valid plate found in independent scan")
-
+        # FAST PATH: A clearly formatted plate in recent messages needs no LLM call
+        if needs_vehicle and vehicle_missing("vehicle_plate"):
+            plate = self.scanner.scan_for_plate(history, prepared)
+            if plate:
+                updated_data["vehicle_plate"] = plate
+                logger.info(f"✅ Retroactively filled vehicle_plate (regex): {plate}")
+        # One vehicle scan covers brand, model and plate (identical input -> identical result)
+        needs_vehicle = any(vehicle_missing(f) for f in missing_fields & _VEHICLE_FIELDS)
+
+        # Dedicated per-category scans (when the combined call did not run) are
+        # independent I/O-bound LLM calls, so they run concurrently
+        scans = {}
+        if not combined_scan:
+            if needs_name:
+                scans["name"] = self.scanner.scan_for_name
+            if needs_vehicle:
+                logger.debug(f"🔄 validate_and_complete: Missing vehicle fields: {sorted(missing_fields & _VEHICLE_FIELDS)}")
+                scans["vehicle"] = self.scanner.scan_for_vehicle_details
+            if needs_date:
+                scans["date"] = self.scanner.scan_for_date
+
+        results: Dict[str, Any] = {}
+        if len(scans) == 1:
+            (kind, scan), = scans.items()
+            results[kind] = scan(history, prepared)
+        elif scans:
+            with ThreadPoolExecutor(max_workers=len(scans)) as pool:
+                futures = {kind: pool.submit(scan, history, prepared) for kind, scan in scans.items()}
+                results = {kind: future.result() for kind, future in futures.items()}
+
+        name_data = results.get("name")
+        if name_data:
+            updated_data.update({
+                "first_name": name_data.first_name,
+                "last_name": name_data.last_name,
+                "full_name": name_data.full_name
+            })
+            logger.info(f"Retroactively filled name: {name_data.full_name}")
+
+        vehicle_data = results.get("vehicle")
+        if "vehicle" in scans:
+            logger.debug(f"🔄 validate_and_complete: Vehicle scan result = {vehicle_data}")
+        if vehicle_data:
+            for field, value in (("vehicle_brand", vehicle_data.brand),
+                                 ("vehicle_model", vehicle_data.model),
+                                 ("vehicle_plate", vehicle_data.number_plate)):
+                if vehicle_missing(field) and value and value.lower() not in ["unknown", "none"]:
+                    updated_data[field] = value
+                    logger.info(f"✅ Retroactively filled {field}: {value}")
             logger.debug(f"🔄 validate_and_complete: After vehicle extraction, updated_data keys={list(updated_data.keys())}")
 
-        if "appointment_date" in missing_fields:
-            # Skip scan if we already have date in current extraction
-            if "appointment_date" not in extracted_data:
-                date_data = self.scanner.scan_for_date(history)
-                if date_data:
-                    updated_data["appointment_date"] = date_data.date_str
-                    logger.info(f"Retroactively filled date: {date_data.date_str}")
-            else:
-                logger.debug("🔄 validate_and_complete: appointment_date already in extracted_data, skipping retroactive scan")
+        date_data = results.get("date")
+        if date_data:
+            updated_data["appointment_date"] = date_data.date_str
+            logger.info(f"Retroactively filled date: {date_data.date_str}")
 
         # OPTIONAL FIELDS: Try to retroactively scan for enhanced fields
         # These are NOT required for booking but improve service quality
-        self._scan_optional_fields_retroactively(updated_data, history)
+        self._scan_optional_fields_retroactively(updated_data, prepared[1])
 
         return updated_data
 
-    def _scan_optional_fields_retroactively(self, updated_data: Dict[str, Any], history: dspy.History) -> None:
+    def _scan_optional_fields_retroactively(self, updated_data: Dict[str, Any], user_messages: List[str]) -> None:
         """
         Retroactively scan for optional/enhanced fields.
 
@@ -489,34 +908,34 @@ class ConversationValidator:
 
         Args:
             updated_data: Dict to update with found optional fields (modified in-place)
-            history: Conversation history to scan
+            user_messages: Recent user messages from prepare_scan_input()
         """
         from optional_fields_extractor import OptionalFieldsExtractor
 
-        try:
-            extractor = OptionalFieldsExtractor()
-
-            # Get user messages from history for retroactive scanning
-            if not history or not hasattr(history, 'messages'):
-                logger.debug("🔍 No history for optional fields scan")
-                return
-
-            user_only_history = filter_dspy_history_to_user_only(history)
-            user_messages = [
-                msg.get('content', '')
-                for msg in user_only_history.messages
-                if msg.get('role') == 'user'
-            ]
+        # Every fillable optional field is already collected - nothing this pass could add
+        if all(
+            updated_data.get(field) is not None
+            and str(updated_data[field]).strip().lower() not in _INVALID_VALUES
+            for field in _OPTIONAL_FIELDS
+        ):
+            logger.debug("🔍 All optional fields present, skipping optional fields scan")
+            return
 
+        try:
             if not user_messages:
                 logger.debug("🔍 No user messages for optional fields scan")
                 return
 
-            # Combine all user messages for context
-            combined_message = " ".join(user_messages)
+            # Combine the recent window of user messages (same window as the required-field scans)
+            combined_message = _tail_bytes(" ".join(user_messages), config.MAX_SCAN_BYTES)
+
+            # PERFORMANCE: Nothing resembling an optional field was mentioned - skip extraction
+            if not _OPTIONAL_HINTS.search(combined_message):
+                logger.debug("🔍 No optional field hints in recent user messages")
+                return
 
             # Extract optional fields
-            optional_fields = extractor.extract_optional_fields(
+            optional_fields = OptionalFieldsExtractor().extract_optional_fields(
                 user_message=combined_message,
                 current_state="confirmation",  # Assume confirmation for retroactive scan
                 existing_data=updated_data
@@ -535,6 +954,12 @@ class ConversationValidator:
             # Don't block main flow on optional field failures
 
 
+@functools.cache
+def _get_validator() -> ConversationValidator:
+    """Process-wide validator: its DSPy extractor modules are built once, not per sweep."""
+    return ConversationValidator()
+
+
 # Example usage in orchestrator
 def final_validation_sweep(
     current_state: str,
@@ -546,5 +971,4 @@ def final_validation_sweep(
 
     Can be called before confirmation state to ensure all required data is present.
     """
-    validator = ConversationValidator()
-    return validator.validate_and_complete(current_state, extracted_data, history)
\ No newline at end of file
+    return _get_validator().validate_and_complete(current_state, extracted_data, history)
\ No newline at end of file
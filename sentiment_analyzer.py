@@ -1,11 +1,44 @@
 """
 Sentiment analysis service for customer emotions.
 """
+import asyncio
+import functools
+import math
+import re
 import dspy
+from datetime import datetime
+from typing import Any, Optional
 from modules import SentimentAnalyzer
 from dspy_config import ensure_configured
 from models import ValidatedSentimentScores, ExtractionMetadata
 
+# First number in an LLM score string ("7", "7.5/10", "Score: 8")
+_SCORE_RE = re.compile(r'\d+\.?\d*')
+
+# Validated once at import; fallbacks copy it with a fresh error, source and timestamp
+_NEUTRAL_REASONING_PREFIX = "Fallback neutral sentiment. "
+_NEUTRAL_TEMPLATE = ValidatedSentimentScores(
+    interest=5.0,
+    anger=1.0,
+    disgust=1.0,
+    boredom=3.0,
+    neutral=7.0,
+    reasoning=_NEUTRAL_REASONING_PREFIX,
+    metadata=ExtractionMetadata(
+        confidence=0.3,  # Low confidence for fallback
+        extraction_method="fallback",
+        extraction_source="",
+        processing_time_ms=0.0
+    )
+)
+
+
+def _clamp_round(score: Optional[float]) -> float:
+    """Clamp a score to 1-10 and round to the nearest 0.5; 5.0 (neutral) when no number."""
+    if score is None:
+        return 5.0
+    return round(max(1.0, min(10.0, score)) * 2) / 2
+
 
 class SentimentAnalysisService:
     """Service for analyzing customer sentiment."""
@@ -13,6 +46,13 @@ class SentimentAnalysisService:
     def __init__(self):
         ensure_configured()
         self.analyzer = SentimentAnalyzer()
+        # Static metadata fields validated once; per-call copies only swap source/timestamp
+        self._meta_template = ExtractionMetadata(
+            confidence=0.8,  # Default confidence for LLM analysis
+            extraction_method="chain_of_thought",
+            extraction_source="",
+            processing_time_ms=0.0
+        )
 
     def analyze(
         self,
@@ -25,77 +65,113 @@ class SentimentAnalysisService:
                 conversation_history=conversation_history,
                 current_message=current_message
             )
-
-            # Parse scores with fallback
-            # Create validated sentiment scores object
-            metadata = ExtractionMetadata(
-                confidence=0.8,  # Default confidence for LLM analysis
-                extraction_method="chain_of_thought",
-                extraction_source=f"History: {str(conversation_history)[:100]}... | Message: {current_message}",
-                processing_time_ms=0.0
-            )
-
-            # CRITICAL: Truncate reasoning to max 500 chars (Pydantic validation limit)
-            reasoning = result.reasoning[:500] if len(result.reasoning or "") > 500 else result.reasoning
-
-            validated_scores = ValidatedSentimentScores(
-                interest=self._parse_score(result.interest_score),
-                anger=self._parse_score(result.anger_score),
-                disgust=self._parse_score(result.disgust_score),
-                boredom=self._parse_score(result.boredom_score),
-                neutral=self._parse_score(result.neutral_score),
-                reasoning=reasoning,
-                metadata=metadata
-            )
-
-            return validated_scores
+            return self._to_scores(result, conversation_history, current_message)
         except Exception as e:
             # Fallback to neutral sentiment
             return self._neutral_sentiment(str(e))
 
+    async def aanalyze(
+        self,
+        conversation_history: dspy.History,
+        current_message: str
+    ) -> ValidatedSentimentScores:
+        """Async variant of analyze(); runs the DSPy call in a worker thread."""
+        return await asyncio.to_thread(self.analyze, conversation_history, current_message)
+
+    def _to_scores(
+        self,
+        result: Any,
+        conversation_history: dspy.History,
+        current_message: str
+    ) -> ValidatedSentimentScores:
+        """Build validated scores from a SentimentAnalyzer prediction."""
+        # Parse scores with fallback
+        # Create validated sentiment scores object
+        metadata = self._meta_template.model_copy(update={
+            # Message count instead of str(history)[:100]: no O(N) repr of the whole history
+            "extraction_source": f"History[{len(getattr(conversation_history, 'messages', None) or ())} msgs] | Message: {current_message[:80]}",
+            "timestamp": datetime.now()
+        })
+
+        # CRITICAL: Truncate reasoning to max 500 chars (Pydantic validation limit)
+        reasoning = (result.reasoning or "")[:500]
+
+        # Tone fields come from the fused signature; absent when the LLM skipped them
+        tone_directive = (getattr(result, "tone_directive", None) or "").strip()[:200] or None
+        max_sentences = (str(getattr(result, "max_sentences", None) or "")).strip()[:20] or None
+
+        interest, anger, disgust, boredom, neutral = self._parse_scores(
+            result.interest_score,
+            result.anger_score,
+            result.disgust_score,
+            result.boredom_score,
+            result.neutral_score
+        )
+        validated_scores = ValidatedSentimentScores(
+            interest=interest,
+            anger=anger,
+            disgust=disgust,
+            boredom=boredom,
+            neutral=neutral,
+            reasoning=reasoning,
+            metadata=metadata,
+            tone_directive=tone_directive,
+            max_sentences=max_sentences
+        )
+
+        return validated_scores
+
     @staticmethod
-    def _parse_score(score_str: str) -> float:
+    def _score_value(score_str: Any) -> Optional[float]:
+        """Numeric value of a raw score; float() fast path, regex only for decorated strings."""
+        if isinstance(score_str, (int, float)):
+            value = float(score_str)
+        else:
+            try:
+                value = float(score_str)
+            except (ValueError, TypeError):
+                match = _SCORE_RE.search(str(score_str))
+                return float(match.group()) if match else None
+        # "nan"/"inf" parse as floats but aren't scores
+        return value if math.isfinite(value) else None
+
+    @classmethod
+    def _parse_scores(cls, *score_strs: str) -> tuple:
+        """
+        Parse several scores in one pass (same rules as _parse_score).
+
+        Args:
+            *score_strs: Raw LLM score strings
+
+        Returns:
+            Tuple of floats, one per input, in input order
+        """
+        return tuple(_clamp_round(cls._score_value(s)) for s in score_strs)
+
+    @classmethod
+    def _parse_score(cls, score_str: str) -> float:
         """Parse score from string, handling various formats."""
-        try:
-            # Extract first number from string
-            import re
-            numbers = re.findall(r'\d+\.?\d*', str(score_str))
-            if numbers:
-                score = float(numbers[0])
-                # Clamp score to valid range of 1-10, but be more permissive than strict validation
-                clamped_score = max(1.0, min(10.0, score))
-                # Round to nearest half-point to match LLM output expectations
-                return round(clamped_score * 2) / 2  # Rounds to nearest 0.5
-        except (ValueError, IndexError):
-            pass
-        return 5.0  # Default neutral
+        return cls._parse_scores(score_str)[0]
 
     @staticmethod
     def _neutral_sentiment(error_msg: str = "") -> ValidatedSentimentScores:
         """Return neutral sentiment as fallback."""
         # CRITICAL: Truncate error message to avoid exceeding field limits
-        max_error_len = 200
-        truncated_error = error_msg[:max_error_len] if len(error_msg) > max_error_len else error_msg
+        # (prefix + 200 chars stays within the 500-char reasoning limit)
+        truncated_error = error_msg[:200]
 
-        metadata = ExtractionMetadata(
-            confidence=0.3,  # Low confidence for fallback
-            extraction_method="fallback",
-            extraction_source=truncated_error,
-            processing_time_ms=0.0
-        )
+        # Always a copy: callers may mutate the result, and the timestamp must be current
+        metadata = _NEUTRAL_TEMPLATE.metadata.model_copy(update={
+            "extraction_source": truncated_error,
+            "timestamp": datetime.now()
+        })
+        return _NEUTRAL_TEMPLATE.model_copy(update={
+            "reasoning": f"{_NEUTRAL_REASONING_PREFIX}{truncated_error}",
+            "metadata": metadata
+        })
 
-        # CRITICAL: Truncate reasoning to max 500 chars (Pydantic validation limit)
-        reasoning_prefix = "Fallback neutral sentiment. "
-        max_reasoning_len = 500 - len(reasoning_prefix)
-        truncated_reasoning = truncated_error[:max_reasoning_len]
-        reasoning = f"{reasoning_prefix}{truncated_reasoning}"
-
-        return ValidatedSentimentScores(
-            interest=5.0,
-            anger=1.0,
-            disgust=1.0,
-            boredom=3.0,
-            neutral=7.0,
-            reasoning=reasoning,
-            metadata=metadata
-        )
+
+@functools.cache
+def get_sentiment_service() -> SentimentAnalysisService:
+    """Process-wide SentimentAnalysisService (one DSPy module, one config check)."""
+    return SentimentAnalysisService()
@@ -1,12 +1,112 @@
 """Service Request JSON Dumper - saves confirmed bookings to datadump folder."""
+import asyncio
+import functools
+import gzip
 import json
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Tuple
+from config import config
+
+# Optional: orjson serializes the dump natively when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Scratchpad form sections written to the dump, in file order
+_SECTIONS = ("customer", "vehicle", "appointment")
+
+# Dumps are machine-read: compact separators, no indentation
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# datadump/ next to this module (works from both orchestrator/ and main.py)
+_DATADUMP_DIR = Path(__file__).parent / "datadump"
+
+
+@functools.cache
+def _datadump_dir() -> Path:
+    """Create datadump/ on the first dump only; later dumps skip the mkdir syscall."""
+    _DATADUMP_DIR.mkdir(exist_ok=True)
+    return _DATADUMP_DIR
+
+
+def _iter_service_request_json(header: Dict[str, Any], scratchpad, metadata: Dict[str, Any]) -> Iterator[str]:
+    """
+    Yield the service request JSON document (compact) in chunks.
+
+    Section values come from the scratchpad's populated-value index (None values
+    already excluded), so no pass over scratchpad.form or per-section dicts are needed.
+
+    Args:
+        header: Top-level scalar fields (ids, status, timestamps)
+        scratchpad: ScratchpadManager instance with booking data
+        metadata: Metadata object written last
+
+    Yields:
+        JSON text chunks
+    """
+    encode = _ENCODER.encode
+    yield "{"
+    for key, value in header.items():
+        yield f"{encode(key)}:{encode(value)},"
+    sections = scratchpad.get_populated_sections()
+    for section in _SECTIONS:
+        yield f'"{section}":{encode(sections[section])},'
+    yield f'"metadata":{encode(metadata)}}}'
+
+
+def _prepare_dump(
+    service_request_id: str,
+    conversation_id: str,
+    scratchpad,
+    confirmation_method: str,
+    additional_metadata: Dict[str, Any] = None
+) -> Tuple[Path, Dict[str, Any], Dict[str, Any]]:
+    """Build the dump header/metadata and resolve the target file (creating datadump/)."""
+    # Service request header; customer/vehicle/appointment are streamed from the scratchpad
+    header = {
+        "service_request_id": service_request_id,
+        "conversation_id": conversation_id,
+        "status": "confirmed",
+        "created_at": datetime.now().isoformat(),
+    }
+    metadata = {
+        "completeness": scratchpad.get_completeness(),
+        "confirmation_method": confirmation_method,
+        **(additional_metadata or {})
+    }
+
+    # Save to datadump folder with service_request_id as filename
+    suffix = ".json.gz" if config.SERVICE_REQUEST_DUMP_GZIP else ".json"
+    return _datadump_dir() / f"{service_request_id}{suffix}", header, metadata
+
+
+def _render_dump(header: Dict[str, Any], scratchpad, metadata: Dict[str, Any]) -> bytes:
+    """Serialize the complete dump document to bytes."""
+    if orjson is not None:
+        sections = scratchpad.get_populated_sections()
+        service_data = {**header, **{section: sections[section] for section in _SECTIONS}, "metadata": metadata}
+        return orjson.dumps(service_data)
+    return "".join(_iter_service_request_json(header, scratchpad, metadata)).encode("utf-8")
+
+
+def _open_dump(filepath: Path, mode: str):
+    """Open a dump file, gzip level 1 (cheap, still ~4x smaller) when configured."""
+    encoding = None if "b" in mode else "utf-8"
+    if config.SERVICE_REQUEST_DUMP_GZIP:
+        return gzip.open(filepath, mode, compresslevel=1, encoding=encoding)
+    return open(filepath, mode, encoding=encoding)
+
+
+def _write_dump(filepath: Path, payload: bytes) -> None:
+    """Write a serialized dump (runs in a worker thread for adump_service_request)."""
+    with _open_dump(filepath, "wb") as f:
+        f.write(payload)
+
 
 def dump_service_request(
     service_request_id: str,
@@ -29,47 +129,53 @@ def dump_service_request(
         Path to the created JSON file
 
     Note:
-        This function is called from EITHER:
+        This function (or adump_service_request) is called from EITHER:
         - orchestrator/message_processor.py (CHAT mode)
         - main.py /api/confirmation endpoint (BUTTON mode)
 
         Only ONE will execute per conversation based on CONFIRMATION_MODE setting.
     """
-    # Build complete service request data with scratchpad details
-    service_data = {
-        "service_request_id": service_request_id,
-        "conversation_id": conversation_id,
-        "status": "confirmed",
-        "created_at": datetime.now().isoformat(),
-        "customer": {
-            k: v.value for k, v in scratchpad.form.customer.items() if v.value is not None
-        },
-        "vehicle": {
-            k: v.value for k, v in scratchpad.form.vehicle.items() if v.value is not None
-        },
-        "appointment": {
-            k: v.value for k, v in scratchpad.form.appointment.items() if v.value is not None
-        },
-        "metadata": {
-            "completeness": scratchpad.get_completeness(),
-            "confirmation_method": confirmation_method,
-            **(additional_metadata or {})
-        }
-    }
+    filepath, header, metadata = _prepare_dump(
+        service_request_id, conversation_id, scratchpad, confirmation_method, additional_metadata
+    )
 
-    # Save to datadump folder with service_request_id as filename
-    # Find the example directory (works from both orchestrator/ and main.py)
-    current_file = Path(__file__)
-    example_dir = current_file.parent  # We're in example/
-    datadump_dir = example_dir / "datadump"
-    datadump_dir.mkdir(exist_ok=True)
+    if orjson is not None:
+        _write_dump(filepath, _render_dump(header, scratchpad, metadata))
+    else:
+        with _open_dump(filepath, 'wt') as f:
+            f.writelines(_iter_service_request_json(header, scratchpad, metadata))
+
+    logger.info(f"💾 SERVICE REQUEST DUMPED: {filepath} (method={confirmation_method})")
+
+    return filepath
 
-    filename = f"{service_request_id}.json"
-    filepath = datadump_dir / filename
 
-    with open(filepath, 'w') as f:
-        json.dump(service_data, f, indent=2)
+async def adump_service_request(
+    service_request_id: str,
+    conversation_id: str,
+    scratchpad,
+    confirmation_method: str,
+    additional_metadata: Dict[str, Any] = None
+) -> Path:
+    """
+    Async variant of dump_service_request for the FastAPI/orchestrator event loop.
+
+    The document is serialized before the first await, so callers may clear the
+    scratchpad as soon as this returns; only the disk write runs in a worker thread.
+
+    Args:
+        Same as dump_service_request
+
+    Returns:
+        Path to the created JSON file
+    """
+    filepath, header, metadata = _prepare_dump(
+        service_request_id, conversation_id, scratchpad, confirmation_method, additional_metadata
+    )
+    payload = _render_dump(header, scratchpad, metadata)
+
+    await asyncio.to_thread(_write_dump, filepath, payload)
 
     logger.info(f"💾 SERVICE REQUEST DUMPED: {filepath} (method={confirmation_method})")
 
-    return filepath
\ No newline at end of file
+    return filepath
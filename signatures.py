@@ -34,6 +34,42 @@ class SentimentAnalysisSignature(dspy.Signature):
     )
 
 
+class SentimentWithToneSignature(dspy.Signature):
+    """Analyze customer sentiment (scores 1-10) and choose the reply tone and brevity in one pass."""
+
+    conversation_history: dspy.History = dspy.InputField(
+        desc="Full conversation history between user and assistant"
+    )
+    current_message = dspy.InputField(
+        desc="Current user message to analyze"
+    )
+
+    reasoning = dspy.OutputField(
+        desc="Brief explanation of the sentiment analysis"
+    )
+    interest_score = dspy.OutputField(
+        desc="Interest level"
+    )
+    anger_score = dspy.OutputField(
+        desc="Anger level"
+    )
+    disgust_score = dspy.OutputField(
+        desc="Disgust level"
+    )
+    boredom_score = dspy.OutputField(
+        desc="Boredom level"
+    )
+    neutral_score = dspy.OutputField(
+        desc="Neutral level"
+    )
+    tone_directive = dspy.OutputField(
+        desc="Tone instruction, e.g. 'direct and brief' or 'detailed and helpful'"
+    )
+    max_sentences = dspy.OutputField(
+        desc="Maximum number of sentences (1-4)"
+    )
+
+
 class NameExtractionSignature(dspy.Signature):
     """Extract customer name from unstructured input."""
 
@@ -75,7 +111,7 @@ class VehicleDetailsExtractionSignature(dspy.Signature):
         desc="Vehicle model name (e.g., Corolla, Civic, X5)"
     )
     number_plate = dspy.OutputField(
-        desc="License plate number in alphanumeric format (NOT phone numbers). Example: MH12AB1234, DL4CAF4321. If unsure, return 'Unknown'."
+        desc="License plate like MH12AB1234 (never a phone number); 'Unknown' if unsure"
     )
 
 
@@ -90,10 +126,10 @@ class PhoneExtractionSignature(dspy.Signature):
     )
 
     phone_number = dspy.OutputField(
-        desc="10-digit Indian phone number (e.g., 9876543210, 8888777766). Return 'Unknown' if not found or if the number looks like a license plate."
+        desc="10-digit Indian phone number; 'Unknown' if absent or plate-like"
     )
     confidence = dspy.OutputField(
-        desc="Confidence score (0.0-1.0) for the extraction"
+        desc="Confidence (0.0-1.0)"
     )
 
 
@@ -118,27 +154,58 @@ class DateParsingSignature(dspy.Signature):
     )
 
 
+class CombinedRetroactiveSignature(dspy.Signature):
+    """Extract customer name, vehicle details and appointment date jointly from earlier user messages."""
+
+    conversation_history: dspy.History = dspy.InputField(
+        desc="User-only conversation history for context"
+    )
+    user_message = dspy.InputField(
+        desc="Recent user messages joined together"
+    )
+
+    first_name = dspy.OutputField(
+        desc="Capitalized first name (never a brand or greeting); 'Unknown' if absent"
+    )
+    last_name = dspy.OutputField(
+        desc="Customer last name if provided, empty string otherwise"
+    )
+    brand = dspy.OutputField(
+        desc="Vehicle brand/make (e.g., Toyota, Honda, BMW). 'Unknown' if not mentioned."
+    )
+    model = dspy.OutputField(
+        desc="Vehicle model name (e.g., Corolla, Civic, X5). 'Unknown' if not mentioned."
+    )
+    number_plate = dspy.OutputField(
+        desc="License plate like MH12AB1234 (never a phone number); 'Unknown' if absent"
+    )
+    date_str = dspy.OutputField(
+        desc="Appointment date/day as the user said it; 'Unknown' if absent"
+    )
+
+
 class SentimentToneSignature(dspy.Signature):
     """Determine appropriate tone and brevity based on sentiment scores."""
 
-    interest_score = dspy.InputField(
+    # Integer scores render byte-stable in the prompt ("6", never "6.0"/"6.12")
+    interest_score: int = dspy.InputField(
         desc="Customer interest level (1-10)"
     )
-    anger_score = dspy.InputField(
+    anger_score: int = dspy.InputField(
         desc="Customer anger level (1-10)"
     )
-    disgust_score = dspy.InputField(
+    disgust_score: int = dspy.InputField(
         desc="Customer disgust level (1-10)"
     )
-    boredom_score = dspy.InputField(
+    boredom_score: int = dspy.InputField(
         desc="Customer boredom level (1-10)"
     )
-    neutral_score = dspy.InputField(
+    neutral_score: int = dspy.InputField(
         desc="Customer neutral level (1-10)"
     )
 
     tone_directive = dspy.OutputField(
-        desc="Tone instruction (e.g., 'direct and brief', 'engaging and conversational', 'detailed and helpful')"
+        desc="Tone instruction, e.g. 'direct and brief' or 'detailed and helpful'"
     )
     max_sentences = dspy.OutputField(
         desc="Maximum number of sentences (1-4)"
@@ -167,11 +234,11 @@ class ToneAwareResponseSignature(dspy.Signature):
         desc="Current conversation state"
     )
     collected_data = dspy.InputField(
-        desc="Data already collected from USER (name, phone, vehicle, date). Do NOT ask for this data again."
+        desc="Data already collected from the user; never ask for it again"
     )
 
     response = dspy.OutputField(
-        desc="Concise, tone-appropriate response within sentence limit. Do NOT ask for data already in collected_data."
+        desc="Tone-appropriate reply within the sentence limit; don't re-ask collected_data"
     )
 
 
@@ -182,7 +249,7 @@ class ResponseGenerationSignature(dspy.Signature):
         desc="Full conversation history"
     )
     current_state = dspy.InputField(
-        desc="Current conversation state (e.g., collecting name, service selection)"
+        desc="Current conversation state"
     )
     user_message = dspy.InputField(
         desc="Latest user message"
@@ -207,52 +274,45 @@ class IntentClassificationSignature(dspy.Signature):
     )
 
     reasoning = dspy.OutputField(
-        desc="Step-by-step reasoning for the intent classification"
+        desc="Brief reasoning for the intent"
     )
     intent_class = dspy.OutputField(
-        desc="The classified intent (one of: book, inquire, complaint, small_talk, cancel, reschedule, payment)"
+        desc="One of: book, inquire, complaint, small_talk, cancel, reschedule, payment"
     )
 
 
 class TypoCorrectionSignature(dspy.Signature):
-    """Detect typos in user response to service cards/action buttons and suggest corrections.
+    """Detect a typo in the user's reply to service card buttons and suggest the intended action.
 
-    ONLY triggers when:
-    1. A service card with action buttons was just shown (confirmation, options, etc.)
-    2. User response is a typo/gibberish/null (not a formed reply)
-    3. User response is NOT a proper one-word answer like 'yes', 'no', 'ok'
+    Proper one-word answers like 'yes', 'no', 'ok' are not typos.
     """
 
     last_bot_message = dspy.InputField(
-        desc="The last bot message shown to user (service card/confirmation with buttons)"
+        desc="Last bot message (service card with buttons)"
     )
     user_response = dspy.InputField(
-        desc="User's response to the service card (potentially a typo)"
+        desc="User's reply to the card (possibly a typo)"
     )
     expected_actions = dspy.InputField(
-        desc="List of expected action words from the service card buttons (e.g., 'confirm, edit, cancel')"
+        desc="Button action words, e.g. 'confirm, edit, cancel'"
     )
 
     is_typo = dspy.OutputField(
-        desc="true if user response is a typo/gibberish, false if it's a valid response (even one word)"
+        desc="true if typo/gibberish, false if a valid reply (even one word)"
     )
     intended_action = dspy.OutputField(
-        desc="The likely intended action based on typo analysis (e.g., 'confirm' from 'confrim'). Empty if not a typo."
+        desc="Intended action (e.g. 'confirm' from 'confrim'); empty if not a typo"
     )
     confidence = dspy.OutputField(
         desc="Confidence in typo detection and correction (low/medium/high)"
     )
     suggestion = dspy.OutputField(
-        desc="Friendly 'Did you mean...?' message for the user. Empty if not a typo."
+        desc="Friendly 'Did you mean...?' message; empty if not a typo"
     )
 
 
 class ConfirmationIntentSignature(dspy.Signature):
-    """Detect if user is confirming their booking with collected data.
-
-    This signature detects whether user is explicitly trying to confirm,
-    proceed with, or finalize their booking/service request.
-    """
+    """Detect if the user is explicitly confirming, proceeding with, or finalizing their booking."""
 
     conversation_history: dspy.History = dspy.InputField(
         desc="Full conversation history to understand context"
@@ -265,7 +325,7 @@ class ConfirmationIntentSignature(dspy.Signature):
     )
 
     is_confirming = dspy.OutputField(
-        desc="true if user is confirming/proceeding with booking, false otherwise"
+        desc="true if the user is confirming/proceeding with the booking"
     )
     confidence = dspy.OutputField(
         desc="Confidence in confirmation detection (0.0-1.0)"
@@ -276,39 +336,34 @@ class ConfirmationIntentSignature(dspy.Signature):
 
 
 class StateAwareResponseSignature(dspy.Signature):
-    """Generate response aligned with current state's goal and personality.
+    """Generate a concise (1-2 sentence) response following the state's goal and personality, asking naturally for the next required fields."""
 
-    This signature generates responses that:
-    1. Follow the state's specific goal and personality
-    2. Ask for the next required field(s) in a natural way
-    3. Maintain conversational flow while guiding toward booking completion
-    4. Be CONCISE - use 1-2 sentences maximum, avoid verbose explanations
-    """
-
-    conversation_history: dspy.History = dspy.InputField(
-        desc="Full conversation history for context"
-    )
-    current_state = dspy.InputField(
-        desc="Current conversation state (greeting, name_collection, vehicle_details, etc.)"
-    )
+    # Field order matters for prompt-prefix reuse: per-state constants first, then
+    # per-conversation data, with the volatile history and user message last
     state_goal = dspy.InputField(
         desc="The goal for this state (what we're trying to achieve)"
     )
     state_personality = dspy.InputField(
-        desc="Personality directive for this state (friendly, professional, enthusiastic, etc.)"
+        desc="Personality directive for this state"
     )
-    user_message = dspy.InputField(
-        desc="Latest user message"
+    need_next_fields = dspy.InputField(
+        desc="Fields we still need to collect in this state"
+    )
+    current_state = dspy.InputField(
+        desc="Current conversation state"
     )
     collected_fields = dspy.InputField(
-        desc="Fields already collected from user (prevent asking for same data again)"
+        desc="Fields already collected (don't ask again)"
     )
-    need_next_fields = dspy.InputField(
-        desc="Fields we still need to collect in this state"
+    conversation_history: dspy.History = dspy.InputField(
+        desc="Full conversation history for context"
+    )
+    user_message = dspy.InputField(
+        desc="Latest user message"
     )
 
     response = dspy.OutputField(
-        desc="CONCISE natural response (1-2 sentences max) aligned with state goal and personality, asking for needed fields. Avoid verbose explanations."
+        desc="Concise reply (1-2 sentences) serving the state goal, asking for needed fields"
     )
     quality_reasoning = dspy.OutputField(
         desc="Explanation of how this response serves the state's goal"
@@ -2,38 +2,63 @@
 Quick test for the streaming chat API.
 Run: python test_chat_api.py
 """
-import requests
+import asyncio
 import json
+import time
+
+import httpx
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+
+async def _stream_chat(url: str, payload: dict) -> None:
+    """Stream the chat response line by line, reporting time to first chunk."""
+    async with httpx.AsyncClient(http2=HTTP2, timeout=60) as client:
+        start = time.perf_counter()
+        first_chunk_at = None
+        async with client.stream("POST", url, json=payload) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if line:
+                    if first_chunk_at is None:
+                        first_chunk_at = time.perf_counter()
+                    print(line)
+
+        total = time.perf_counter() - start
+        if first_chunk_at is not None:
+            print(f"⏱️  First chunk: {(first_chunk_at - start) * 1000:.0f}ms, total: {total * 1000:.0f}ms "
+                  f"({response.http_version})")
+
 
 def test_streaming_chat():
     url = "http://localhost:8002/api/chat"
-    
+
     payload = {
         "messages": [
             {"role": "user", "content": "Hello, can you help me book an appointment?"}
         ],
         "session_id": "test-session"
     }
-    
+
     print("Testing streaming chat API...")
     print(f"URL: {url}")
     print(f"Payload: {json.dumps(payload, indent=2)}")
     print("\nStreaming response:")
     print("-" * 50)
-    
+
     try:
-        response = requests.post(url, json=payload, stream=True)
-        response.raise_for_status()
-        
-        for line in response.iter_lines():
-            if line:
-                decoded = line.decode('utf-8')
-                print(decoded)
-        
+        asyncio.run(_stream_chat(url, payload))
+
         print("-" * 50)
         print("✅ Test completed successfully!")
-        
-    except requests.exceptions.ConnectionError:
+
+    except httpx.ConnectError:
         print("❌ Error: Could not connect to backend.")
         print("Make sure the backend is running: uvicorn main:app --reload --port 8002")
     except Exception as e:
@@ -0,0 +1,86 @@
+"""Tests for PredictionCache and SemanticCache (no LLM calls)."""
+
+import dspy
+from orchestrator.prediction_cache import PredictionCache, SemanticCache
+
+
+class TestPredictionCache:
+    """Test exact-match prediction caching."""
+
+    def setup_method(self):
+        """Create a fresh in-process cache for each test."""
+        self.cache = PredictionCache(maxsize=2, history_turns=2, redis_url=None)
+
+    def test_key_depends_on_history_tail(self):
+        """The same message under a different recent history gets a different key."""
+        a = dspy.History(messages=[{"role": "assistant", "content": "Confirm booking?"}])
+        b = dspy.History(messages=[{"role": "assistant", "content": "Cancel booking?"}])
+        assert self.cache.make_key("intent", "yes", a) != self.cache.make_key("intent", "yes", b)
+        assert self.cache.make_key("intent", "yes", a) == self.cache.make_key("intent", "yes", a)
+
+    def test_get_or_compute_caches_result(self):
+        """A second call with the same key does not recompute."""
+        calls = []
+        compute = lambda: calls.append(1) or "book"
+        assert self.cache.get_or_compute("k", compute) == "book"
+        assert self.cache.get_or_compute("k", compute) == "book"
+        assert len(calls) == 1
+
+    def test_should_cache_rejects_failures(self):
+        """Results rejected by should_cache are recomputed next time."""
+        calls = []
+        compute = lambda: calls.append(1)
+        self.cache.get_or_compute("k", compute, should_cache=lambda r: r is not None)
+        self.cache.get_or_compute("k", compute, should_cache=lambda r: r is not None)
+        assert len(calls) == 2
+
+    def test_cached_none_is_a_hit(self):
+        """An explicitly cached None is returned without recomputing."""
+        self.cache.set("k", None)
+        assert self.cache.get_or_compute("k", lambda: "recomputed") is None
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted past maxsize."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == 1
+
+
+class TestSemanticCache:
+    """Test paraphrase-tolerant confirmation caching."""
+
+    def setup_method(self):
+        """Create a fresh semantic cache for each test."""
+        self.cache = SemanticCache(threshold=0.8, maxsize=16, max_fuzzy_words=4)
+
+    def test_exact_match_after_normalization(self):
+        """Punctuation and case differences are an exact hit."""
+        self.cache.add("Yes please", "confirmed", "ctx")
+        assert self.cache.lookup("yes, please!", "ctx") == "confirmed"
+
+    def test_short_paraphrase_reused(self):
+        """A short reply close to a cached one reuses its prediction."""
+        self.cache.add("yes confirm it", "confirmed", "ctx")
+        assert self.cache.lookup("yes confirm it pls", "ctx") == "confirmed"
+
+    def test_negation_never_matched_fuzzily(self):
+        """A negated reply does not reuse the affirmative prediction."""
+        self.cache.add("confirm it", "confirmed", "ctx")
+        assert self.cache.lookup("dont confirm it", "ctx") is None
+        assert self.cache.lookup("don't confirm it", "ctx") is None
+        assert self.cache.lookup("nahi confirm it", "ctx") is None
+
+    def test_long_messages_need_exact_match(self):
+        """Long near-duplicates that differ by a negation are not reused."""
+        self.cache.add("please confirm my booking for tomorrow morning at 10", "confirmed", "ctx")
+        assert self.cache.lookup("please dont confirm my booking for tomorrow morning at 10", "ctx") is None
+        assert self.cache.lookup("please confirm my booking for tomorrow morning at 10", "ctx") == "confirmed"
+
+    def test_context_isolation(self):
+        """Entries cached under one conversation context are not reused in another."""
+        self.cache.add("yes", "confirmed", "ctx-a")
+        assert self.cache.lookup("yes", "ctx-b") is None
+        assert self.cache.lookup("yes", "ctx-a") == "confirmed"
@@ -0,0 +1,195 @@
+"""Tests for retroactive validator helpers (no LLM calls)."""
+
+import os
+import time
+from types import SimpleNamespace
+
+import dspy
+import retroactive_validator
+from config import config
+from retroactive_validator import (
+    DataRequirements,
+    REQUIREMENTS_FROZEN,
+    RetroactiveScanner,
+    _PLATE_RE,
+    _SCAN_MISSING,
+    _cached_scan,
+    _disk_cache_get,
+    _disk_cache_path,
+    _disk_cache_set,
+    _scan_failed,
+    prepare_scan_input,
+)
+
+
+class TestDataRequirements:
+    """Test missing-field detection."""
+
+    def test_missing_fields_is_set(self):
+        """Placeholders and absent fields are reported as a set."""
+        missing = DataRequirements.get_missing_fields("vehicle_details", {
+            "first_name": "Ravi",
+            "vehicle_brand": "Unknown",
+            "vehicle_model": " none ",
+        })
+        assert missing == {"vehicle_brand", "vehicle_model", "vehicle_plate"}
+
+    def test_nothing_missing(self):
+        """Complete data yields an empty set."""
+        assert DataRequirements.get_missing_fields("service_selection", {"first_name": "Ravi"}) == set()
+
+    def test_requirements_frozen_matches(self):
+        """REQUIREMENTS_FROZEN exposes the same per-state sets."""
+        assert REQUIREMENTS_FROZEN["confirmation"] == DataRequirements.REQUIREMENTS["confirmation"]
+        assert isinstance(REQUIREMENTS_FROZEN["confirmation"], frozenset)
+
+
+class TestPrepareScanInput:
+    """Test the shared scan window."""
+
+    def test_user_only_window(self):
+        """Assistant turns are dropped and the window keeps chronological order."""
+        history = dspy.History(messages=[
+            {"role": "user", "content": "I have a Honda City"},
+            {"role": "assistant", "content": "Great! What's the plate?"},
+            {"role": "user", "content": "MH12AB1234"},
+        ])
+        user_only_history, user_messages = prepare_scan_input(history)
+        assert all(m["role"] == "user" for m in user_only_history.messages)
+        assert user_messages == ["I have a Honda City", "MH12AB1234"]
+
+    def test_acknowledgements_and_repeats_skipped(self):
+        """Stopword-only replies and repeats of a newer message are not scanned."""
+        history = dspy.History(messages=[
+            {"role": "user", "content": "Book for Friday"},
+            {"role": "user", "content": "haan"},
+            {"role": "user", "content": "book for friday!"},
+        ])
+        _, user_messages = prepare_scan_input(history)
+        assert user_messages == ["book for friday!"]
+
+    def test_byte_budget_keeps_newest(self):
+        """An oversized newest message is truncated, older ones dropped."""
+        long_message = "x" * (config.MAX_SCAN_BYTES + 100)
+        history = dspy.History(messages=[
+            {"role": "user", "content": "My name is Ravi"},
+            {"role": "user", "content": long_message},
+        ])
+        _, user_messages = prepare_scan_input(history)
+        assert len(user_messages) == 1
+        assert len(user_messages[0].encode("utf-8")) == config.MAX_SCAN_BYTES
+
+    def test_no_history(self):
+        """Missing history yields None."""
+        assert prepare_scan_input(None) is None
+
+
+class TestPlateRegex:
+    """Test the number plate fast path pattern."""
+
+    def test_matches_plates(self):
+        assert _PLATE_RE.search("my plate is MH12AB1234").group(1) == "MH12AB1234"
+        assert _PLATE_RE.search("it's mh-12-ab-1234").group(1) == "mh-12-ab-1234"
+
+    def test_ignores_ordinary_text(self):
+        assert _PLATE_RE.search("at 10 am 5") is None
+        assert _PLATE_RE.search("call me on 9876543210") is None
+
+
+class _CountingScanner:
+    """Minimal scanner whose scan either succeeds or reports an extractor failure."""
+
+    def __init__(self, fail: bool):
+        self.fail = fail
+        self.calls = 0
+
+    @_cached_scan
+    def scan_for_test(self, history, prepared=None):
+        self.calls += 1
+        if self.fail:
+            _scan_failed()
+        return None
+
+
+class TestCachedScan:
+    """Test scan result memoization."""
+
+    @staticmethod
+    def _history(text):
+        return dspy.History(messages=[{"role": "user", "content": text}])
+
+    def test_success_is_cached(self):
+        """A successful "nothing found" scan of the same window is reused."""
+        scanner = _CountingScanner(fail=False)
+        history = self._history("cached scan success window")
+        scanner.scan_for_test(history)
+        scanner.scan_for_test(history)
+        assert scanner.calls == 1
+
+    def test_failure_is_not_cached(self):
+        """An extractor failure is retried on the next sweep."""
+        scanner = _CountingScanner(fail=True)
+        history = self._history("cached scan failure window")
+        scanner.scan_for_test(history)
+        scanner.scan_for_test(history)
+        assert scanner.calls == 2
+
+
+class TestDiskCache:
+    """Test the on-disk scan result cache."""
+
+    KEY = "a" * 64
+
+    def setup_method(self):
+        retroactive_validator._disk_cache_pruned_at = 0.0
+
+    def test_round_trip_is_json(self, tmp_path, monkeypatch):
+        """Results are stored as JSON and read back unchanged."""
+        monkeypatch.setattr(config, "RETROACTIVE_CACHE_DIR", str(tmp_path))
+        _disk_cache_set(self.KEY, {"first_name": "Ravi"})
+        path = _disk_cache_path(tmp_path, self.KEY)
+        assert path.suffix == ".json"
+        assert _disk_cache_get(self.KEY) == {"first_name": "Ravi"}
+
+    def test_cached_none_is_hit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "RETROACTIVE_CACHE_DIR", str(tmp_path))
+        _disk_cache_set(self.KEY, None)
+        assert _disk_cache_get(self.KEY) is None
+
+    def test_expired_file_is_deleted_on_read(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "RETROACTIVE_CACHE_DIR", str(tmp_path))
+        _disk_cache_set(self.KEY, {})
+        path = _disk_cache_path(tmp_path, self.KEY)
+        old = time.time() - config.RETROACTIVE_CACHE_TTL_SECONDS - 10
+        os.utime(path, (old, old))
+
+        assert _disk_cache_get(self.KEY) is _SCAN_MISSING
+        assert not path.exists()
+
+    def test_old_versions_are_pruned(self, tmp_path, monkeypatch):
+        """Writing a result sweeps files left behind by earlier cache versions."""
+        monkeypatch.setattr(config, "RETROACTIVE_CACHE_DIR", str(tmp_path))
+        stale = tmp_path / f"v1-{'b' * 64}.pkl"
+        stale.write_bytes(b"not a pickle you should load")
+        unrelated = tmp_path / "notes.txt"
+        unrelated.write_text("keep me")
+
+        _disk_cache_set(self.KEY, {})
+
+        assert not stale.exists()
+        assert unrelated.exists()
+        assert _disk_cache_path(tmp_path, self.KEY).exists()
+
+
+class TestScanForDate:
+    """Regression: scan_for_date reads DateParser's parsed_date output."""
+
+    def test_parsed_date_is_returned(self):
+        scanner = RetroactiveScanner.__new__(RetroactiveScanner)  # skip LM configuration
+        scanner.date_parser = lambda **kwargs: SimpleNamespace(parsed_date="2026-10-20")
+        history = dspy.History(messages=[{"role": "user", "content": "book it for 20 oct please"}])
+
+        result = scanner.scan_for_date(history)
+
+        assert result is not None
+        assert result.date_str == "2026-10-20"
@@ -2,6 +2,7 @@
 
 import pytest
 from booking.scratchpad import ScratchpadManager
+from orchestrator.scratchpad_store import ScratchpadDiskStore
 
 
 class TestScratchpadManager:
@@ -151,6 +152,141 @@ class TestScratchpadManager:
         assert "appointment" in all_fields
         assert "metadata" in all_fields
 
+    def test_add_fields_bulk(self):
+        """Test bulk upsert writes all sections and skips placeholders."""
+        written = self.scratchpad.add_fields_bulk(
+            {
+                "customer": {"first_name": "John", "phone": "Unknown"},
+                "vehicle": {"brand": "Honda"},
+                "appointment": {"date": "2024-12-11"},
+            },
+            source="collection",
+            turn=1
+        )
+        assert written == 3
+        assert self.scratchpad.get_field("customer", "first_name").value == "John"
+        assert self.scratchpad.get_field("customer", "phone") is None
+        assert self.scratchpad.get_field("vehicle", "brand").value == "Honda"
+        assert self.scratchpad.get_completeness() > 0
+
+    def test_add_fields_bulk_respects_turns(self):
+        """Test bulk upsert keeps existing values from the same or newer turn."""
+        self.scratchpad.add_field("customer", "first_name", "John", "direct_extraction", 2)
+        written = self.scratchpad.add_fields_bulk(
+            {"customer": {"first_name": "Jane"}}, source="collection", turn=2
+        )
+        assert written == 0
+        assert self.scratchpad.get_field("customer", "first_name").value == "John"
+
+    def test_to_api_dict_tracks_mutations(self):
+        """Test API view reflects add, update and delete without None values."""
+        self.scratchpad.add_field("customer", "first_name", "John", "direct_extraction", 1)
+        self.scratchpad.add_field("vehicle", "brand", "Honda", "direct_extraction", 1)
+        self.scratchpad.update_field("vehicle", "brand", None)
+        self.scratchpad.add_field("appointment", "date", "2024-12-11", "user_input", 1)
+        self.scratchpad.delete_field("appointment", "date")
+
+        api = self.scratchpad.to_api_dict()
+        assert api["customer"] == {"first_name": "John"}
+        assert api["vehicle"] == {}
+        assert api["appointment"] == {}
+        assert api["completeness"] == self.scratchpad.get_completeness()
+
+    def test_completeness_tracks_updates_and_deletes(self):
+        """Test completeness counts placeholders, overwrites and deletes correctly."""
+        self.scratchpad.add_field("customer", "first_name", "John", "direct_extraction", 1)
+        self.scratchpad.add_field("customer", "first_name", "Johnny", "direct_extraction", 2)
+        self.scratchpad.add_field("vehicle", "brand", "Honda", "direct_extraction", 1)
+        assert self.scratchpad.form.metadata["filled_required_fields"] == 2
+
+        self.scratchpad.update_field("vehicle", "brand", "Unknown")
+        assert self.scratchpad.form.metadata["filled_required_fields"] == 1
+        self.scratchpad.delete_field("customer", "first_name")
+        assert self.scratchpad.get_completeness() == 0.0
+
+        self.scratchpad.add_field("customer", "phone", "555-0123", "direct_extraction", 1)
+        self.scratchpad.clear_all()
+        self.scratchpad.add_field("customer", "phone", "555-0123", "direct_extraction", 1)
+        fresh = ScratchpadManager()
+        fresh.add_field("customer", "phone", "555-0123", "direct_extraction", 1)
+        assert self.scratchpad.get_completeness() == fresh.get_completeness() > 0
+
+    def test_get_fields_bulk(self):
+        """Test bulk lookup returns entries and None for missing fields or sections."""
+        self.scratchpad.add_field("vehicle", "brand", "Honda", "direct_extraction", 1)
+
+        entries = self.scratchpad.get_fields_bulk([
+            ("vehicle", "brand"), ("appointment", "date"), ("invalid_section", "field")
+        ])
+        assert entries[("vehicle", "brand")].value == "Honda"
+        assert entries[("appointment", "date")] is None
+        assert entries[("invalid_section", "field")] is None
+
+    def test_from_json_round_trip(self):
+        """Test export_json/from_json restores values, API view and completeness."""
+        self.scratchpad.add_field("customer", "first_name", "John", "direct_extraction", 1)
+        self.scratchpad.add_field("vehicle", "brand", "Honda", "direct_extraction", 1)
+
+        restored = ScratchpadManager.from_json(self.scratchpad.export_json())
+        assert restored.conversation_id == self.scratchpad.conversation_id
+        assert restored.get_field("vehicle", "brand").value == "Honda"
+        assert restored.to_api_dict() == self.scratchpad.to_api_dict()
+
+    def test_update_many(self):
+        """Test update_many writes per-field methods and skips invalid entries."""
+        written = self.scratchpad.update_many([
+            ("appointment", "service_type", "wash", "extraction", 0, "explicit"),
+            ("vehicle", "vehicle_type", "SUV", "extraction", 0, "inferred"),
+            ("appointment", "notes", "Unknown", "extraction", 0, "explicit"),
+            ("invalid_section", "field", "value", "extraction", 0, "explicit"),
+        ])
+        assert written == 2
+        assert self.scratchpad.get_field("vehicle", "vehicle_type").extraction_method == "inferred"
+        assert self.scratchpad.get_field("appointment", "notes") is None
+        assert self.scratchpad.get_completeness() > 0
+
+    def test_get_populated_sections(self):
+        """Test populated sections match the form's non-None values per section."""
+        self.scratchpad.add_field("customer", "first_name", "John", "direct_extraction", 1)
+        self.scratchpad.add_field("vehicle", "brand", "Honda", "direct_extraction", 1)
+        self.scratchpad.update_field("vehicle", "brand", None)
+
+        sections = self.scratchpad.get_populated_sections()
+        for section in ("customer", "vehicle", "appointment"):
+            expected = {
+                k: v.value for k, v in getattr(self.scratchpad.form, section).items() if v.value is not None
+            }
+            assert sections[section] == expected
+        assert sections["customer"] == {"first_name": "John"}
+
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
+
+
+class TestScratchpadDiskStore:
+    """Test on-disk scratchpad snapshots."""
+
+    def test_save_load_round_trip(self, tmp_path):
+        store = ScratchpadDiskStore(tmp_path)
+        manager = ScratchpadManager("conv-1")
+        manager.add_field("customer", "first_name", "John", "direct_extraction", 1)
+        store.save(manager)
+
+        loaded = store.load("conv-1")
+        assert loaded.get_field("customer", "first_name").value == "John"
+
+    def test_similar_ids_do_not_share_snapshot(self, tmp_path):
+        """Ids that differ only in unsafe characters must map to different files."""
+        store = ScratchpadDiskStore(tmp_path)
+        manager = ScratchpadManager("a b")
+        manager.add_field("customer", "first_name", "John", "direct_extraction", 1)
+        store.save(manager)
+
+        assert store.load("a_b") is None
+        assert store.load("a b") is not None
+
+    def test_unsafe_id_stays_in_directory(self, tmp_path):
+        store = ScratchpadDiskStore(tmp_path)
+        store.save(ScratchpadManager("../../etc/passwd"))
+        assert [p.parent for p in tmp_path.iterdir()] == [tmp_path]